@@ -0,0 +1,508 @@
+import random
+import struct
+from array import array
+from collections import deque
+from FreeCells import FreeCells
+from FruitType import FruitType
+from GameMode import GameMode, PlayMode
+from SnakeEngine import SnakeEngine, Event, DeathCause, pack_cells, unpack_cells
+from WallConnectivity import WallConnectivity
+
+
+class ArenaSnake:
+    """One Snake of an Arena.
+
+    Has the attributes of a single-Snake SnakeEngine that a Snake sprite draws from (body, columns, position() and
+    game_mode), so that the game's Snake graphics can draw it.
+    """
+
+    def __init__(self, arena, index):
+        self.arena = arena
+        self.index = index
+        # The value marking this Snake's cells in the Arena's owners grid.
+        self.code = index + 1
+        self.columns = arena.columns
+        self.game_mode = GameMode(PlayMode.CLASSIC)
+        self.body = deque()
+        self.direction = SnakeEngine.DIRECTION_NONE
+        self.new_block = False
+        # Serial of the head segment; see Arena.segment_index().
+        self.serial = 0
+        self.alive = False
+        # Tick at which a dead Snake is spawned again.
+        self.respawn_tick = 0
+        self.score = 0
+        self.high_score = 0
+        self.death_cause = None
+
+    def position(self, cell):
+        return divmod(cell, self.columns)
+
+    @property
+    def heading(self):
+        """Returns the direction the Snake last moved in (see SnakeEngine.heading), or spawned facing."""
+        if len(self.body) < 2:
+            return self.direction
+        row, column = divmod(self.body[0], self.columns)
+        neck_row, neck_column = divmod(self.body[1], self.columns)
+        return row - neck_row, column - neck_column
+
+    def turn(self, direction):
+        """Changes the Snake's direction (if it did not last move in that axis). Returns True if successful.
+
+        Like SnakeEngine.turn(), several turns before a tick cannot reverse the Snake into its neck.
+        """
+        axis = SnakeEngine.AXIS_VERTICAL if direction in SnakeEngine.AXIS_VERTICAL else SnakeEngine.AXIS_HORIZONTAL
+        if self.heading not in axis:
+            self.direction = direction
+            return True
+        return False
+
+
+class Arena:
+    """Simulates many Snakes sharing one board, without a display, mixer or clock.
+
+    Every cell of the owners grid holds the code of the Snake on it (0 for none), so a collision is a lookup of the
+    cell a head moves into. All Snakes move at once: tails leave first, heads moving into the same cell all die, and a
+    head dies on a wall or on any body (its own or another Snake's). A tick costs O(Snakes) however long they are;
+    only dying, which clears the dead Snake's body, is proportional to its length.
+    """
+    DIRECTIONS = (SnakeEngine.DIRECTION_UP, SnakeEngine.DIRECTION_DOWN, SnakeEngine.DIRECTION_LEFT, SnakeEngine.DIRECTION_RIGHT)
+    START_LENGTH = 3
+    RESPAWN_TICKS = 20
+    # Random places tried when spawning a Snake before waiting for the next tick.
+    SPAWN_ATTEMPTS = 20
+
+    # encode_state() layout: the header below, a pack_cells() bitmap of the walls, each fruit as FRUIT, then each Snake
+    # as SNAKE followed by its body's cells (4 bytes each) from the head.
+    STATE_MAGIC = b'SNKA'
+    STATE_VERSION = 2
+    # magic, version, rows, columns, ticks, Snakes, fruit.
+    STATE_HEADER = struct.Struct('<4sBHHIHI')
+    # alive, score, high score, body length.
+    SNAKE = struct.Struct('<?III')
+    # encode_delta() layout: the header below, then that many records of each kind, in order.
+    # tick, moves, eaten fruit, deaths, spawns, new fruit, scores.
+    DELTA_HEADER = struct.Struct('<IHHHHHH')
+    # Snake, new head cell, whether its tail left its cell.
+    MOVE = struct.Struct('<HI?')
+    EATEN = struct.Struct('<I')
+    # Snake, DeathCause, whether its tail left its cell before it died.
+    DEATH = struct.Struct('<HB?')
+    # Snake, body length, followed by the body's cells (4 bytes each) from the head.
+    SPAWN = struct.Struct('<HI')
+    # cell, FruitType.
+    FRUIT = struct.Struct('<IB')
+    # Snake, score.
+    SCORE = struct.Struct('<HI')
+
+    def __init__(self, rows, columns, snakes, fruits=None, walls=0, start_length=START_LENGTH, seed=None):
+        if start_length < 2:
+            raise ValueError(f"Snakes must start at least 2 segments long, got {start_length}")
+        self.rows = rows
+        self.columns = columns
+        self.start_length = start_length
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.random = random.Random(self.seed)
+        self.ticks = 0
+        # WALL/FRUIT flags per cell, as in SnakeEngine.
+        self.grid = bytearray(rows * columns)
+        self.owners = array('H', bytes(2 * rows * columns))
+        self.serials = array('I', bytes(4 * rows * columns))
+        self.free_cells = FreeCells(rows * columns)
+        self.walls = set()
+        # FruitType of each fruit by cell. The Arena keeps fruit_count fruit on the board.
+        self.fruits = {}
+        self.fruit_count = fruits if fruits is not None else max(1, snakes // 2)
+        # Cells whose contents changed during the last tick, and the Snakes that moved, died or spawned in it.
+        self.changed_cells = []
+        self.moved = []
+        self.died = []
+        self.spawned = []
+        # The rest of what encode_delta() sends: Snakes whose tail left its cell, and fruit eaten and placed.
+        self.trimmed = []
+        self.eaten = []
+        self.placed = []
+
+        # Random walls, each leaving the board connected and free of dead ends.
+        connectivity = WallConnectivity(rows, columns)
+        failures = 0
+        while len(self.walls) < walls and failures < SnakeEngine.WALL_ATTEMPTS:
+            cell = self.free_cells.sample(self.random)
+            if cell is None:
+                break
+            if not connectivity.allows(cell):
+                failures += 1
+                continue
+            failures = 0
+            connectivity.add(cell)
+            self.walls.add(cell)
+            self.grid[cell] |= SnakeEngine.WALL
+            self.free_cells.discard(cell)
+        self.snakes = [ArenaSnake(self, index) for index in range(snakes)]
+        for snake in self.snakes:
+            self.spawn(snake)
+        self.place_fruit()
+
+    def cell(self, row, column):
+        return row * self.columns + column
+
+    def position(self, cell):
+        return divmod(cell, self.columns)
+
+    def segment_index(self, cell):
+        """Returns (Snake, body index) of the segment on a cell, or None if no Snake is on it."""
+        code = self.owners[cell]
+        if not code:
+            return None
+        snake = self.snakes[code - 1]
+        return snake, (snake.serial - self.serials[cell]) & 0xFFFFFFFF
+
+    def release(self, cell):
+        """Returns a cell to the free cells if nothing occupies it anymore."""
+        if not self.owners[cell] and not self.grid[cell]:
+            self.free_cells.add(cell)
+
+    def spawn(self, snake):
+        """Places a dead Snake on a random straight run of free cells, heading away from its tail. Returns True if it
+        found room."""
+        rows, columns = self.rows, self.columns
+        length = self.start_length
+        index = self.free_cells.index
+        for _ in range(Arena.SPAWN_ATTEMPTS):
+            head = self.free_cells.sample(self.random)
+            if head is None:
+                return False
+            direction = self.random.choice(Arena.DIRECTIONS)
+            row, column = divmod(head, columns)
+            if not (0 <= row - (length - 1) * direction[0] < rows and 0 <= column - (length - 1) * direction[1] < columns):
+                continue
+            step = direction[0] * columns + direction[1]
+            tail = head - (length - 1) * step
+            # The body's cells are evenly spaced in the free cells' index, so one slice checks them all at C speed.
+            if min(index[min(head, tail):max(head, tail) + 1:abs(step)]) >= 0:
+                break
+        else:
+            return False
+        self.place(snake, range(head, tail - step, -step))
+        snake.direction = direction
+        return True
+
+    def place(self, snake, cells):
+        """Puts a dead Snake on the given cells, from its head, with a score of 0."""
+        snake.body = deque(cells)
+        snake.serial = len(snake.body) - 1
+        for serial, cell in enumerate(reversed(snake.body)):
+            self.owners[cell] = snake.code
+            self.serials[cell] = serial
+            self.free_cells.discard(cell)
+            self.changed_cells.append(cell)
+        snake.new_block = False
+        snake.alive = True
+        snake.score = 0
+
+    def kill(self, snake, cause):
+        """Removes a Snake's body from the board and schedules its respawn."""
+        for cell in snake.body:
+            self.owners[cell] = 0
+            self.changed_cells.append(cell)
+            self.release(cell)
+        snake.body.clear()
+        snake.alive = False
+        snake.death_cause = cause
+        snake.high_score = max(snake.score, snake.high_score)
+        snake.respawn_tick = self.ticks + Arena.RESPAWN_TICKS
+
+    def place_fruit(self):
+        """Adds fruit on random free cells until there are fruit_count, or the board is full."""
+        while len(self.fruits) < self.fruit_count:
+            cell = self.free_cells.sample(self.random)
+            if cell is None:
+                return
+            self.add_fruit(cell, self.random.choice(list(FruitType)))
+
+    def add_fruit(self, cell, kind):
+        self.fruits[cell] = kind
+        self.grid[cell] |= SnakeEngine.FRUIT
+        self.free_cells.discard(cell)
+        self.changed_cells.append(cell)
+        self.placed.append(cell)
+
+    def remove_fruit(self, cell):
+        self.grid[cell] &= ~SnakeEngine.FRUIT
+        del self.fruits[cell]
+        self.eaten.append(cell)
+
+    def tick(self):
+        """Moves every living Snake one cell and respawns dead ones that are due. Returns the Event flags of the tick."""
+        self.ticks += 1
+        self.changed_cells = []
+        self.moved = []
+        self.died = []
+        self.spawned = []
+        self.trimmed = []
+        self.eaten = []
+        self.placed = []
+        columns = self.columns
+        owners = self.owners
+        grid = self.grid
+
+        # Find where each head goes. Heads leaving the board die; the others are grouped by the cell they move into.
+        heads = {}
+        dead = []
+        waiting = []
+        for snake in self.snakes:
+            if not snake.alive:
+                waiting.append(snake)
+                continue
+            row, column = divmod(snake.body[0], columns)
+            row += snake.direction[0]
+            column += snake.direction[1]
+            if not (0 <= row < self.rows and 0 <= column < columns):
+                dead.append((snake, DeathCause.EDGE))
+                continue
+            cell = row * columns + column
+            movers = heads.get(cell)
+            if movers is None:
+                heads[cell] = [snake]
+            else:
+                movers.append(snake)
+
+        # Tails leave their cells before any head arrives, unless the Snake is growing.
+        for movers in heads.values():
+            for snake in movers:
+                if snake.new_block:
+                    snake.new_block = False
+                else:
+                    tail = snake.body.pop()
+                    owners[tail] = 0
+                    self.changed_cells.append(tail)
+                    self.release(tail)
+                    self.trimmed.append(snake)
+
+        eaten = False
+        for cell, movers in heads.items():
+            if len(movers) > 1:
+                dead.extend((snake, DeathCause.HEAD_ON) for snake in movers)
+                continue
+            snake = movers[0]
+            if grid[cell] & SnakeEngine.WALL:
+                dead.append((snake, DeathCause.WALL))
+                continue
+            if owners[cell]:
+                dead.append((snake, DeathCause.SELF if owners[cell] == snake.code else DeathCause.SNAKE))
+                continue
+            snake.serial += 1
+            snake.body.appendleft(cell)
+            owners[cell] = snake.code
+            self.serials[cell] = snake.serial & 0xFFFFFFFF
+            self.free_cells.discard(cell)
+            self.changed_cells.append(cell)
+            self.moved.append(snake)
+            if grid[cell] & SnakeEngine.FRUIT:
+                self.remove_fruit(cell)
+                snake.new_block = True
+                snake.score += 1
+                eaten = True
+
+        # Bodies are cleared only now, so that every head saw the board as it was at the start of the tick.
+        for snake, cause in dead:
+            self.kill(snake, cause)
+            self.died.append(snake)
+        for snake in waiting:
+            if self.ticks >= snake.respawn_tick and self.spawn(snake):
+                self.spawned.append(snake)
+        # New fruit goes on cells that are free after every move, so that no head lands on it in the same tick.
+        if eaten:
+            self.place_fruit()
+
+        return self.events()
+
+    def events(self):
+        """Returns the Event flags of the last tick."""
+        events = Event.NONE
+        if self.moved:
+            events |= Event.MOVED
+        if self.eaten:
+            events |= Event.ATE
+        if self.died:
+            events |= Event.DIED
+        if self.spawned:
+            events |= Event.SPAWNED
+        return events
+
+    def encode_state(self):
+        """Returns what a mirror of the Arena needs to draw it and follow its deltas, as bytes: the board, fruit and
+        Snakes, but not the random state or the Snakes' directions, so a mirror cannot tick by itself."""
+        kinds = list(FruitType)
+        parts = [Arena.STATE_HEADER.pack(Arena.STATE_MAGIC, Arena.STATE_VERSION, self.rows, self.columns, self.ticks,
+                                         len(self.snakes), len(self.fruits)),
+                 pack_cells(self.walls, self.rows * self.columns)]
+        parts.extend(Arena.FRUIT.pack(cell, kinds.index(kind)) for cell, kind in self.fruits.items())
+        for snake in self.snakes:
+            parts.append(Arena.SNAKE.pack(snake.alive, snake.score, snake.high_score, len(snake.body)))
+            parts.append(array('I', snake.body).tobytes())
+        return b''.join(parts)
+
+    @classmethod
+    def from_state(cls, data):
+        """Returns a mirror of the Arena an encode_state() came from, to be kept up to date with apply_delta()."""
+        magic, version, rows, columns, ticks, snakes, fruits = Arena.STATE_HEADER.unpack_from(data)
+        if magic != Arena.STATE_MAGIC or version != Arena.STATE_VERSION:
+            raise ValueError(f"Not a version {Arena.STATE_VERSION} arena state")
+        arena = cls(rows, columns, 0, fruits=0, seed=0)
+        arena.ticks = ticks
+        arena.fruit_count = fruits
+        kinds = list(FruitType)
+        offset = Arena.STATE_HEADER.size
+        bitmap_length = (rows * columns + 7) // 8
+        for cell in unpack_cells(data[offset:offset + bitmap_length]):
+            arena.walls.add(cell)
+            arena.grid[cell] |= SnakeEngine.WALL
+            arena.free_cells.discard(cell)
+        offset += bitmap_length
+        for cell, kind in Arena.FRUIT.iter_unpack(data[offset:offset + fruits * Arena.FRUIT.size]):
+            arena.add_fruit(cell, kinds[kind])
+        offset += fruits * Arena.FRUIT.size
+        for index in range(snakes):
+            snake = ArenaSnake(arena, index)
+            arena.snakes.append(snake)
+            alive, score, high_score, length = Arena.SNAKE.unpack_from(data, offset)
+            offset += Arena.SNAKE.size
+            if alive:
+                arena.place(snake, array('I', data[offset:offset + 4 * length]))
+            offset += 4 * length
+            snake.score = score
+            snake.high_score = high_score
+        return arena
+
+    def encode_delta(self):
+        """Returns the changes of the last tick as bytes, for apply_delta() on a mirror: heads added and tails removed,
+        deaths, spawns, fruit eaten and placed, and the scores that changed. Walls do not change during a game, so they
+        are only in encode_state()."""
+        trimmed = set(self.trimmed)
+        kinds = list(FruitType)
+        eaters = [snake for snake in self.moved if snake.new_block]
+        parts = [Arena.DELTA_HEADER.pack(self.ticks, len(self.moved), len(self.eaten), len(self.died), len(self.spawned),
+                                         len(self.placed), len(eaters))]
+        parts.extend(Arena.MOVE.pack(snake.index, snake.body[0], snake in trimmed) for snake in self.moved)
+        parts.extend(Arena.EATEN.pack(cell) for cell in self.eaten)
+        causes = list(DeathCause)
+        parts.extend(Arena.DEATH.pack(snake.index, causes.index(snake.death_cause), snake in trimmed) for snake in self.died)
+        for snake in self.spawned:
+            parts.append(Arena.SPAWN.pack(snake.index, len(snake.body)))
+            parts.append(array('I', snake.body).tobytes())
+        parts.extend(Arena.FRUIT.pack(cell, kinds.index(self.fruits[cell])) for cell in self.placed)
+        parts.extend(Arena.SCORE.pack(snake.index, snake.score) for snake in eaters)
+        return b''.join(parts)
+
+    def apply_delta(self, data):
+        """Brings a mirror from from_state() forward by one tick from an encode_delta(). Returns the Event flags of the
+        tick, and sets changed_cells, moved, died and spawned as tick() would."""
+        self.changed_cells = []
+        self.moved = []
+        self.died = []
+        self.spawned = []
+        self.trimmed = []
+        self.eaten = []
+        self.placed = []
+        owners = self.owners
+        (self.ticks, moves, eaten, deaths, spawns, placed,
+         scores) = Arena.DELTA_HEADER.unpack_from(data)
+        offset = Arena.DELTA_HEADER.size
+        moves = list(Arena.MOVE.iter_unpack(data[offset:offset + moves * Arena.MOVE.size]))
+        offset += len(moves) * Arena.MOVE.size
+        eaten = [cell for cell, in Arena.EATEN.iter_unpack(data[offset:offset + eaten * Arena.EATEN.size])]
+        offset += len(eaten) * Arena.EATEN.size
+        deaths = list(Arena.DEATH.iter_unpack(data[offset:offset + deaths * Arena.DEATH.size]))
+        offset += len(deaths) * Arena.DEATH.size
+
+        # In the order tick() changes the board: every tail leaves before any head arrives, and the dead go last.
+        for index, _, trimmed in moves + deaths:
+            if trimmed:
+                snake = self.snakes[index]
+                tail = snake.body.pop()
+                owners[tail] = 0
+                self.changed_cells.append(tail)
+                self.release(tail)
+                self.trimmed.append(snake)
+        for cell in eaten:
+            self.remove_fruit(cell)
+        for index, cell, _ in moves:
+            snake = self.snakes[index]
+            snake.serial += 1
+            snake.body.appendleft(cell)
+            owners[cell] = snake.code
+            self.serials[cell] = snake.serial & 0xFFFFFFFF
+            self.free_cells.discard(cell)
+            self.changed_cells.append(cell)
+            self.moved.append(snake)
+        causes = list(DeathCause)
+        for index, cause, _ in deaths:
+            snake = self.snakes[index]
+            self.kill(snake, causes[cause])
+            self.died.append(snake)
+        for _ in range(spawns):
+            index, length = Arena.SPAWN.unpack_from(data, offset)
+            offset += Arena.SPAWN.size
+            snake = self.snakes[index]
+            self.place(snake, array('I', data[offset:offset + 4 * length]))
+            offset += 4 * length
+            self.spawned.append(snake)
+        kinds = list(FruitType)
+        for cell, kind in Arena.FRUIT.iter_unpack(data[offset:offset + placed * Arena.FRUIT.size]):
+            self.add_fruit(cell, kinds[kind])
+        offset += placed * Arena.FRUIT.size
+        for index, score in Arena.SCORE.iter_unpack(data[offset:offset + scores * Arena.SCORE.size]):
+            self.snakes[index].score = score
+        return self.events()
+
+
+class ArenaBot:
+    """Steers an ArenaSnake toward a fruit it picked, avoiding cells it would die on next tick, and where it can,
+    cells another head could move into. Looks no further ahead."""
+
+    def __init__(self, arena, snake):
+        self.arena = arena
+        self.snake = snake
+        self.random = random.Random(arena.seed + snake.index)
+        self.target = None
+
+    def decide(self):
+        """Returns the direction to turn to, or None to keep going. Costs O(1) besides picking a new target."""
+        arena = self.arena
+        snake = self.snake
+        if not snake.alive:
+            return None
+        if self.target not in arena.fruits:
+            self.target = self.random.choice(list(arena.fruits)) if arena.fruits else None
+        head_row, head_column = divmod(snake.body[0], arena.columns)
+        target_row, target_column = divmod(self.target, arena.columns) if self.target is not None else (head_row, head_column)
+        tail = snake.body[-1]
+        best = None
+        for direction in Arena.DIRECTIONS:
+            if direction[0] == -snake.direction[0] and direction[1] == -snake.direction[1]:
+                continue
+            row, column = head_row + direction[0], head_column + direction[1]
+            if not (0 <= row < arena.rows and 0 <= column < arena.columns):
+                continue
+            cell = row * arena.columns + column
+            if arena.grid[cell] & SnakeEngine.WALL or arena.owners[cell] and (cell != tail or snake.new_block):
+                continue
+            distance = abs(target_row - row) + abs(target_column - column)
+            if self.contested(cell, row, column):
+                distance += arena.rows + arena.columns
+            if best is None or distance < best[0]:
+                best = (distance, direction)
+        return best[1] if best is not None else None
+
+    def contested(self, cell, row, column):
+        """Returns True if another Snake's head is next to a cell, so that both heads could move into it."""
+        arena = self.arena
+        for direction in Arena.DIRECTIONS:
+            next_row, next_column = row + direction[0], column + direction[1]
+            if 0 <= next_row < arena.rows and 0 <= next_column < arena.columns:
+                segment = arena.segment_index(next_row * arena.columns + next_column)
+                if segment is not None and segment[1] == 0 and segment[0] is not self.snake:
+                    return True
+        return False
@@ -0,0 +1,100 @@
+import asyncio
+import queue
+import threading
+from Arena import Arena
+from ArenaServer import ArenaServer
+
+
+class ArenaClient:
+    """Plays in an ArenaServer's Arena: keeps a mirror of it from the server's state and deltas, and sends turns.
+
+    Use connect() and receive() from an asyncio program, or start() and update() from a game loop that is not one, in
+    which case the connection is served by an event loop on a thread of its own.
+    """
+
+    def __init__(self):
+        self.arena = None
+        # The mirror's ArenaSnake that this client steers, or None if it only watches.
+        self.snake = None
+        self.reader = None
+        self.writer = None
+        self.connected = False
+        # Set by start(): the event loop serving the connection, and the deltas it received but update() did not apply.
+        self.loop = None
+        self.deltas = queue.SimpleQueue()
+
+    async def connect(self, host, port):
+        """Connects to a server and builds the mirror from the state it sends."""
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        payload = await self.read_frame()
+        index, = ArenaServer.WELCOME.unpack_from(payload)
+        self.arena = Arena.from_state(payload[ArenaServer.WELCOME.size:])
+        self.snake = None if index == ArenaServer.NO_SNAKE else self.arena.snakes[index]
+        self.connected = True
+
+    async def read_frame(self):
+        header = await self.reader.readexactly(ArenaServer.FRAME.size)
+        return await self.reader.readexactly(ArenaServer.FRAME.unpack(header)[0])
+
+    async def read_delta(self):
+        """Returns the next tick's delta as bytes, or None once the server closed the connection."""
+        try:
+            return await self.read_frame()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.connected = False
+            return None
+
+    async def receive(self):
+        """Applies the next tick's delta to the mirror. Returns its Event flags, or None once disconnected."""
+        delta = await self.read_delta()
+        return None if delta is None else self.arena.apply_delta(delta)
+
+    def turn(self, direction):
+        """Asks the server to turn this client's Snake."""
+        data = bytes((Arena.DIRECTIONS.index(direction),))
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.writer.write, data)
+        else:
+            self.writer.write(data)
+
+    def close(self):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.writer.close)
+        elif self.writer is not None:
+            self.writer.close()
+
+    def start(self, host, port, timeout=5.0):
+        """Connects from a thread of its own, waiting until the mirror is built. Deltas are queued for update()."""
+        joined = threading.Event()
+        errors = []
+
+        async def listen():
+            try:
+                await self.connect(host, port)
+            except OSError as error:
+                errors.append(error)
+                return
+            finally:
+                joined.set()
+            while True:
+                delta = await self.read_delta()
+                self.deltas.put(delta)
+                if delta is None:
+                    return
+
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_until_complete, args=(listen(),), daemon=True).start()
+        if not joined.wait(timeout):
+            raise TimeoutError(f"No answer from {host}:{port}")
+        if errors:
+            raise errors[0]
+
+    def update(self):
+        """Applies the deltas received since the last call to the mirror. Returns the Event flags of each tick."""
+        ticks = []
+        while not self.deltas.empty():
+            delta = self.deltas.get()
+            if delta is None:
+                break
+            ticks.append(self.arena.apply_delta(delta))
+        return ticks
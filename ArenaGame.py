@@ -0,0 +1,82 @@
+import pygame
+from pygame.locals import *
+from Arena import ArenaBot
+from ArenaRenderer import ArenaRenderer
+from Assets import assets
+from InputQueue import InputQueue
+from Scheduler import Scheduler
+from SnakeEngine import SnakeEngine
+from SnakeGame import SnakeGame, Vector2I
+
+
+class ArenaGame:
+    """Renders an Arena in a Pygame window. The arrow keys steer the first Snake; bots steer the others.
+
+    Given a started ArenaClient instead, renders its mirror of a server's Arena and sends the arrow keys to the server.
+    """
+
+    def __init__(self, arena=None, tick_rate=SnakeEngine.TICK_RATE, player=True, client=None):
+        pygame.display.init()
+        pygame.font.init()
+        self.clock = pygame.time.Clock()
+
+        # Initialize display.
+        pygame.display.set_caption("Snake Arena")
+        pygame.display.set_icon(assets.image("res/icon.png"))
+        self.screen = pygame.display.set_mode(Vector2I(SnakeGame.SIZE))
+        self.font = pygame.font.Font("res/font/bit5x5.ttf", 24)
+
+        self.client = client
+        if client is not None:
+            arena = client.arena
+            self.player = client.snake
+            self.bots = []
+        else:
+            self.player = arena.snakes[0] if player else None
+            self.bots = [ArenaBot(arena, snake) for snake in arena.snakes if snake is not self.player]
+        self.arena = arena
+        self.renderer = ArenaRenderer(arena, self.screen, self.font, player=self.player)
+        self.scheduler = Scheduler(tick_rate)
+        self.controls = {
+            K_UP: SnakeEngine.DIRECTION_UP,
+            K_DOWN: SnakeEngine.DIRECTION_DOWN,
+            K_LEFT: SnakeEngine.DIRECTION_LEFT,
+            K_RIGHT: SnakeEngine.DIRECTION_RIGHT
+        }
+        # Arrow keys pressed since the last tick, applied one per tick. A server buffers a client's turns itself.
+        self.inputs = InputQueue()
+        self.playing = True
+
+    def run(self):
+        """Runs the game loop until the window is closed."""
+        while self.playing:
+            for event in pygame.event.get():
+                if event.type == QUIT:
+                    self.playing = False
+                elif event.type == KEYDOWN and event.key in self.controls and self.player is not None:
+                    if self.client is not None:
+                        self.client.turn(self.controls[event.key])
+                    else:
+                        self.inputs.push(self.controls[event.key])
+
+            if self.client is not None:
+                # The server ticks the Arena; apply whatever ticks arrived since the last frame.
+                for events in self.client.update():
+                    self.renderer.update(events)
+                self.playing = self.playing and self.client.connected
+            else:
+                for _ in range(self.scheduler.advance()):
+                    if self.player is not None:
+                        if not self.player.alive:
+                            self.inputs.clear()
+                        self.inputs.apply(self.player.turn, self.scheduler.tick_rate)
+                    for bot in self.bots:
+                        direction = bot.decide()
+                        if direction is not None:
+                            bot.snake.turn(direction)
+                    self.renderer.update(self.arena.tick())
+
+            rects = self.renderer.draw()
+            if rects:
+                pygame.display.update(rects)
+            self.clock.tick(SnakeGame.FPS)
@@ -0,0 +1,139 @@
+import pygame
+from Board import Board
+from Fruit import Fruit
+from Hud import Hud
+from Snake import Snake
+from SnakeEngine import Event
+
+
+class ArenaRenderer:
+    """Draws an Arena onto a surface, repainting only the tiles that changed since the last draw."""
+    WHITE = (255, 255, 255)
+    BLACK = (0, 0, 0)
+
+    def __init__(self, arena, screen, font, player=None):
+        self.arena = arena
+        self.screen = screen
+        # The ArenaSnake steered from the keyboard, if any: its head is outlined and its score shown.
+        self.player = player
+
+        # Initialize sprites. Every ArenaSnake is drawn by a Snake sprite of its own.
+        self.board = Board(arena.columns, arena.rows, screen.get_rect())
+        for cell in arena.walls:
+            self.board.create_wall(*arena.position(cell), static=True)
+        self.snakes = [Snake(self.board, snake) for snake in arena.snakes]
+        # Fruit sprites by cell; see sync_fruit().
+        self.fruits = {}
+
+        self.hud = Hud(font)
+        self.hud_centers = [self.board.get_tile(row, arena.columns // 2).rect.center for row in (1, 2)]
+        # Cells and screen rects to repaint on the next draw, unless the whole screen is redrawn.
+        self.dirty_cells = set()
+        self.dirty_rects = []
+        self.full_redraw = True
+        self.sync_fruit()
+
+    def update(self, events):
+        """Syncs the sprites with the Event flags of an arena tick and records the tiles that changed."""
+        arena = self.arena
+        for snake in arena.moved:
+            self.snakes[snake.index].advance()
+        for snake in arena.spawned:
+            self.snakes[snake.index].rebuild()
+        if events & Event.ATE:
+            self.sync_fruit()
+        if self.full_redraw:
+            return
+        self.dirty_cells.update(arena.changed_cells)
+        # Besides the new head and old tail, only the neck and the new tail change graphics.
+        for snake in arena.moved:
+            self.dirty_cells.add(snake.body[1])
+            self.dirty_cells.add(snake.body[-1])
+
+    def sync_fruit(self):
+        """Adds and removes Fruit sprites to match the arena's fruit."""
+        fruits = self.arena.fruits
+        for cell in [cell for cell in self.fruits if cell not in fruits]:
+            self.dirty_rects.append(self.fruits.pop(cell).rect.copy())
+        for cell, kind in fruits.items():
+            if cell not in self.fruits:
+                fruit = self.fruits[cell] = Fruit(kind, self.board, *self.arena.position(cell))
+                self.dirty_rects.append(fruit.rect.copy())
+
+    def sync_hud(self):
+        """Re-renders the scores if their text changed: the player's (or the number of living Snakes) and the best."""
+        arena = self.arena
+        if self.player is not None:
+            text = str(self.player.score)
+        else:
+            text = str(sum(snake.alive for snake in arena.snakes))
+        best = max(max(snake.score, snake.high_score) for snake in arena.snakes)
+        lines = [(text, ArenaRenderer.BLACK, self.hud_centers[0]), (str(best), ArenaRenderer.WHITE, self.hud_centers[1])]
+        self.dirty_rects.extend(self.hud.set_lines(lines))
+
+    def draw(self):
+        """Draws what changed since the last draw. Returns the list of screen rects that were repainted."""
+        self.sync_hud()
+        if self.full_redraw:
+            self.full_redraw = False
+            self.dirty_cells.clear()
+            self.dirty_rects.clear()
+            self.draw_all()
+            return [self.screen.get_rect()]
+
+        position = self.arena.position
+        rects = [self.board.get_tile(*position(cell)).rect for cell in self.dirty_cells] + self.dirty_rects
+        self.dirty_cells.clear()
+        self.dirty_rects = []
+        for rect in rects:
+            self.repaint(rect)
+        # Repaints may have covered part of the outline, so draw it again over all of them.
+        if rects:
+            outline = self.outline_player()
+            if outline is not None:
+                rects.append(outline)
+        return rects
+
+    def draw_all(self):
+        """Draws the board, walls, fruit, Snakes and scores."""
+        self.screen.blit(self.board.image, self.board.rect)
+        self.board.static_walls.draw(self.screen)
+        # Fruit overlap their neighbors, so draw them row by row as repaint() does.
+        for cell in sorted(self.fruits):
+            self.screen.blit(self.fruits[cell].image, self.fruits[cell].rect)
+        for snake, sprite in zip(self.arena.snakes, self.snakes):
+            if snake.alive:
+                sprite.draw_snake(self.screen)
+        self.hud.draw(self.screen)
+        self.outline_player()
+
+    def repaint(self, rect):
+        """Redraws everything overlapping the given screen rect, in the same order as draw_all()."""
+        arena = self.arena
+        screen = self.screen
+        screen.set_clip(rect)
+        screen.blit(self.board.image, rect, rect.move(-self.board.rect.x, -self.board.rect.y))
+        tiles = self.board.tiles_in(rect)
+        for position in tiles:
+            wall = self.board.walls.get(position)
+            if wall is not None:
+                screen.blit(wall.image, wall.rect)
+        for row, column in tiles:
+            fruit = self.fruits.get(arena.cell(row, column))
+            if fruit is not None:
+                screen.blit(fruit.image, fruit.rect)
+        for row, column in tiles:
+            segment = arena.segment_index(arena.cell(row, column))
+            if segment is not None:
+                self.snakes[segment[0].index].draw_segment(screen, segment[1])
+        self.hud.draw(screen, rect)
+        screen.set_clip(None)
+
+    def outline_player(self):
+        """Outlines the head of the player's Snake, so that it can be told apart from the bots. Returns the rect drawn
+        on, if any."""
+        if self.player is None or not self.player.alive:
+            return None
+        rect = self.board.get_tile(*self.arena.position(self.player.body[0])).rect
+        pygame.draw.rect(self.screen, ArenaRenderer.WHITE, rect, 1)
+        return rect
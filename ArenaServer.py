@@ -0,0 +1,142 @@
+import asyncio
+import socket
+import struct
+import time
+from collections import deque
+from Arena import Arena, ArenaBot
+
+
+class ArenaConnection:
+    """A client of an ArenaServer: its stream, the Snake it steers (None if it only watches) and its buffered turns."""
+
+    def __init__(self, writer, snake, input_buffer):
+        self.writer = writer
+        self.snake = snake
+        self.inputs = deque(maxlen=input_buffer)
+
+
+class ArenaServer:
+    """Runs an Arena at a fixed tick rate and serves it over TCP, steering every Snake nobody plays with a bot.
+
+    Every message from the server is a frame: its length (FRAME) and then its payload. The first frame a client gets is
+    the index of its Snake (NO_SNAKE if every Snake is taken) followed by the Arena's encode_state(); every frame after
+    it is the encode_delta() of one tick, encoded once and written to every client. A client sends one byte per turn,
+    an index into Arena.DIRECTIONS. Turns are buffered, input_buffer at most, and applied one per tick, so that two
+    quick turns between ticks are not lost.
+    """
+    FRAME = struct.Struct('<I')
+    WELCOME = struct.Struct('<H')
+    NO_SNAKE = 0xFFFF
+    INPUT_BUFFER = 3
+    # Connections the OS queues before they are accepted; the default of 100 drops some of hundreds joining at once.
+    BACKLOG = 1024
+    # Bytes a client may leave unread before it is disconnected, so that one slow client cannot hold up the others.
+    WRITE_LIMIT = 1 << 20
+
+    def __init__(self, arena, tick_rate, input_buffer=INPUT_BUFFER):
+        self.arena = arena
+        self.tick_rate = tick_rate
+        self.input_buffer = input_buffer
+        self.clients = []
+        # Connections by the index of the Snake they steer.
+        self.players = {}
+        self.bots = {snake.index: ArenaBot(arena, snake) for snake in arena.snakes}
+        self.server = None
+        self.running = False
+        # Seconds spent ticking and broadcasting, and ticks that ended after the next one was due.
+        self.busy_time = 0.0
+        self.late_ticks = 0
+
+    async def start(self, host='127.0.0.1', port=0):
+        """Starts accepting connections. Returns the port listened on."""
+        self.server = await asyncio.start_server(self.connect, host, port, backlog=ArenaServer.BACKLOG)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def run(self, ticks=None):
+        """Ticks the Arena on schedule until stop() is called, or for the given number of ticks."""
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.tick_rate
+        deadline = loop.time()
+        self.running = True
+        while self.running and (ticks is None or ticks > 0):
+            start = time.perf_counter()
+            self.tick()
+            self.busy_time += time.perf_counter() - start
+            if ticks is not None:
+                ticks -= 1
+            deadline += interval
+            now = loop.time()
+            if deadline < now:
+                # Behind schedule: start the next tick now rather than run the missed ones back to back.
+                self.late_ticks += 1
+                deadline = now
+            await asyncio.sleep(deadline - now)
+        self.running = False
+
+    async def serve(self, host, port):
+        """Starts accepting connections and ticks the Arena until stop() is called."""
+        await self.start(host, port)
+        async with self.server:
+            await self.run()
+
+    def stop(self):
+        self.running = False
+        if self.server is not None:
+            self.server.close()
+
+    def tick(self):
+        """Applies one buffered turn per player and the bots' turns, ticks the Arena and sends the delta to every
+        client."""
+        arena = self.arena
+        for snake in arena.snakes:
+            client = self.players.get(snake.index)
+            if client is None:
+                direction = self.bots[snake.index].decide()
+                if direction is not None:
+                    snake.turn(direction)
+                continue
+            # Skip turns that would not change the direction, so that they do not use up a tick.
+            while client.inputs and not snake.turn(client.inputs.popleft()):
+                pass
+        arena.tick()
+        self.broadcast(arena.encode_delta())
+
+    def broadcast(self, payload):
+        frame = ArenaServer.FRAME.pack(len(payload)) + payload
+        for client in list(self.clients):
+            if client.writer.transport.get_write_buffer_size() > ArenaServer.WRITE_LIMIT:
+                self.disconnect(client)
+            else:
+                client.writer.write(frame)
+
+    async def connect(self, reader, writer):
+        """Serves one client: gives it a free Snake if there is one and the Arena's state, then reads its turns."""
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        snake = next((snake for snake in self.arena.snakes if snake.index not in self.players), None)
+        client = ArenaConnection(writer, snake, self.input_buffer)
+        self.clients.append(client)
+        if snake is not None:
+            self.players[snake.index] = client
+        payload = ArenaServer.WELCOME.pack(ArenaServer.NO_SNAKE if snake is None else snake.index) + self.arena.encode_state()
+        writer.write(ArenaServer.FRAME.pack(len(payload)) + payload)
+        try:
+            while True:
+                data = await reader.read(64)
+                if not data:
+                    break
+                if client.snake is not None:
+                    client.inputs.extend(Arena.DIRECTIONS[code] for code in data if code < len(Arena.DIRECTIONS))
+        except ConnectionError:
+            pass
+        finally:
+            self.disconnect(client)
+
+    def disconnect(self, client):
+        """Closes a client's connection and hands its Snake back to its bot."""
+        if client in self.clients:
+            self.clients.remove(client)
+            if client.snake is not None:
+                del self.players[client.snake.index]
+            client.writer.close()
@@ -0,0 +1,85 @@
+import pygame
+
+
+class Assets:
+    """Loads each image once and caches scaled copies of it by (path, size), counting cache hits and misses."""
+
+    def __init__(self):
+        self.images = {}
+        self.surfaces = {}
+        self.atlas = None
+        self.hits = 0
+        self.misses = 0
+
+    def image(self, path):
+        """Returns the image at path at its original size, loading it from disk only the first time."""
+        image = self.images.get(path)
+        if image is not None:
+            self.hits += 1
+            return image
+        self.misses += 1
+        image = pygame.image.load(path)
+        # Converting needs a display mode; before one is set (e.g. for the window icon) keep the raw image.
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        self.images[path] = image
+        return image
+
+    def scaled(self, path, size):
+        """Returns the image at path scaled to size, scaling it only the first time."""
+        key = (path, tuple(size))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = pygame.transform.scale(self.image(path), key[1])
+        self.surfaces[key] = surface
+        return surface
+
+    def solid(self, color, size):
+        """Returns a surface of the given size filled with color, shared by every caller asking for the same one."""
+        key = (tuple(color), tuple(size))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = pygame.surface.Surface(key[1])
+        surface.fill(key[0])
+        self.surfaces[key] = surface
+        return surface
+
+    def pack(self, width=1024):
+        """Packs every cached scaled surface into one atlas surface, replacing each with a subsurface view of it.
+
+        Surfaces are placed left to right on shelves as tall as their tallest surface. Returns the atlas.
+        """
+        keys = sorted(self.surfaces, key=lambda key: self.surfaces[key].get_height(), reverse=True)
+        positions = {}
+        x = y = shelf_height = 0
+        for key in keys:
+            surface_width, surface_height = self.surfaces[key].get_size()
+            if x + surface_width > width:
+                x, y, shelf_height = 0, y + shelf_height, 0
+            positions[key] = (x, y)
+            x += surface_width
+            shelf_height = max(shelf_height, surface_height)
+
+        self.atlas = pygame.surface.Surface((width, max(y + shelf_height, 1)), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            self.atlas = self.atlas.convert_alpha()
+        for key, position in positions.items():
+            surface = self.surfaces[key]
+            # Copy the pixels as they are rather than blending them onto the transparent atlas.
+            self.atlas.blit(surface, position, special_flags=pygame.BLEND_RGBA_MAX)
+            self.surfaces[key] = self.atlas.subsurface(pygame.Rect(position, surface.get_size()))
+        return self.atlas
+
+    def stats(self):
+        """Returns the cache counters and sizes as a dict."""
+        return {'hits': self.hits, 'misses': self.misses, 'images': len(self.images), 'surfaces': len(self.surfaces)}
+
+
+# The cache shared by every sprite in the game.
+assets = Assets()
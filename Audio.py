@@ -0,0 +1,112 @@
+import time
+from array import array
+import pygame
+
+
+class Audio:
+    """Plays the game's sound effects with as little delay as the mixer allows.
+
+    The mixer is opened with a small buffer, and each effect is decoded to raw samples once, when loaded, with its
+    leading silence cut off. Every category of sound plays on channels reserved for it, so a burst of turns can only
+    cut off an older turn sound, never the death sound. A sound played within MIN_INTERVAL of the last one started in its
+    category is coalesced into that one. A muted Audio never opens the mixer.
+    """
+    FREQUENCY = 44100
+    # Samples per mixer buffer: about 6 ms at 44.1 kHz, where SDL's default of 512 or more adds 12 ms or more.
+    BUFFER = 256
+    # Name: (path, category) of each sound.
+    SOUNDS = {
+        'eat': ('res/sound/eat.wav', 'eat'),
+        'up': ('res/sound/up.ogg', 'turn'),
+        'down': ('res/sound/down.ogg', 'turn'),
+        'left': ('res/sound/left.ogg', 'turn'),
+        'right': ('res/sound/right.ogg', 'turn'),
+        'death': ('res/sound/death.ogg', 'death')
+    }
+    # Channels reserved for each category.
+    CHANNELS = {'turn': 2, 'eat': 2, 'death': 1}
+    MIN_INTERVAL = 0.03
+    # Samples quieter than this (out of 32767) at the start of a sound are cut.
+    SILENCE = 256
+
+    def __init__(self, muted=False, clock=time.perf_counter):
+        self.muted = muted
+        self.clock = clock
+        # Sounds by name, filled in by load(); sounds played before they are loaded are skipped.
+        self.sounds = {}
+        # The channels of each category, the index in it of the next channel to play on, and when it last played.
+        self.channels = {}
+        self.next_channel = {}
+        self.last_played = {}
+        self.played = 0
+        self.coalesced = 0
+        # Milliseconds of leading silence cut from each sound.
+        self.trimmed = {}
+
+    def load(self):
+        """Opens the mixer, reserves the channels and decodes the sounds. Muted (and returns False) if there is no audio
+        device. May run on a loading thread."""
+        if self.muted:
+            return False
+        try:
+            pygame.mixer.init(Audio.FREQUENCY, -16, 2, Audio.BUFFER)
+        except pygame.error:
+            self.muted = True
+            return False
+        count = sum(Audio.CHANNELS.values())
+        pygame.mixer.set_num_channels(count)
+        # Keep pygame from picking these channels for sounds played without one.
+        pygame.mixer.set_reserved(count)
+        first = 0
+        channels = {}
+        for category, size in Audio.CHANNELS.items():
+            channels[category] = [pygame.mixer.Channel(index) for index in range(first, first + size)]
+            first += size
+            self.next_channel[category] = 0
+        self.channels = channels
+        for name, (path, _) in Audio.SOUNDS.items():
+            self.sounds[name] = self.decode(name, path)
+        return True
+
+    def decode(self, name, path):
+        """Returns the sound at path decoded to the mixer's format, without its leading silence."""
+        sound = pygame.mixer.Sound(path)
+        frequency, size, channels = pygame.mixer.get_init()
+        if size != -16:
+            return sound
+        samples = array('h', sound.get_raw())
+        start = 0
+        while start < len(samples) and abs(samples[start]) < Audio.SILENCE:
+            start += 1
+        # Cut on a whole frame, so that the stereo channels stay in step.
+        start -= start % channels
+        if start == 0 or start == len(samples):
+            # Nothing to cut, or nothing but silence.
+            self.trimmed[name] = 0.0
+            return sound
+        self.trimmed[name] = start // channels * 1000 / frequency
+        return pygame.mixer.Sound(buffer=samples[start:].tobytes())
+
+    def play(self, name):
+        """Plays a sound on its category's next channel, unless it is muted, not loaded yet, or coalesced."""
+        if self.muted:
+            return
+        sound = self.sounds.get(name)
+        if sound is None:
+            return
+        category = Audio.SOUNDS[name][1]
+        now = self.clock()
+        if now - self.last_played.get(category, -Audio.MIN_INTERVAL) < Audio.MIN_INTERVAL:
+            self.coalesced += 1
+            return
+        self.last_played[category] = now
+        channels = self.channels[category]
+        # Prefer an idle channel; if all are busy, cut off the one started longest ago.
+        index = self.next_channel[category]
+        for offset in range(len(channels)):
+            if not channels[(index + offset) % len(channels)].get_busy():
+                index = (index + offset) % len(channels)
+                break
+        channels[index].play(sound)
+        self.next_channel[category] = (index + 1) % len(channels)
+        self.played += 1
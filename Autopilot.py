@@ -0,0 +1,185 @@
+from array import array
+from collections import deque
+from itertools import islice
+from SnakeEngine import SnakeEngine
+
+
+class Autopilot:
+    """Steers the Snake of a SnakeEngine along the shortest safe path to the fruit, or around a Hamiltonian cycle.
+
+    A path to the fruit is safe if, after eating at its end, the Snake can still reach its own tail. Searches know
+    when each segment will have moved away, so a path may run through cells the tail is about to leave. A planned
+    path is followed without searching again until the fruit, the walls or the Snake change other than as planned.
+    CHEESE holes are treated as segments; in ZEN mode only the edges of the board are avoided.
+
+    Headless use: engine.step(autopilot.decide()) once per tick.
+    """
+    DIRECTIONS = (SnakeEngine.DIRECTION_UP, SnakeEngine.DIRECTION_DOWN, SnakeEngine.DIRECTION_LEFT, SnakeEngine.DIRECTION_RIGHT)
+
+    def __init__(self, engine):
+        self.engine = engine
+        rows, columns = engine.rows, engine.columns
+        size = rows * columns
+        self.neighbours = []
+        for cell in range(size):
+            row, column = divmod(cell, columns)
+            self.neighbours.append(tuple(cell + row_step * columns + column_step for row_step, column_step in Autopilot.DIRECTIONS
+                                         if 0 <= row + row_step < rows and 0 <= column + column_step < columns))
+        self.steps = {row_step * columns + column_step: (row_step, column_step) for row_step, column_step in Autopilot.DIRECTIONS}
+        # The position of each cell on a Hamiltonian cycle of the board, or -1 for a cell left off it.
+        positions = board_cycle(rows, columns)
+        self.cycle_length = len(positions)
+        self.cycle = array('i', [-1]) * size
+        for index, (row, column) in enumerate(positions):
+            self.cycle[engine.cell(row, column)] = index
+
+        # Search buffers, reused by every search: a cell's entries are only valid if its stamp is the current search's.
+        self.stamp = 0
+        self.busy_stamps = array('I', [0]) * size
+        # The number of moves until the segment on a cell has left it.
+        self.busy_until = array('i', [0]) * size
+        self.visited = array('I', [0]) * size
+        self.parent = array('i', [0]) * size
+
+        # The planned path to the fruit (cells after the head), valid while the engine matches self.expected.
+        self.plan = deque()
+        self.expected = None
+        self.searches = 0
+
+    def decide(self):
+        """Returns the direction to turn the Snake to before the next tick, or None to leave it be."""
+        engine = self.engine
+        if engine.game_mode.option_mode is not None:
+            return None
+        if not self.plan or self.expected != self.state(engine.head, engine.ticks):
+            self.plan = deque(self.plan_to_fruit() or ())
+        cell = self.plan.popleft() if self.plan else self.safe_step()
+        if cell is None:
+            return None
+        self.expected = self.state(cell, engine.ticks + 1)
+        return self.steps[cell - engine.head]
+
+    def state(self, head, ticks):
+        engine = self.engine
+        return head, ticks, engine.fruit_cell, len(engine.static_walls) + len(engine.dynamic_walls)
+
+    def plan_to_fruit(self):
+        """Returns the cells of the shortest safe path from the head to the fruit, or None if there is none."""
+        engine = self.engine
+        if engine.fruit_cell is None:
+            return None
+        path = self.search(engine.head, engine.body, engine.new_block, engine.fruit_cell)
+        if path is None or engine.free_movement:
+            return path
+        # The body once the path has been followed: the path head first, then what is left of the current body.
+        length = len(engine.body) + engine.new_block
+        body = path[::-1][:length]
+        body.extend(islice(engine.body, 0, length - len(body)))
+        if self.search(body[0], body, True, body[-1]) is None:
+            return None
+        return path
+
+    def cycle_distance(self, cell, target):
+        """Returns how far along the cycle target is from cell; cells off the cycle are as far as can be."""
+        if self.cycle[cell] < 0 or self.cycle[target] < 0:
+            return self.cycle_length
+        return (self.cycle[target] - self.cycle[cell]) % self.cycle_length
+
+    def safe_step(self):
+        """Returns a neighbour of the head that keeps the tail reachable, preferring the one closest to the fruit
+        along the cycle, so that the Snake keeps going around the cycle toward it.
+
+        Falls back to any neighbour the Snake survives moving to, or None if there is none.
+        """
+        engine = self.engine
+        head = engine.head
+        length = len(engine.body)
+        target = engine.fruit_cell if engine.fruit_cell is not None else head
+        if self.cycle[target] < 0:
+            # The fruit is off the cycle; head for the cycle next to it.
+            target = min(self.neighbours[target], key=lambda cell: self.cycle[cell] < 0)
+        moves = sorted(self.neighbours[head], key=lambda cell: self.cycle_distance(cell, target))
+        survivable = []
+        for cell in moves:
+            if not engine.free_movement:
+                if engine.is_wall(cell):
+                    continue
+                index = engine.segment_index(cell)
+                if index is not None and length - index + engine.new_block > 1:
+                    continue
+            survivable.append(cell)
+            body = [cell]
+            body.extend(islice(engine.body, 0, length - 1 + engine.new_block))
+            if self.search(cell, body, cell == engine.fruit_cell, body[-1]) is not None:
+                return cell
+        return survivable[0] if survivable else None
+
+    def search(self, head, body, growing, target):
+        """Breadth-first searches from head to target. Returns the cells of the path after head, or None.
+
+        body (head first) is the Snake at the start of the search, growing whether its tail stays put on the first move.
+        A segment blocks its cell until the tail has moved past it.
+        """
+        engine = self.engine
+        self.stamp += 1
+        self.searches += 1
+        stamp = self.stamp
+        busy_stamps, busy_until, visited, parent = self.busy_stamps, self.busy_until, self.visited, self.parent
+        blocking = not engine.free_movement
+        if blocking:
+            length = len(body) + growing
+            for index, cell in enumerate(body):
+                # Only the newest segment on a cell (the first one found) matters.
+                if busy_stamps[cell] != stamp:
+                    busy_stamps[cell] = stamp
+                    busy_until[cell] = length - index
+        grid = engine.grid
+        neighbours = self.neighbours
+        visited[head] = stamp
+        frontier = [head]
+        moves = 0
+        while frontier:
+            moves += 1
+            next_frontier = []
+            for cell in frontier:
+                for neighbour in neighbours[cell]:
+                    if visited[neighbour] == stamp:
+                        continue
+                    if blocking and (grid[neighbour] & SnakeEngine.WALL or busy_stamps[neighbour] == stamp and busy_until[neighbour] > moves):
+                        # Blocked now, but it may be free when reached later along a longer path.
+                        continue
+                    visited[neighbour] = stamp
+                    parent[neighbour] = cell
+                    if neighbour == target:
+                        return self.path(head, target)
+                    next_frontier.append(neighbour)
+            frontier = next_frontier
+        return None
+
+    def path(self, head, target):
+        path = []
+        cell = target
+        while cell != head:
+            path.append(cell)
+            cell = self.parent[cell]
+        path.reverse()
+        return path
+
+
+def hamiltonian_cycle(rows, columns):
+    """Returns (row, column) positions of a cycle covering a rows x columns grid; rows must be even."""
+    cycle = [(0, column) for column in range(columns)]
+    for row in range(1, rows):
+        sweep = range(columns - 1, 0, -1) if row % 2 else range(1, columns)
+        cycle.extend((row, column) for column in sweep)
+    cycle.extend((row, 0) for row in range(rows - 1, 0, -1))
+    return cycle
+
+
+def board_cycle(rows, columns):
+    """Returns a Hamiltonian cycle of a board; if both sides are odd, one that leaves off the last column."""
+    if rows % 2 == 0:
+        return hamiltonian_cycle(rows, columns)
+    if columns % 2 != 0:
+        columns -= 1
+    return [(row, column) for column, row in hamiltonian_cycle(columns, rows)]
@@ -0,0 +1,231 @@
+import numpy as np
+from GameMode import PlayMode
+from SnakeEngine import SnakeEngine, Event
+from WallConnectivity import WallConnectivity
+
+
+class BatchEngine:
+    """Simulates many Snake games of one board size in lockstep, with the rules of SnakeEngine, using NumPy arrays.
+
+    Every board is advanced by one vectorized step(actions) call. Boards whose Snake dies restart on their own, like a
+    SnakeEngine does. Fruit and walls are placed by the batch's own random generator, so a board does not reproduce
+    the placements a SnakeEngine with the same seed would make; fruit kinds and OptionModes are not simulated.
+
+    Actions and directions are codes indexing DIRECTIONS, or NO_ACTION to keep going.
+    """
+    DIRECTIONS = (SnakeEngine.DIRECTION_UP, SnakeEngine.DIRECTION_DOWN, SnakeEngine.DIRECTION_LEFT, SnakeEngine.DIRECTION_RIGHT)
+    NO_ACTION = -1
+    PLAY_MODES = tuple(PlayMode)
+
+    def __init__(self, size, rows=SnakeEngine.ROWS, columns=SnakeEngine.COLUMNS, play_mode=PlayMode.CLASSIC, seed=None):
+        """Creates size boards. play_mode is one PlayMode for every board or a sequence of one per board."""
+        self.size = size
+        self.rows = rows
+        self.columns = columns
+        self.random = np.random.default_rng(seed)
+        self.boards = np.arange(size)
+        cells = rows * columns
+
+        # The start layout of a SnakeEngine of this size, centered on the board like its own.
+        template = SnakeEngine(rows, columns, seed=0)
+        self.start_body = np.array(template.body)
+        self.fruit_start = template.fruit_cell
+
+        modes = [play_mode] * size if isinstance(play_mode, PlayMode) else list(play_mode)
+        if len(modes) != size:
+            raise ValueError(f"Expected {size} play modes, got {len(modes)}")
+        self.play_mode = np.array([BatchEngine.PLAY_MODES.index(mode) for mode in modes], dtype=np.int8)
+        self.zen = self.play_mode == BatchEngine.PLAY_MODES.index(PlayMode.ZEN)
+        self.cheese = self.play_mode == BatchEngine.PLAY_MODES.index(PlayMode.CHEESE)
+        self.wall_mode = self.play_mode == BatchEngine.PLAY_MODES.index(PlayMode.WALL)
+
+        # Step (rows, columns) of each direction code.
+        self.row_steps = np.array([direction[0] for direction in BatchEngine.DIRECTIONS])
+        self.column_steps = np.array([direction[1] for direction in BatchEngine.DIRECTIONS])
+
+        # Each body is a ring buffer of cells; the head is at head_index and the tail length - 1 entries before it.
+        self.bodies = np.zeros((size, cells), dtype=np.int32)
+        self.head_index = np.zeros(size, dtype=np.int64)
+        self.length = np.zeros(size, dtype=np.int64)
+        # Occupancy grid: the number of segments on each cell, and the parity of the serial of the newest one, which
+        # is all that CHEESE mode needs to tell holes from segments.
+        self.occupancy = np.zeros((size, cells), dtype=np.uint16)
+        self.parity = np.zeros((size, cells), dtype=np.uint8)
+        self.serial = np.zeros(size, dtype=np.int64)
+        self.walls = np.zeros((size, cells), dtype=bool)
+        # The WallConnectivity of each board's walls, built when it first needs one after a restart; see connectivity().
+        self.wall_connectivity = [None] * size
+        # The fruit cell of each board, or -1 if the board is full.
+        self.fruit = np.zeros(size, dtype=np.int64)
+        self.direction = np.zeros(size, dtype=np.int8)
+        self.new_block = np.zeros(size, dtype=bool)
+        self.score = np.zeros(size, dtype=np.int64)
+        self.high_score = np.zeros(size, dtype=np.int64)
+        self.ticks = 0
+        self.restart(self.boards)
+
+    def restart(self, boards):
+        """Resets the Snake, fruit, walls and score of the given boards, keeping their high scores."""
+        self.occupancy[boards] = 0
+        self.walls[boards] = False
+        for board in boards[self.wall_mode[boards]].tolist():
+            self.wall_connectivity[board] = None
+        length = len(self.start_body)
+        # Lay the body out tail first, numbering segments from the tail like SnakeEngine.set_body().
+        self.bodies[boards, :length] = self.start_body[::-1]
+        self.parity[boards[:, None], self.start_body[::-1]] = np.arange(length) & 1
+        self.occupancy[boards[:, None], self.start_body] = 1
+        self.head_index[boards] = length - 1
+        self.length[boards] = length
+        self.serial[boards] = length - 1
+        self.fruit[boards] = self.fruit_start
+        self.direction[boards] = BatchEngine.NO_ACTION
+        self.new_block[boards] = False
+        self.high_score[boards] = np.maximum(self.high_score[boards], self.score[boards])
+        self.score[boards] = 0
+
+    def grow(self):
+        """Doubles the capacity of the body ring buffers, laying each body out from the start again."""
+        capacity = self.bodies.shape[1]
+        indices = (self.head_index - self.length + 1)[:, None] + np.arange(capacity)
+        bodies = np.zeros((self.size, 2 * capacity), dtype=np.int32)
+        bodies[:, :capacity] = np.take_along_axis(self.bodies, indices % capacity, axis=1)
+        self.bodies = bodies
+        self.head_index = self.length - 1
+
+    @property
+    def heads(self):
+        return self.bodies[self.boards, self.head_index]
+
+    def body(self, board):
+        """Returns the cells of a board's Snake, head first."""
+        capacity = self.bodies.shape[1]
+        indices = (self.head_index[board] - np.arange(self.length[board])) % capacity
+        return self.bodies[board, indices].tolist()
+
+    @property
+    def heading(self):
+        """Returns the direction code each Snake last moved in, from its neck to its head (see SnakeEngine.heading)."""
+        capacity = self.bodies.shape[1]
+        steps = self.heads - self.bodies[self.boards, (self.head_index - 1) % capacity]
+        return np.select([steps == -self.columns, steps == self.columns, steps == -1], [0, 1, 2], 3)
+
+    def turn(self, actions):
+        """Turns each Snake toward its action code, unless it last moved in that axis (outside ZEN), like
+        SnakeEngine.turn(): a Snake that has not started moving can start in any direction but back into its neck."""
+        actions = np.asarray(actions)
+        heading = self.heading
+        # Codes 0 and 1 are vertical, 2 and 3 horizontal.
+        same_axis = heading // 2 == actions // 2
+        starting = (self.direction < 0) & (actions == heading)
+        turning = (actions >= 0) & (~same_axis | self.zen | starting)
+        self.direction = np.where(turning, actions, self.direction).astype(np.int8)
+
+    def step(self, actions=None):
+        """Turns every Snake toward its action and advances every board one tick. Returns the Event flags per board."""
+        if actions is not None:
+            self.turn(actions)
+        self.ticks += 1
+        events = np.zeros(self.size, dtype=np.uint8)
+        capacity = self.bodies.shape[1]
+
+        moving = np.flatnonzero(self.direction >= 0)
+        # The tail leaves its cell before the head moves, unless the Snake is growing.
+        popping = moving[~self.new_block[moving]]
+        self.new_block[moving] = False
+        tails = self.bodies[popping, (self.head_index[popping] - self.length[popping] + 1) % capacity]
+        self.occupancy[popping, tails] -= 1
+        self.length[popping] -= 1
+
+        heads = self.bodies[moving, self.head_index[moving]]
+        direction = self.direction[moving]
+        rows = heads // self.columns + self.row_steps[direction]
+        columns = heads % self.columns + self.column_steps[direction]
+        inside = (rows >= 0) & (rows < self.rows) & (columns >= 0) & (columns < self.columns)
+        new_heads = np.where(inside, rows * self.columns + columns, 0)
+        # In CHEESE mode, segments an odd distance from the head are holes.
+        hole = self.cheese[moving] & (self.parity[moving, new_heads] != (self.serial[moving] & 1))
+        hits = (self.occupancy[moving, new_heads] > 0) & ~hole | self.walls[moving, new_heads]
+        dies = ~inside | hits & ~self.zen[moving]
+
+        alive = ~dies
+        moved, new_heads = moving[alive], new_heads[alive]
+        if len(moved) and self.length[moved].max() >= capacity:
+            # Only ZEN Snakes, which overlap themselves, can grow longer than the board has cells.
+            self.grow()
+            capacity = self.bodies.shape[1]
+        self.serial[moved] += 1
+        self.head_index[moved] = (self.head_index[moved] + 1) % capacity
+        self.bodies[moved, self.head_index[moved]] = new_heads
+        self.length[moved] += 1
+        self.occupancy[moved, new_heads] += 1
+        self.parity[moved, new_heads] = self.serial[moved] & 1
+        events[moved] = Event.MOVED
+
+        died = moving[dies]
+        self.restart(died)
+        events[died] = Event.DIED
+
+        # Snakes that are alive eat the fruit at their head.
+        ate = np.flatnonzero((self.heads == self.fruit) & (events != Event.DIED))
+        if len(ate):
+            self.fruit[ate] = self.sample_free(ate)
+            self.new_block[ate] = True
+            self.score[ate] += 1
+            events[ate] |= np.uint8(Event.ATE)
+            # Create a wall if the new score is odd (and play mode is WALL).
+            walled = self.create_random_walls(ate[self.wall_mode[ate] & (self.score[ate] % 2 != 0)])
+            events[walled] |= np.uint8(Event.WALL_CREATED)
+        return events
+
+    def connectivity(self, board):
+        """Returns the WallConnectivity of a board's walls, building it if the board restarted since last time."""
+        connectivity = self.wall_connectivity[board]
+        if connectivity is None:
+            connectivity = self.wall_connectivity[board] = WallConnectivity(
+                self.rows, self.columns, np.flatnonzero(self.walls[board]).tolist())
+        return connectivity
+
+    def create_random_walls(self, boards):
+        """Creates a wall on a random free cell of each of the given boards, following SnakeEngine.create_random_wall():
+        only cells WallConnectivity.allows are used, resampling boards whose cell is not for up to WALL_ATTEMPTS tries,
+        then picking among all the allowed free cells. Returns the boards that got a wall."""
+        cells = np.full(len(boards), -1)
+        pending = np.arange(len(boards))
+        for _ in range(SnakeEngine.WALL_ATTEMPTS):
+            if not len(pending):
+                break
+            samples = self.sample_free(boards[pending])
+            allowed = np.array([cell >= 0 and self.connectivity(board).allows(cell)
+                                for board, cell in zip(boards[pending].tolist(), samples.tolist())], dtype=bool)
+            cells[pending[allowed]] = samples[allowed]
+            # Boards without a free cell are left without a wall.
+            pending = pending[~allowed & (samples >= 0)]
+        for index in pending.tolist():
+            connectivity = self.connectivity(boards[index])
+            allowed = [cell for cell in np.flatnonzero(self.free(boards[index:index + 1])[0]).tolist()
+                       if connectivity.allows(cell)]
+            if allowed:
+                cells[index] = allowed[self.random.integers(len(allowed))]
+        placed = cells >= 0
+        boards, cells = boards[placed], cells[placed]
+        for board, cell in zip(boards.tolist(), cells.tolist()):
+            self.connectivity(board).add(cell)
+        self.walls[boards, cells] = True
+        return boards
+
+    def free(self, boards):
+        """Returns a mask per board of the given boards of the cells without a segment, wall or fruit."""
+        free = (self.occupancy[boards] == 0) & ~self.walls[boards]
+        fruit = self.fruit[boards]
+        has_fruit = fruit >= 0
+        free[np.flatnonzero(has_fruit), fruit[has_fruit]] = False
+        return free
+
+    def sample_free(self, boards):
+        """Returns a random cell without a segment, wall or fruit on each of the given boards, or -1 if there is none."""
+        free = self.free(boards)
+        counts = free.sum(axis=1)
+        picks = (self.random.random(len(boards)) * counts).astype(np.int64)
+        cells = np.argmax(np.cumsum(free, axis=1) > picks[:, None], axis=1)
+        return np.where(counts > 0, cells, -1)
@@ -1,99 +1,148 @@
 import pygame
-from enum import Enum
-import random
+from BoardSize import BoardSize
 from Wall import Wall
-from Fruit import Fruit
-
-
-class BoardSize(Enum):
-    SMALL = (17, 15)
-    MEDIUM = (17, 15)
-    LARGE = (17, 15)
-
-    def __init__(self, columns, rows):
-        self.columns = columns
-        self.rows = rows
 
 
 class Tile:
-    """Represents a singular tile on the Board."""
-    def __init__(self, rect, board, row, column):
-        self.rect = rect
+    """A view of a singular tile on the Board, computed on demand by Board.get_tile()."""
+    def __init__(self, board, row, column):
         self.board = board
         self.row = row
         self.column = column
-        self.fruit = None
-        self.phantom_fruit = None
-        self.wall = None
+
+    @property
+    def rect(self):
+        return pygame.Rect(self.column * self.board.tile_width, self.row * self.board.tile_height, self.board.tile_width, self.board.tile_height)
+
+    @property
+    def wall(self):
+        return self.board.walls.get((self.row, self.column))
+
+    def __eq__(self, other):
+        return isinstance(other, Tile) and (self.board, self.row, self.column) == (other.board, other.row, other.column)
+
+    def __hash__(self):
+        return hash((self.row, self.column))
 
 
 class Board(pygame.sprite.Sprite):
-    """Represents the array-backed grid of tiles a Snake can move on or a Fruit can be placed on."""
+    """Represents the grid of tiles a Snake can move on or a Fruit can be placed on."""
     LIGHT_GREEN = (175, 215, 70)
     DARK_GREEN = (167, 209, 61)
     wall_color = (77, 127, 46)
+    # Grass surfaces by (columns, rows, size), or by (tile size, size) for camera boards, reused across resets and games. Nothing draws onto them.
+    BACKGROUNDS = {}
 
-    def __init__(self, size, rect):
+    def __init__(self, columns, rows, rect, tile_size=None):
         super().__init__()
+        # The screen area the Board is drawn in. With a tile_size the tiles keep that size and a Camera shows part of
+        # the Board; otherwise the tiles are sized so that the whole Board fills rect.
         self.rect = rect
-        self.image = self.tile(size)
+        self.tile_size = tile_size
+        self.image = self.tile(columns, rows)
+        # Walls on the Board by (row, column).
+        self.walls = {}
         self.static_walls = pygame.sprite.Group()
         self.dynamic_walls = pygame.sprite.Group()
 
-    def tile(self, size):
-        """Generates an array-backed grid for the Board, given a BoardSize, with alternating grass colors."""
-        self.size = size
-        # Generate placeholder values for the array backing the grid.
-        self.tiles = [[None for _ in range(self.size.columns)] for _ in range(self.size.rows)]
+    def tile(self, columns, rows):
+        """Sizes the grid for the Board and returns its surface, with alternating grass colors.
 
-        surface = pygame.surface.Surface(self.rect.size)
-        surface.fill(Board.LIGHT_GREEN)
+        With a tile_size the surface is a screen-sized window of the repeating grass pattern, plus two tiles along each
+        axis so that it can be blitted from any offset; see blit_background().
+        The surface is shared by every Board of the same grid and size; see Board.BACKGROUNDS.
+        """
+        self.columns = columns
+        self.rows = rows
 
-        # Calculate width and height of tiles to fill the BoardSize.
-        tile_width = self.rect.width / self.size.columns
-        tile_height = self.rect.height / self.size.rows
-
-        for row in range(self.size.rows):
-            if row % 2 == 0:
-                # Iterate over columns in even rows.
-                for column in range(self.size.columns):
-                    tile_rect = pygame.Rect(column * tile_width, row * tile_height, tile_width, tile_height)
-                    self.tiles[row][column] = Tile(tile_rect, self, row, column)
-                    # Only color even-column tiles in even rows.
-                    if column % 2 == 0:
-                        pygame.draw.rect(surface, Board.DARK_GREEN, tile_rect)
+        if self.tile_size is None:
+            # Calculate width and height of tiles to fill the Board.
+            self.tile_width = self.rect.width / self.columns
+            self.tile_height = self.rect.height / self.rows
+            key = (columns, rows, tuple(self.rect.size))
+        else:
+            self.tile_width = self.tile_height = self.tile_size
+            key = (self.tile_size, tuple(self.rect.size))
+        # The size of the whole Board in pixels.
+        self.size = (round(columns * self.tile_width), round(rows * self.tile_height))
+
+        surface = Board.BACKGROUNDS.get(key)
+        if surface is None:
+            if self.tile_size is None:
+                surface = self.checkerboard(self.rect.size, columns, rows)
             else:
-                # Iterate over columns in odd rows.
-                for column in range(self.size.columns):
-                    tile_rect = pygame.Rect(column * tile_width, row * tile_height, tile_width, tile_height)
-                    self.tiles[row][column] = Tile(tile_rect, self, row, column)
-                    # Only color odd-column tiles in odd rows.
-                    if column % 2 != 0:
-                        pygame.draw.rect(surface, Board.DARK_GREEN, tile_rect)
+                size = (self.rect.width + 2 * self.tile_size, self.rect.height + 2 * self.tile_size)
+                surface = self.checkerboard(size, -(-size[0] // self.tile_size), -(-size[1] // self.tile_size))
+            Board.BACKGROUNDS[key] = surface
+        return surface
 
+    def checkerboard(self, size, columns, rows):
+        """Draws the grass: one strip of tiles for even rows and one for odd rows, then a blit of a strip per row."""
+        surface = pygame.surface.Surface(size)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        surface.fill(Board.LIGHT_GREEN)
+        height = self.get_tile(0, 0).rect.height
+        if height == 0 or self.get_tile(0, 0).rect.width == 0:
+            # Tiles smaller than a pixel are truncated away.
+            return surface
+
+        # Only color even-column tiles in even rows and odd-column tiles in odd rows.
+        strips = []
+        for parity in (0, 1):
+            strip = pygame.surface.Surface((size[0], height))
+            strip.fill(Board.LIGHT_GREEN)
+            for column in range(parity, columns, 2):
+                pygame.draw.rect(strip, Board.DARK_GREEN, self.get_tile(0, column).rect)
+            strips.append(strip)
+        surface.blits([(strips[row % 2], self.get_tile(row, 0).rect.topleft) for row in range(rows)], doreturn=False)
         return surface
 
-    def get_tile(self, row, column):
-        """Returns the tile [row][column] on the game Board where row, column < the BoardType size."""
-        return self.tiles[int(row)][int(column)]
+    def blit_background(self, screen, rect, area):
+        """Draws the grass of area, a rect of the Board in Board pixels, onto the same sized rect of the screen.
 
-    def get_random_tile(self):
-        """Returns a random tile on the game Board."""
-        return self.get_tile(random.randrange(self.size.rows), random.randrange(self.size.columns))
+        Parts of area beyond the edges of the Board are drawn in the wall color.
+        """
+        if self.tile_size is None:
+            screen.blit(self.image, rect, area)
+            return
+        inside = area.clip(pygame.Rect((0, 0), self.size))
+        if inside != area:
+            screen.fill(Board.wall_color, rect)
+            if inside.width == 0 or inside.height == 0:
+                return
+            rect = rect.move(inside.x - area.x, inside.y - area.y)
+        period = 2 * self.tile_size
+        screen.blit(self.image, rect, pygame.Rect(inside.x % period, inside.y % period, inside.width, inside.height))
+
+    def get_tile(self, row, column):
+        """Returns the tile [row][column] on the game Board where row, column < the Board size."""
+        return Tile(self, int(row), int(column))
 
     def create_wall(self, row, column, static=False):
         """Create a Wall at the specified row and column; return the Wall."""
         wall = Wall(self, row, column)
-        self.get_tile(row, column).wall = wall
+        self.walls[(row, column)] = wall
         wall_group = self.static_walls if static else self.dynamic_walls
         wall_group.add(wall)
         return wall
 
-    def create_random_wall(self, static=False):
-        """Create a Wall at a random tile; return the Wall."""
-        tile = self.get_random_tile()
-        if isinstance(tile.wall, Wall) or isinstance(tile.fruit, Fruit):
-            self.create_random_wall()
-            return
-        return self.create_wall(tile.row, tile.column)
-
+    def sync_walls(self, cells, static=False):
+        """Create and remove Walls so that the walls of the Board match the given (row, column) cells."""
+        wall_group = self.static_walls if static else self.dynamic_walls
+        for wall in wall_group.sprites():
+            if (wall.tile.row, wall.tile.column) not in cells:
+                del self.walls[(wall.tile.row, wall.tile.column)]
+                wall.kill()
+        for row, column in cells:
+            if (row, column) not in self.walls:
+                self.create_wall(row, column, static)
+
+    def tiles_in(self, rect):
+        """Returns the (row, column) of every tile that overlaps the given rect."""
+        # Tile rects are truncated to whole pixels, so widen the range by a tile on each side.
+        first_row = max(int(rect.top / self.tile_height) - 1, 0)
+        last_row = min(int(rect.bottom / self.tile_height) + 1, self.rows - 1)
+        first_column = max(int(rect.left / self.tile_width) - 1, 0)
+        last_column = min(int(rect.right / self.tile_width) + 1, self.columns - 1)
+        return [(row, column) for row in range(first_row, last_row + 1) for column in range(first_column, last_column + 1)]
@@ -0,0 +1,11 @@
+from enum import Enum
+
+
+class BoardSize(Enum):
+    SMALL = (17, 15)
+    MEDIUM = (34, 30)
+    LARGE = (68, 60)
+
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
@@ -0,0 +1,52 @@
+import pygame
+
+
+class Camera:
+    """A screen-sized window onto a Board larger than the screen, following a rect such as the Snake's head.
+
+    rect is the part of the Board shown, in Board pixels. A Board smaller than the screen along an axis is centered on
+    it, so rect can start at a negative position.
+    """
+
+    def __init__(self, size, board_size, margin=0.25):
+        self.rect = pygame.Rect((0, 0), size)
+        self.board_size = board_size
+        # The target may come this fraction of the screen close to an edge before the camera moves.
+        self.margin = margin
+
+    @property
+    def offset(self):
+        """Returns where the Board's origin is drawn on the screen."""
+        return -self.rect.x, -self.rect.y
+
+    def follow(self, target):
+        """Recenters on the target rect if it came too close to an edge of the screen. Returns True if the camera moved.
+
+        Recentering instead of scrolling a little every tick keeps most frames incremental.
+        """
+        inner = self.rect.inflate(-2 * round(self.rect.width * self.margin), -2 * round(self.rect.height * self.margin))
+        if inner.contains(target):
+            return False
+        position = self.rect.topleft
+        self.center_on(target.center)
+        return self.rect.topleft != position
+
+    def center_on(self, point):
+        """Centers the camera on a point of the Board, as far as the Board's edges allow."""
+        self.rect.center = point
+        for axis in (0, 1):
+            view, board = self.rect.size[axis], self.board_size[axis]
+            if board <= view:
+                start = (board - view) // 2
+            else:
+                start = min(max(self.rect.topleft[axis], 0), board - view)
+            if axis == 0:
+                self.rect.x = start
+            else:
+                self.rect.y = start
+
+    def to_screen(self, rect):
+        return rect.move(-self.rect.x, -self.rect.y)
+
+    def to_board(self, rect):
+        return rect.move(self.rect.x, self.rect.y)
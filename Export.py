@@ -0,0 +1,132 @@
+"""Renders a recorded game to an image sequence or a raw video stream, one frame per tick, over a process pool.
+
+The ticks are split into chunks of consecutive frames. Each worker seeks its own ReplayPlayer to the start of a chunk
+and draws the chunk's frames with the game's Renderer onto an off-screen surface, repainting only what changed from
+one frame to the next. Frames are written as they are drawn: as numbered image files, or into their place in a raw
+RGB24 stream (every frame is the same size, so workers write at fixed offsets and no frame is held back for order).
+
+Run from the repository root, e.g.: python Export.py game.snkr frames/
+                                    python Export.py game.snkr game.rgb --format rgb
+"""
+import argparse
+import multiprocessing
+import os
+import time
+import pygame
+from Renderer import Renderer
+from Replay import Replay, ReplayPlayer
+from SnakeGame import SnakeGame, Vector2I
+
+FORMATS = ('png', 'bmp', 'tga', 'rgb')
+# Frames per chunk: enough that the full redraw at the start of each is a small share, few enough to balance the pool.
+CHUNK_FRAMES = 250
+
+# Set in each worker process by start_worker().
+worker = None
+
+
+class ExportWorker:
+    """Draws ranges of a replay's frames in one process."""
+
+    def __init__(self, replay, path, file_format, first):
+        # Draw without a window. A display mode is still needed to convert images to a fast format.
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        # SDL would turn the pool's SIGTERM into a quit event and keep the worker alive, so the pool could never end it.
+        os.environ.setdefault('SDL_NO_SIGNAL_HANDLERS', '1')
+        pygame.display.init()
+        pygame.font.init()
+        pygame.display.set_mode((1, 1))
+        self.player = ReplayPlayer(replay)
+        self.path = path
+        self.file_format = file_format
+        # Tick of the first frame of the raw stream.
+        self.first = first
+        self.surface = pygame.Surface(Vector2I(SnakeGame.SIZE))
+        self.font = pygame.font.Font("res/font/bit5x5.ttf", 24)
+
+    def render(self, first, last):
+        """Draws and writes the frames of ticks first to last (inclusive). Returns (frames, seconds)."""
+        start = time.perf_counter()
+        self.player.seek(first)
+        # seek() may replace the engine, so each chunk gets a renderer of its own, starting with a full redraw.
+        renderer = Renderer(self.player.engine, self.surface, self.font)
+        stream = None
+        if self.file_format == 'rgb':
+            stream = open(self.path, 'r+b')
+            stream.seek((first - self.first) * self.surface.get_width() * self.surface.get_height() * 3)
+        try:
+            for tick in range(first, last + 1):
+                if tick > first:
+                    if self.player.apply_inputs():
+                        renderer.invalidate()
+                    renderer.update(self.player.step())
+                renderer.draw()
+                if stream is not None:
+                    stream.write(pygame.image.tobytes(self.surface, 'RGB'))
+                else:
+                    pygame.image.save(self.surface, os.path.join(self.path, f'frame_{tick:06d}.{self.file_format}'))
+        finally:
+            if stream is not None:
+                stream.close()
+        return last - first + 1, time.perf_counter() - start
+
+
+def start_worker(replay, path, file_format, first):
+    global worker
+    worker = ExportWorker(replay, path, file_format, first)
+
+
+def render_chunk(chunk):
+    return worker.render(*chunk)
+
+
+def export(replay, path, file_format='png', first=0, last=None, processes=None):
+    """Writes the frames of ticks first to last (default: the end of the replay) to path: a directory of image files,
+    or a raw RGB24 file. Returns (frames, seconds)."""
+    last = replay.ticks if last is None else min(last, replay.ticks)
+    if file_format == 'rgb':
+        width, height = Vector2I(SnakeGame.SIZE)
+        # Size the stream up front, so that each worker can write its frames in place.
+        with open(path, 'wb') as stream:
+            stream.truncate((last - first + 1) * width * height * 3)
+    else:
+        os.makedirs(path, exist_ok=True)
+    chunks = [(start, min(start + CHUNK_FRAMES - 1, last)) for start in range(first, last + 1, CHUNK_FRAMES)]
+    processes = min(processes or multiprocessing.cpu_count(), len(chunks))
+    start = time.perf_counter()
+    if processes <= 1:
+        start_worker(replay, path, file_format, first)
+        frames = sum(render_chunk(chunk)[0] for chunk in chunks)
+    else:
+        # Spawned rather than forked: a fork would copy SDL's state if pygame was initialized in this process.
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(processes, start_worker, (replay, path, file_format, first)) as pool:
+            frames = sum(result[0] for result in pool.imap_unordered(render_chunk, chunks))
+            # Let the workers exit on their own rather than being terminated when the pool is left.
+            pool.close()
+            pool.join()
+    return frames, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a recorded Snake game to images or a raw video stream.")
+    parser.add_argument('replay', help="replay file saved with --record")
+    parser.add_argument('output', help="directory for the image files, or the file for the raw stream")
+    parser.add_argument('--format', choices=FORMATS, default='png',
+                        help="image file format, or rgb for a raw stream of RGB24 frames (default: png)")
+    parser.add_argument('--first', type=int, default=0, help="tick of the first frame (default: 0)")
+    parser.add_argument('--last', type=int, help="tick of the last frame (default: the end of the replay)")
+    parser.add_argument('--processes', type=int, help="worker processes (default: one per core)")
+    args = parser.parse_args(argv)
+
+    replay = Replay.load(args.replay)
+    frames, elapsed = export(replay, args.output, args.format, args.first, args.last, args.processes)
+    print(f"{frames} frames in {elapsed:.2f} s ({frames / elapsed:.0f} frames/s)")
+    if args.format == 'rgb':
+        width, height = Vector2I(SnakeGame.SIZE)
+        print(f"Encode with: ffmpeg -f rawvideo -pix_fmt rgb24 -s {width}x{height} -r {replay.tick_rate} "
+              f"-i {args.output} {os.path.splitext(args.output)[0]}.mp4")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+from array import array
+
+
+class FreeCells:
+    """An indexed set of the integer cells on a grid, with O(1) add, discard and uniform random sampling."""
+    # array('i', range(size)) by grid size. Slow to build for big grids, so it is built once and copied from.
+    RANGES = {}
+
+    def __init__(self, size, fill=True):
+        self.cells = FreeCells.cell_range(size)[:] if fill else array('i')
+        # Position of each cell in self.cells, or -1 if the cell is not in the set.
+        self.index = FreeCells.cell_range(size)[:] if fill else array('i', [-1]) * size
+
+    @staticmethod
+    def cell_range(size):
+        """Returns an array of the cells from 0 to size - 1, shared and not to be changed."""
+        cells = FreeCells.RANGES.get(size)
+        if cells is None:
+            cells = FreeCells.RANGES[size] = array('i', range(size))
+        return cells
+
+    @classmethod
+    def from_runs(cls, size, runs):
+        """Returns the set of the cells in runs(), in the same order (so it samples the same)."""
+        free = cls(size, fill=False)
+        identity = FreeCells.cell_range(size)
+        for first, length in zip(runs[::2], runs[1::2]):
+            position = len(free.cells)
+            if length == 1:
+                free.index[first] = position
+                free.cells.append(first)
+            else:
+                free.index[first:first + length] = identity[position:position + length]
+                free.cells += identity[first:first + length]
+        return free
+
+    def runs(self):
+        """Returns the cells in order as a flat array of (first cell, length) pairs, one per run of consecutive cells.
+
+        Cells only leave the order they start in where one is removed or added, so a big board that has seen little
+        play is a few long runs, which are found by comparing growing slices rather than cell by cell.
+        """
+        cells = self.cells
+        count = len(cells)
+        identity = FreeCells.cell_range(len(self.index))
+        runs = array('I')
+        position = 0
+        while position < count:
+            first = cells[position]
+            # Walk the start of the run cell by cell. If it goes on, double the length while it does, then narrow down
+            # where it ends, comparing only the new cells each time.
+            length = 1
+            while length < 8 and position + length < count and cells[position + length] == first + length:
+                length += 1
+            if length == 8:
+                step = 8
+                while position + length + step <= count and (cells[position + length:position + length + step] ==
+                                                             identity[first + length:first + length + step]):
+                    length += step
+                    step *= 2
+                while step > 1:
+                    step //= 2
+                    if position + length + step <= count and (cells[position + length:position + length + step] ==
+                                                              identity[first + length:first + length + step]):
+                        length += step
+            runs.append(first)
+            runs.append(length)
+            position += length
+        return runs
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return self.index[cell] >= 0
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def copy(self):
+        """Returns an independent copy of the set, with the cells in the same order (so it samples the same)."""
+        copy = FreeCells.__new__(FreeCells)
+        copy.cells = self.cells[:]
+        copy.index = self.index[:]
+        return copy
+
+    def add(self, cell):
+        if self.index[cell] < 0:
+            self.index[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def discard(self, cell):
+        position = self.index[cell]
+        if position >= 0:
+            # Move the last cell into the hole left by the removed one.
+            last = self.cells.pop()
+            if last != cell:
+                self.cells[position] = last
+                self.index[last] = position
+            self.index[cell] = -1
+
+    def sample(self, random):
+        """Returns a uniformly random cell using the given random.Random, or None if the set is empty."""
+        if not self.cells:
+            return None
+        return self.cells[random.randrange(len(self.cells))]
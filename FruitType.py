@@ -0,0 +1,32 @@
+from enum import Enum
+
+
+class FruitType(Enum):
+    APPLE = ("Apple", "res/fruit/apple.png")
+    BANANA = ("Banana", "res/fruit/banana.png")
+    PINEAPPLE = ("Pineapple", "res/fruit/pineapple.png")
+    GRAPE = ("Grape", "res/fruit/grape.png")
+    PUMPKIN = ("Pumpkin", "res/fruit/pumpkin.png")
+    TURNIP = ("Turnip", "res/fruit/turnip.png")
+    AUBERGINE = ("Aubergine", "res/fruit/aubergine.png")
+    STRAWBERRY = ("Strawberry", "res/fruit/strawberry.png")
+    CHERRY = ("Cherry", "res/fruit/cherry.png")
+    CARROT = ("Carrot", "res/fruit/carrot.png")
+    MUSHROOM = ("Mushroom", "res/fruit/mushroom.png")
+    BROCCOLI = ("Broccoli", "res/fruit/broccoli.png")
+    WATERMELON = ("Watermelon", "res/fruit/watermelon.png")
+
+    def __init__(self, display_name, skin_path):
+        self.display_name = display_name
+        self.skin_path = skin_path
+
+
+class PhantomFruitType(Enum):
+    SALAD = ("Salad", "res/fruit/salad.png")
+    WALL = ("Wall", "res/game_mode/wall.png")
+    CHEESE = ("Cheese", "res/game_mode/cheese.png")
+    ZEN = ("Zen", "res/game_mode/zen.png")
+
+    def __init__(self, display_name, skin_path):
+        self.display_name = display_name
+        self.skin_path = skin_path
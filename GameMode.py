@@ -0,0 +1,21 @@
+from enum import Enum, auto
+
+
+class PlayMode(Enum):
+    CLASSIC = auto()
+    WALL = auto()
+    ZEN = auto()
+    CHEESE = auto()
+
+
+class OptionMode(Enum):
+    CHANGE_FRUIT = auto()
+    CHANGE_GAME_MODE = auto()
+    CHANGE_SPEED = auto()
+    CHANGE_SNAKE = auto()
+
+
+class GameMode:
+    def __init__(self, play_mode, option_mode=None):
+        self.play_mode = play_mode
+        self.option_mode = option_mode
@@ -0,0 +1,85 @@
+import pygame
+
+
+class Hud:
+    """Draws lines of text over the Board, re-rendering a line only when its text or color changes.
+
+    Rendered text is cached by (text, color). Numbers are drawn as a row of cached digit glyphs, so that a new score
+    costs a few dict lookups instead of a call into the font renderer.
+    """
+    # The most rendered strings kept before the cache is emptied; scores only ever need a handful of them.
+    MAX_CACHED = 256
+
+    def __init__(self, font):
+        self.font = font
+        self.surfaces = {}
+        self.glyphs = {}
+        # The lines on screen as (text, color, blits, rect), where blits are the (surface, position) pairs drawing it.
+        self.lines = []
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, color):
+        """Returns a surface with the given text in the given color, rendering it only the first time."""
+        key = (text, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        self.misses += 1
+        if len(self.surfaces) >= Hud.MAX_CACHED:
+            self.surfaces.clear()
+        surface = self.surfaces[key] = self.font.render(text, True, color)
+        return surface
+
+    def glyphs_for(self, text, color):
+        """Returns the cached glyph of each digit in text, rendering a digit only the first time it is shown."""
+        glyphs = []
+        for digit in text:
+            key = (digit, color)
+            glyph = self.glyphs.get(key)
+            if glyph is None:
+                glyph = self.glyphs[key] = self.font.render(digit, True, color)
+            glyphs.append(glyph)
+        return glyphs
+
+    def layout(self, text, color, center):
+        """Returns the (surface, position) pairs drawing text centered on center, and the rect they cover."""
+        if text.isdigit() and text.isascii():
+            glyphs = self.glyphs_for(text, color)
+            rect = pygame.Rect(0, 0, sum(glyph.get_width() for glyph in glyphs), self.font.get_height())
+            rect.center = center
+            blits = []
+            x = rect.x
+            for glyph in glyphs:
+                blits.append((glyph, (x, rect.y)))
+                x += glyph.get_width()
+            return blits, rect
+        surface = self.render(text, color)
+        rect = surface.get_rect(center=center)
+        return [(surface, rect.topleft)], rect
+
+    def set_lines(self, lines):
+        """Shows the given lines of (text, color, center). Returns the screen rects to repaint, empty if none changed."""
+        dirty_rects = []
+        old_lines = self.lines
+        self.lines = []
+        for index, (text, color, center) in enumerate(lines):
+            color = tuple(color)
+            old_line = old_lines[index] if index < len(old_lines) else None
+            if old_line is not None and old_line[:2] == (text, color) and old_line[3].center == center:
+                self.lines.append(old_line)
+                continue
+            if old_line is not None:
+                dirty_rects.append(old_line[3])
+            blits, rect = self.layout(text, color, center)
+            self.lines.append((text, color, blits, rect))
+            dirty_rects.append(rect)
+        dirty_rects.extend(line[3] for line in old_lines[len(lines):])
+        return dirty_rects
+
+    def draw(self, screen, rect=None):
+        """Draws the lines, or only those overlapping rect."""
+        for _, _, blits, line_rect in self.lines:
+            if rect is None or line_rect.colliderect(rect):
+                screen.blits(blits, doreturn=False)
@@ -0,0 +1,123 @@
+import time
+from collections import deque
+
+
+class LatencyHistogram:
+    """Counts latencies in buckets of BUCKET seconds, so percentiles cost O(BUCKETS) however many were recorded.
+
+    The last bucket also holds every latency longer than the others cover.
+    """
+    BUCKET = 0.005
+    BUCKETS = 100
+
+    def __init__(self):
+        self.counts = [0] * LatencyHistogram.BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, latency):
+        self.counts[min(int(latency / LatencyHistogram.BUCKET), LatencyHistogram.BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+
+    def percentile(self, fraction):
+        """Returns the upper edge of the bucket holding the given fraction of the latencies, or 0.0 if there are none."""
+        remaining = fraction * self.count
+        for bucket, count in enumerate(self.counts):
+            remaining -= count
+            if remaining <= 0 and count:
+                return (bucket + 1) * LatencyHistogram.BUCKET
+        return 0.0
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def lines(self):
+        """Returns the non-empty buckets as lines of text, each with a bar scaled to the largest bucket."""
+        largest = max(self.counts)
+        lines = []
+        for bucket, count in enumerate(self.counts):
+            if count:
+                low = bucket * LatencyHistogram.BUCKET * 1e3
+                high = '' if bucket == LatencyHistogram.BUCKETS - 1 else f"{low + LatencyHistogram.BUCKET * 1e3:.0f}"
+                lines.append(f"{low:>5.0f}-{high:<5} {count:>7} {'#' * max(1, round(40 * count / largest))}")
+        return lines
+
+
+class InputQueue:
+    """Turns pressed between ticks, applied at most one per tick so that quick presses are not lost.
+
+    push() queues a turn with the time it was pressed. apply(), called just before each tick, turns the Snake with the
+    first queued turn it accepts. The Snake checks a turn against the direction it last moved in, so two presses
+    within one tick cannot reverse it into its own body; turns it refuses are dropped. The time from each turn's push
+    to the tick it moved the Snake in is kept in a LatencyHistogram per tick rate.
+    """
+    SIZE = 3
+
+    def __init__(self, size=SIZE, clock=time.perf_counter):
+        self.clock = clock
+        self.size = size
+        # (direction, time pushed) of the turns not applied yet.
+        self.turns = deque()
+        # LatencyHistogram of applied turns by tick rate.
+        self.latencies = {}
+        # Turns refused by the Snake, pushed onto a full queue or cleared before they were applied.
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self.turns)
+
+    def push(self, direction):
+        """Queues a turn. Returns False if the queue is full or the turn repeats the last one queued."""
+        if len(self.turns) >= self.size:
+            self.dropped += 1
+            return False
+        if self.turns and self.turns[-1][0] == direction:
+            return False
+        self.turns.append((direction, self.clock()))
+        return True
+
+    def apply(self, turn, tick_rate):
+        """Passes queued turns to turn(direction) until it returns True, e.g. a Snake's turn(), and records how long
+        the accepted one waited. Returns the direction turned to, or None."""
+        while self.turns:
+            direction, pushed = self.turns.popleft()
+            if turn(direction):
+                histogram = self.latencies.get(tick_rate)
+                if histogram is None:
+                    histogram = self.latencies[tick_rate] = LatencyHistogram()
+                histogram.add(self.clock() - pushed)
+                return direction
+            self.dropped += 1
+        return None
+
+    def clear(self):
+        """Drops the queued turns, e.g. when the Snake dies."""
+        self.dropped += len(self.turns)
+        self.turns.clear()
+
+    def lines(self, tick_rate):
+        """Returns a summary of the latencies at the given tick rate as lines of text, for an overlay."""
+        histogram = self.latencies.get(tick_rate)
+        if histogram is None:
+            return [f"input  no turns at {tick_rate} ticks/s"]
+        return [f"input p50 {histogram.percentile(0.5) * 1e3:.0f}  p95 {histogram.percentile(0.95) * 1e3:.0f}  "
+                f"max {histogram.max * 1e3:.0f} ms",
+                f"input turns {histogram.count}  dropped {self.dropped}"]
+
+    def report(self):
+        """Returns every histogram as text, one section per tick rate."""
+        if not self.latencies:
+            return "No turns were applied."
+        sections = []
+        for tick_rate, histogram in sorted(self.latencies.items()):
+            sections.append('\n'.join([
+                f"Key-to-turn latency at {tick_rate} ticks/s ({1e3 / tick_rate:.0f} ms per tick): {histogram.count} turns, "
+                f"mean {histogram.mean() * 1e3:.1f} ms, p50 {histogram.percentile(0.5) * 1e3:.0f} ms, "
+                f"p95 {histogram.percentile(0.95) * 1e3:.0f} ms, max {histogram.max * 1e3:.1f} ms",
+                "   ms         turns"
+            ] + histogram.lines()))
+        sections.append(f"{self.dropped} turns dropped")
+        return '\n\n'.join(sections)
@@ -0,0 +1,11 @@
+import pygame
+
+
+class Label(pygame.sprite.Sprite):
+    """Represents a line of text centered on a tile of a game Board."""
+
+    def __init__(self, text, font, color, tile):
+        super().__init__()
+        self.text = text
+        self.image = font.render(text, True, color)
+        self.rect = self.image.get_rect(center=tile.rect.center)
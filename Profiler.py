@@ -0,0 +1,80 @@
+import time
+from collections import deque
+
+
+class Profiler:
+    """Times the phases of each frame of the game loop, keeping the last frames for statistics and optionally
+    writing a record of every frame to a CSV file.
+
+    Call begin_frame() at the top of the loop, mark(phase) at the end of each phase and end_frame() at the bottom.
+    Time between marks is added to the phase marked, so a phase may be marked more than once per frame.
+    """
+    PHASES = ('events', 'wait', 'simulate', 'draw', 'present')
+
+    def __init__(self, window=240, export_path=None, clock=time.perf_counter):
+        self.clock = clock
+        # (frame seconds, {phase: seconds}, ticks) of the last window frames.
+        self.frames = deque(maxlen=window)
+        self.frame_count = 0
+        self.export = None
+        if export_path is not None:
+            self.export = open(export_path, 'w')
+            self.export.write(','.join(('frame', 'time', 'ticks', 'frame_ms') + tuple(f'{phase}_ms' for phase in Profiler.PHASES)) + '\n')
+        self.start = self.clock()
+        self.frame_start = self.last = self.start
+        self.phases = dict.fromkeys(Profiler.PHASES, 0.0)
+
+    def begin_frame(self):
+        self.frame_start = self.last = self.clock()
+        self.phases = dict.fromkeys(Profiler.PHASES, 0.0)
+
+    def mark(self, phase):
+        """Adds the time since the last mark (or the start of the frame) to the given phase."""
+        now = self.clock()
+        self.phases[phase] += now - self.last
+        self.last = now
+
+    def end_frame(self, ticks):
+        """Records the frame, in which the given number of simulation ticks ran."""
+        frame_time = self.last - self.frame_start
+        self.frames.append((frame_time, self.phases, ticks))
+        self.frame_count += 1
+        if self.export is not None:
+            self.export.write(f'{self.frame_count},{self.frame_start - self.start:.6f},{ticks},{frame_time * 1e3:.4f},'
+                              + ','.join(f'{self.phases[phase] * 1e3:.4f}' for phase in Profiler.PHASES) + '\n')
+
+    def summary(self):
+        """Returns statistics of the recent frames: FPS, frame time percentiles, tick time and mean time per phase."""
+        if not self.frames:
+            return None
+        frame_times = sorted(frame[0] for frame in self.frames)
+        count = len(frame_times)
+        total = sum(frame_times)
+        ticks = sum(frame[2] for frame in self.frames)
+        simulate = sum(frame[1]['simulate'] for frame in self.frames)
+        return {
+            'fps': count / total if total else 0.0,
+            'frame_mean': total / count,
+            'frame_p50': frame_times[count // 2],
+            'frame_p99': frame_times[min(int(count * 0.99), count - 1)],
+            'tick': simulate / ticks if ticks else 0.0,
+            'phases': {phase: sum(frame[1][phase] for frame in self.frames) / count for phase in Profiler.PHASES}
+        }
+
+    def lines(self):
+        """Returns the summary as lines of text, for an overlay."""
+        summary = self.summary()
+        if summary is None:
+            return []
+        lines = [
+            f"{summary['fps']:.0f} fps  frame {summary['frame_mean'] * 1e3:.2f} ms",
+            f"p50 {summary['frame_p50'] * 1e3:.2f}  p99 {summary['frame_p99'] * 1e3:.2f} ms",
+            f"tick {summary['tick'] * 1e3:.3f} ms"
+        ]
+        lines.extend(f"{phase} {seconds * 1e3:.2f} ms" for phase, seconds in summary['phases'].items())
+        return lines
+
+    def close(self):
+        if self.export is not None:
+            self.export.close()
+            self.export = None
@@ -0,0 +1,288 @@
+import pygame
+from Assets import assets
+from Board import Board
+from Camera import Camera
+from Fruit import Fruit, PhantomFruit
+from FruitType import FruitType, PhantomFruitType
+from Hud import Hud
+from Label import Label
+from GameMode import OptionMode
+from Snake import Snake
+from SnakeEngine import SnakeEngine, Event
+
+
+class Renderer:
+    """Draws a SnakeEngine onto a surface, repainting only the tiles that changed since the last draw."""
+    WHITE = (255, 255, 255)
+    BLACK = (0, 0, 0)
+    HUD_TEXT = {
+        OptionMode.CHANGE_FRUIT: 'Change Fruit',
+        OptionMode.CHANGE_GAME_MODE: 'Change Game Mode',
+        OptionMode.CHANGE_SPEED: 'Change Speed'
+    }
+    # OptionModes whose phantom fruit are labelled with the value they select.
+    LABELLED_OPTIONS = (OptionMode.CHANGE_SPEED,)
+    # Boards whose tiles would be smaller than MIN_TILE_SIZE pixels on the screen are shown through a Camera instead,
+    # with tiles of CAMERA_TILE_SIZE pixels.
+    MIN_TILE_SIZE = 8
+    CAMERA_TILE_SIZE = 16
+    # Past this many tiles and rects to repaint, redrawing the whole screen once is cheaper.
+    MAX_REPAINTS = 8
+
+    def __init__(self, engine, screen, font, atlas=False, tile_size=None):
+        self.engine = engine
+        self.screen = screen
+        self.font = font
+
+        # Initialize sprites. Sprites are positioned in Board pixels, which are screen pixels unless there is a camera.
+        screen_rect = screen.get_rect()
+        if tile_size is None and min(screen_rect.width / engine.columns, screen_rect.height / engine.rows) < Renderer.MIN_TILE_SIZE:
+            tile_size = Renderer.CAMERA_TILE_SIZE
+        self.board = Board(engine.columns, engine.rows, screen_rect, tile_size)
+        self.camera = None
+        if tile_size is not None:
+            self.camera = Camera(screen_rect.size, self.board.size)
+            self.camera.center_on(self.board.get_tile(*engine.position(engine.head)).rect.center)
+        if atlas:
+            # Load every image the sprites can use up front, so that all of them come from one atlas surface.
+            self.preload()
+            assets.pack()
+        # The fruit is only in its group while it is on the board; see sync_fruit().
+        self.fruit = Fruit(engine.fruit_kind, self.board, 0, 0)
+        self.fruits = pygame.sprite.Group()
+        self.snake = Snake(self.board, engine, layers=self.camera is None)
+
+        # Phantom fruit sprites for each OptionMode, laid out by the engine. Built when an OptionMode is first shown.
+        self.option_sprites = {}
+
+        # Draw the head part of the way from the neck to its tile, by the fraction of the tick that has passed.
+        self.interpolate = False
+        self.interpolated_rect = None
+
+        # The score and high score, centered on the middle tiles of the second and third rows.
+        self.hud = Hud(font)
+        if self.camera is None:
+            self.hud_centers = [self.board.get_tile(row, engine.columns // 2).rect.center for row in (1, 2)]
+        else:
+            # The same place on the screen as on the classic board.
+            self.hud_centers = [(screen_rect.centerx, round(screen_rect.height * (row + 0.5) / SnakeEngine.ROWS)) for row in (1, 2)]
+        # Cells and screen rects to repaint on the next draw, unless the whole screen is redrawn.
+        self.dirty_cells = set()
+        self.dirty_rects = []
+        self.full_redraw = True
+        self.sync_walls()
+        self.sync_fruit()
+
+    def preload(self):
+        """Loads every image the sprites can use at the sizes they use it, into the asset cache."""
+        tile = self.board.get_tile(0, 0)
+        for path in Snake.IMAGES.values():
+            assets.scaled(path, tile.rect.size)
+        for skin in FruitType:
+            assets.scaled(skin.skin_path, Fruit.skin_size(tile))
+        assets.solid(Board.wall_color, tile.rect.size)
+        self.preload_options()
+
+    def preload_options(self):
+        """Loads the phantom fruit images of the OptionModes into the asset cache."""
+        size = Fruit.skin_size(self.board.get_tile(0, 0))
+        for skin in PhantomFruitType:
+            assets.scaled(skin.skin_path, size)
+
+    def option_group(self, option_mode):
+        """Returns the group of phantom fruit (and their labels) of an OptionMode, building it the first time."""
+        group = self.option_sprites.get(option_mode)
+        if group is None:
+            engine = self.engine
+            group = self.option_sprites[option_mode] = pygame.sprite.Group()
+            for cell, (skin, value) in engine.option_cells.get(option_mode, {}).items():
+                phantom_fruit = PhantomFruit(skin, self.board, *engine.position(cell))
+                group.add(phantom_fruit)
+                if option_mode in Renderer.LABELLED_OPTIONS:
+                    group.add(Label(str(value), self.font, Renderer.WHITE, phantom_fruit.tile))
+        return group
+
+    def invalidate(self):
+        """Redraws the whole screen on the next draw, e.g. after the engine was changed outside of a tick."""
+        self.full_redraw = True
+        self.snake.rebuild()
+        self.sync_walls()
+        self.sync_fruit()
+
+    def update(self, events):
+        """Syncs the sprites with the Event flags of an engine tick and records the tiles that changed."""
+        engine = self.engine
+        if events & (Event.DIED | Event.OPTION_SELECTED):
+            # Deaths clear the walls and option changes can change every segment, so redraw everything.
+            self.invalidate()
+            return
+        if events & Event.MOVED:
+            self.snake.advance()
+        if events & Event.WALL_CREATED:
+            self.sync_walls()
+        if events & Event.ATE:
+            self.sync_fruit()
+        if self.full_redraw:
+            return
+
+        self.dirty_cells.update(engine.changed_cells)
+        if events & Event.MOVED:
+            if self.snake.cheese:
+                # Every other segment is a hole, and the holes shift by one segment on every move, so the whole Snake
+                # changes. A full redraw draws it with the grass from layers (see Snake.draw_layer()), or through a camera only
+                # repaints the tiles on the screen; either way the cost does not grow with the Snake.
+                self.full_redraw = True
+            else:
+                # Besides the new head and old tail, only the neck and the new tail change graphics.
+                self.dirty_cells.add(engine.body[1])
+                self.dirty_cells.add(engine.body[-1])
+
+    def sync_walls(self):
+        position = self.engine.position
+        self.board.sync_walls({position(cell) for cell in self.engine.static_walls}, static=True)
+        self.board.sync_walls({position(cell) for cell in self.engine.dynamic_walls})
+
+    def sync_fruit(self):
+        engine = self.engine
+        if engine.fruit_cell is None:
+            # The board is full, so there is nowhere left to place the fruit.
+            if self.fruit.alive():
+                self.dirty_rects.append(self.to_screen(self.fruit.rect))
+                self.fruit.kill()
+            return
+        tile = self.board.get_tile(*engine.position(engine.fruit_cell))
+        if self.fruit.tile != tile or self.fruit.type != engine.fruit_kind or not self.fruit.alive():
+            self.dirty_rects.append(self.to_screen(self.fruit.rect))
+            self.fruit.set_tile(tile.row, tile.column)
+            self.fruit.set_type(engine.fruit_kind)
+            self.fruits.add(self.fruit)
+            self.dirty_rects.append(self.to_screen(self.fruit.rect))
+
+    def sync_hud(self):
+        """Re-renders the score and high score if their text changed."""
+        engine = self.engine
+        option_mode = engine.game_mode.option_mode
+        lines = [(self.HUD_TEXT.get(option_mode, str(engine.score)), Renderer.BLACK, self.hud_centers[0])]
+        if engine.high_score > 0:
+            lines.append((str(engine.high_score) if option_mode is None else '', Renderer.WHITE, self.hud_centers[1]))
+        self.dirty_rects.extend(self.hud.set_lines(lines))
+
+    def visible_fruits(self):
+        """Returns the group of phantom fruit in an OptionMode, or of the fruit when playing."""
+        option_mode = self.engine.game_mode.option_mode
+        if option_mode is not None:
+            return self.option_group(option_mode)
+        return self.fruits
+
+    def draw(self, alpha=1.0):
+        """Draws what changed since the last draw. Returns the list of screen rects that were repainted.
+
+        alpha is the fraction of the current tick that has passed, used when interpolating the head.
+        """
+        self.sync_hud()
+        if self.camera is not None and self.camera.follow(self.board.get_tile(*self.engine.position(self.engine.head)).rect):
+            self.full_redraw = True
+        self.interpolate_head(alpha)
+        if len(self.dirty_cells) + len(self.dirty_rects) > Renderer.MAX_REPAINTS:
+            self.full_redraw = True
+        if self.full_redraw:
+            self.full_redraw = False
+            self.dirty_cells.clear()
+            self.dirty_rects.clear()
+            self.draw_all()
+            return [self.screen.get_rect()]
+
+        position = self.engine.position
+        if self.camera is None:
+            rects = [self.board.get_tile(*position(cell)).rect for cell in self.dirty_cells] + self.dirty_rects
+        else:
+            # Skip the cells that changed off the screen.
+            screen_rect = self.screen.get_rect()
+            rects = [rect for rect in (screen_rect.clip(self.camera.to_screen(self.board.get_tile(*position(cell)).rect))
+                                       for cell in self.dirty_cells) if rect.width and rect.height] + self.dirty_rects
+        self.dirty_cells.clear()
+        self.dirty_rects = []
+        for rect in rects:
+            self.repaint(rect)
+        return rects
+
+    def to_screen(self, rect):
+        """Returns where a rect in Board pixels is on the screen."""
+        return rect.copy() if self.camera is None else self.camera.to_screen(rect)
+
+    def interpolate_head(self, alpha):
+        """Offsets the head toward the neck by the part of the tick that has not passed yet, and marks it dirty."""
+        if self.interpolated_rect is not None:
+            self.dirty_rects.append(self.interpolated_rect)
+            self.interpolated_rect = None
+        self.snake.head_offset = (0, 0)
+        engine = self.engine
+        if not self.interpolate or alpha >= 1 or engine.direction == SnakeEngine.DIRECTION_NONE:
+            return
+        head_rect = self.board.get_tile(*engine.position(engine.body[0])).rect
+        neck_rect = self.board.get_tile(*engine.position(engine.body[1])).rect
+        self.snake.head_offset = (round((neck_rect.x - head_rect.x) * (1 - alpha)), round((neck_rect.y - head_rect.y) * (1 - alpha)))
+        self.interpolated_rect = self.to_screen(head_rect.union(neck_rect))
+        self.dirty_rects.append(self.interpolated_rect)
+
+    def draw_all(self):
+        """Draws the board, walls, fruit, snake and score."""
+        if self.camera is not None:
+            # Only the tiles on the screen are drawn, however big the Board is.
+            self.repaint(self.screen.get_rect())
+            return
+        if not self.board.rect.contains(self.screen.get_rect()):
+            self.screen.fill(Board.LIGHT_GREEN)
+        sprites = self.visible_fruits()
+        if self.snake.layered:
+            self.snake.draw_layer(self.screen, sprites)
+        else:
+            self.screen.blit(self.board.image, self.board.rect)
+        self.board.static_walls.draw(self.screen)
+        self.board.dynamic_walls.draw(self.screen)
+        for sprite in sprites:
+            self.screen.blit(sprite.image, sprite.rect)
+        self.snake.draw_snake(self.screen)
+        self.hud.draw(self.screen)
+
+    def repaint(self, rect):
+        """Redraws everything overlapping the given screen rect, in the same order as draw_all().
+
+        Only the tiles under the rect are visited, so the cost does not depend on the size of the Board.
+        """
+        engine = self.engine
+        screen = self.screen
+        screen.set_clip(rect)
+        if self.camera is None:
+            area = rect.move(-self.board.rect.x, -self.board.rect.y)
+            offset = (0, 0)
+        else:
+            area = self.camera.to_board(rect)
+            offset = self.camera.offset
+        self.board.blit_background(screen, rect, area)
+        tiles = self.board.tiles_in(area)
+        for position in tiles:
+            wall = self.board.walls.get(position)
+            if wall is not None:
+                screen.blit(wall.image, wall.rect.move(offset))
+        for sprite in self.visible_fruits():
+            if sprite.rect.colliderect(area):
+                screen.blit(sprite.image, sprite.rect.move(offset))
+        # A sliding head is drawn last, above the neck it overlaps.
+        first = 1 if self.snake.sliding else 0
+        for row, column in tiles:
+            cell = engine.cell(row, column)
+            if engine.occupancy[cell] == 1:
+                index = engine.segment_index(cell)
+                if index >= first:
+                    self.snake.draw_segment(screen, index, offset)
+            elif engine.occupancy[cell] > 1:
+                # The Snake crosses itself here (ZEN, CHEESE or an OptionMode): draw every segment, head first.
+                for index, block in enumerate(engine.body):
+                    if block == cell and index >= first:
+                        self.snake.draw_segment(screen, index, offset)
+        if self.snake.sliding:
+            self.snake.draw_segment(screen, 0, offset)
+        self.hud.draw(screen, rect)
+        screen.set_clip(None)
+
@@ -0,0 +1,213 @@
+import struct
+import zlib
+from bisect import bisect_left
+from FruitType import FruitType
+from GameMode import PlayMode, OptionMode
+from SnakeEngine import SnakeEngine, pack_cells, unpack_cells
+
+
+class Replay:
+    """The seed, settings and per-tick inputs of one game, enough to simulate it again exactly.
+
+    Inputs are (tick, code) pairs: the code is applied after the given number of engine ticks, before the next one.
+    Codes index INPUTS: a direction to turn the Snake, or an OptionMode to open. Keyframes are compressed engine
+    snapshots every KEYFRAME_INTERVAL ticks (see record_tick()), which a ReplayPlayer seeks from.
+    """
+    INPUTS = (
+        SnakeEngine.DIRECTION_UP,
+        SnakeEngine.DIRECTION_DOWN,
+        SnakeEngine.DIRECTION_LEFT,
+        SnakeEngine.DIRECTION_RIGHT,
+        OptionMode.CHANGE_FRUIT,
+        OptionMode.CHANGE_GAME_MODE,
+        OptionMode.CHANGE_SPEED
+    )
+    CODES = {value: code for code, value in enumerate(INPUTS)}
+
+    # File layout: the header below, a bitmap of the static walls (see pack_cells; not in version 1 files), the
+    # keyframes (only in version 3 files: their count, then each one's tick, length and data), then each input as its
+    # tick delta (a LEB128 varint) and its code (one byte).
+    MAGIC = b'SNKR'
+    VERSION = 3
+    # magic, version, rows, columns, play mode, fruit type (255 for salad), tick rate, seed, length in ticks.
+    HEADER = struct.Struct('<4sBHHBBHQI')
+    KEYFRAME_COUNT = struct.Struct('<I')
+    # tick, length of the compressed snapshot.
+    KEYFRAME = struct.Struct('<II')
+    SALAD = 255
+    KEYFRAME_INTERVAL = 1000
+
+    def __init__(self, rows, columns, play_mode, fruit_type, tick_rate, seed, inputs=(), ticks=0, static_walls=(),
+                 keyframes=None):
+        self.rows = rows
+        self.columns = columns
+        self.play_mode = play_mode
+        self.fruit_type = fruit_type
+        self.tick_rate = tick_rate
+        self.seed = seed
+        self.static_walls = frozenset(static_walls)
+        self.inputs = list(inputs)
+        # The number of ticks the game ran for.
+        self.ticks = ticks
+        # zlib-compressed SnakeEngine snapshots by tick.
+        self.keyframes = dict(keyframes or {})
+
+    @classmethod
+    def record(cls, engine):
+        """Returns an empty Replay of a game starting from the engine's state, which must have just been reset."""
+        if engine.ticks != 0 or engine.game_mode.option_mode is not None:
+            raise ValueError("Replays can only be recorded from the start of a game")
+        return cls(engine.rows, engine.columns, engine.game_mode.play_mode, engine.fruit_type, engine.tick_rate, engine.seed,
+                   static_walls=engine.static_walls)
+
+    def new_engine(self):
+        """Returns a SnakeEngine in the state the recorded game started from."""
+        engine = SnakeEngine(self.rows, self.columns, self.play_mode, self.fruit_type, self.seed, self.tick_rate)
+        if self.static_walls:
+            engine.set_static_walls(self.static_walls)
+        return engine
+
+    def add(self, tick, value):
+        """Records an input (a direction or OptionMode) made after the given number of ticks."""
+        self.inputs.append((tick, Replay.CODES[value]))
+        self.ticks = max(self.ticks, tick)
+
+    def record_tick(self, engine):
+        """Keeps a keyframe every KEYFRAME_INTERVAL ticks of the recorded game; call after every tick. Replays recorded
+        without calling this are played without keyframes."""
+        if engine.ticks % Replay.KEYFRAME_INTERVAL == 0:
+            self.keyframes[engine.ticks] = zlib.compress(engine.snapshot(), 1)
+
+    def next_input(self, tick):
+        """Returns the index of the first input made after the given number of ticks or later."""
+        return bisect_left(self.inputs, (tick, 0))
+
+    @staticmethod
+    def apply(engine, value):
+        """Applies an input (a direction or OptionMode) to the engine. Returns True if it changed the engine."""
+        if isinstance(value, OptionMode):
+            engine.open_options(value)
+            return True
+        return engine.turn(value)
+
+    def save(self, path):
+        fruit_type = Replay.SALAD if self.fruit_type is None else list(FruitType).index(self.fruit_type)
+        data = bytearray(Replay.HEADER.pack(Replay.MAGIC, Replay.VERSION, self.rows, self.columns,
+                                            list(PlayMode).index(self.play_mode), fruit_type, self.tick_rate,
+                                            self.seed, self.ticks))
+        data += pack_cells(self.static_walls, self.rows * self.columns)
+        data += Replay.KEYFRAME_COUNT.pack(len(self.keyframes))
+        for tick, keyframe in sorted(self.keyframes.items()):
+            data += Replay.KEYFRAME.pack(tick, len(keyframe))
+            data += keyframe
+        last_tick = 0
+        for tick, code in self.inputs:
+            delta = tick - last_tick
+            last_tick = tick
+            while delta >= 0x80:
+                data.append(delta & 0x7F | 0x80)
+                delta >>= 7
+            data.append(delta)
+            data.append(code)
+        with open(path, 'wb') as file:
+            file.write(data)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as file:
+            data = file.read()
+        magic, version, rows, columns, play_mode, fruit_type, tick_rate, seed, ticks = Replay.HEADER.unpack_from(data)
+        if magic != Replay.MAGIC or not 1 <= version <= Replay.VERSION:
+            raise ValueError(f"{path} is not a version 1 to {Replay.VERSION} Snake replay")
+        offset = Replay.HEADER.size
+        static_walls = set()
+        if version >= 2:
+            bitmap_length = (rows * columns + 7) // 8
+            static_walls = unpack_cells(data[offset:offset + bitmap_length])
+            offset += bitmap_length
+        keyframes = {}
+        if version >= 3:
+            count, = Replay.KEYFRAME_COUNT.unpack_from(data, offset)
+            offset += Replay.KEYFRAME_COUNT.size
+            for _ in range(count):
+                tick, length = Replay.KEYFRAME.unpack_from(data, offset)
+                offset += Replay.KEYFRAME.size
+                keyframes[tick] = data[offset:offset + length]
+                offset += length
+        inputs = []
+        tick = 0
+        while offset < len(data):
+            delta = shift = 0
+            while True:
+                byte = data[offset]
+                offset += 1
+                delta |= (byte & 0x7F) << shift
+                shift += 7
+                if byte < 0x80:
+                    break
+            tick += delta
+            inputs.append((tick, data[offset]))
+            offset += 1
+        return cls(rows, columns, list(PlayMode)[play_mode], None if fruit_type == Replay.SALAD else list(FruitType)[fruit_type],
+                   tick_rate, seed, inputs, ticks, static_walls, keyframes)
+
+
+class ReplayPlayer:
+    """Simulates a Replay tick by tick, seeking from the closest of its keyframes.
+
+    A Replay recorded without keyframes (e.g. saved before they were added) instead gets a clone of the engine every
+    keyframe_interval ticks as it is simulated.
+    """
+
+    def __init__(self, replay, keyframe_interval=Replay.KEYFRAME_INTERVAL):
+        self.replay = replay
+        self.keyframe_interval = keyframe_interval
+        self.engine = replay.new_engine()
+        # Index of the next input to apply.
+        self.next_input = 0
+        # Engine copies by tick, with the index of the next input at that tick, for Replays without keyframes.
+        self.clones = {0: (self.engine.clone(), 0)}
+
+    @property
+    def done(self):
+        return self.engine.ticks >= self.replay.ticks
+
+    def apply_inputs(self):
+        """Applies the inputs made before the next tick. Returns True if one changed the engine outside of a tick."""
+        inputs = self.replay.inputs
+        engine = self.engine
+        reopened = False
+        while self.next_input < len(inputs) and inputs[self.next_input][0] <= engine.ticks:
+            value = Replay.INPUTS[inputs[self.next_input][1]]
+            Replay.apply(engine, value)
+            reopened = reopened or isinstance(value, OptionMode)
+            self.next_input += 1
+        return reopened
+
+    def step(self):
+        """Applies the inputs due and simulates one tick. Returns the Event flags of the tick."""
+        self.apply_inputs()
+        events = self.engine.tick()
+        ticks = self.engine.ticks
+        if not self.replay.keyframes and ticks % self.keyframe_interval == 0 and ticks not in self.clones:
+            self.clones[ticks] = (self.engine.clone(), self.next_input)
+        return events
+
+    def run(self):
+        """Simulates the rest of the replay as fast as possible."""
+        while not self.done:
+            self.step()
+
+    def seek(self, tick):
+        """Moves to the given tick, simulating forward from the closest keyframe at or before it."""
+        tick = min(max(tick, 0), self.replay.ticks)
+        keyframe = max(keyframe for keyframe in self.replay.keyframes.keys() | self.clones.keys() if keyframe <= tick)
+        if tick < self.engine.ticks or keyframe > self.engine.ticks:
+            if keyframe in self.replay.keyframes:
+                self.engine.restore(zlib.decompress(self.replay.keyframes[keyframe]))
+                self.next_input = self.replay.next_input(keyframe)
+            else:
+                engine, self.next_input = self.clones[keyframe]
+                self.engine = engine.clone()
+        while self.engine.ticks < tick:
+            self.step()
@@ -0,0 +1,56 @@
+import time
+
+
+class Scheduler:
+    """Fixed-timestep timing for the game loop: decides how many simulation ticks to run before each rendered frame.
+
+    Real time is added to an accumulator and spent in whole ticks of 1 / tick_rate seconds, so the simulation
+    advances at the same rate however fast frames are drawn.
+    """
+    MIN_TICK_RATE = 1
+    MAX_TICK_RATE = 1000
+
+    def __init__(self, tick_rate=10, max_catch_up=0.25, clock=time.perf_counter):
+        self.clock = clock
+        # The most real time (in seconds) caught up on in one frame; anything beyond it, e.g. while the window
+        # is dragged, is dropped instead of running a burst of ticks that would slow the next frame further.
+        self.max_catch_up = max_catch_up
+        self.tick_rate = tick_rate
+        self.accumulator = 0.0
+        self.last_time = None
+        self.dropped_time = 0.0
+
+    @property
+    def tick_rate(self):
+        return self._tick_rate
+
+    @tick_rate.setter
+    def tick_rate(self, tick_rate):
+        self._tick_rate = min(max(tick_rate, Scheduler.MIN_TICK_RATE), Scheduler.MAX_TICK_RATE)
+        self.tick_duration = 1 / self._tick_rate
+
+    def advance(self):
+        """Adds the time since the last call to the accumulator. Returns the number of ticks to run now."""
+        now = self.clock()
+        if self.last_time is not None:
+            elapsed = now - self.last_time
+            if elapsed > self.max_catch_up:
+                self.dropped_time += elapsed - self.max_catch_up
+                elapsed = self.max_catch_up
+            self.accumulator += elapsed
+        self.last_time = now
+
+        # The small epsilon keeps floating-point error from losing a tick that is exactly due.
+        ticks = int(self.accumulator / self.tick_duration + 1e-9)
+        self.accumulator -= ticks * self.tick_duration
+        return ticks
+
+    @property
+    def alpha(self):
+        """Returns how far (0 to 1) real time is between the last tick and the next, for render interpolation."""
+        return min(self.accumulator / self.tick_duration, 1.0)
+
+    def time_until_tick(self):
+        """Returns the seconds until the next tick is due."""
+        elapsed = self.clock() - self.last_time if self.last_time is not None else 0.0
+        return max(self.tick_duration - self.accumulator - elapsed, 0.0)
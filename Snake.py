@@ -1,195 +1,238 @@
 import pygame
+from collections import deque
 from pygame.math import *
-from Fruit import Fruit, PhantomFruit
-from Wall import Wall
-import SnakeGame
+from Assets import assets
+from GameMode import PlayMode
 
 
 class Snake(pygame.sprite.Sprite):
-    DIRECTION_UP = Vector2(-1, 0)
-    DIRECTION_DOWN = Vector2(1, 0)
-    DIRECTION_LEFT = Vector2(0, -1)
-    DIRECTION_RIGHT = Vector2(0, 1)
-    AXIS_VERTICAL = (DIRECTION_UP, DIRECTION_DOWN)
-    AXIS_HORIZONTAL = (DIRECTION_LEFT, DIRECTION_RIGHT)
-
-    def __init__(self, board, game):
+    """Draws the Snake of a SnakeEngine on a game Board."""
+    # CHEESE Snakes at least this long are drawn with the grass from layers (see draw_layer()); shorter ones are as
+    # quick to draw segment by segment.
+    LAYER_LENGTH = 64
+
+    IMAGES = {
+        # Head images.
+        'head_up': 'res/snake/head_up.png',
+        'head_down': 'res/snake/head_down.png',
+        'head_right': 'res/snake/head_right.png',
+        'head_left': 'res/snake/head_left.png',
+        # Tail images.
+        'tail_up': 'res/snake/tail_up.png',
+        'tail_down': 'res/snake/tail_down.png',
+        'tail_right': 'res/snake/tail_right.png',
+        'tail_left': 'res/snake/tail_left.png',
+        # Body images.
+        'body_vertical': 'res/snake/body_vertical.png',
+        'body_horizontal': 'res/snake/body_horizontal.png',
+        'body_tr': 'res/snake/body_tr.png',
+        'body_tl': 'res/snake/body_tl.png',
+        'body_br': 'res/snake/body_br.png',
+        'body_bl': 'res/snake/body_bl.png'
+    }
+
+    def __init__(self, board, engine, layers=False):
         super().__init__()
-        # Load head images.
-        self.head_up = pygame.image.load('res/snake/head_up.png').convert_alpha()
-        self.head_down = pygame.image.load('res/snake/head_down.png').convert_alpha()
-        self.head_right = pygame.image.load('res/snake/head_right.png').convert_alpha()
-        self.head_left = pygame.image.load('res/snake/head_left.png').convert_alpha()
-
-        # Load tail images.
-        self.tail_up = pygame.image.load('res/snake/tail_up.png').convert_alpha()
-        self.tail_down = pygame.image.load('res/snake/tail_down.png').convert_alpha()
-        self.tail_right = pygame.image.load('res/snake/tail_right.png').convert_alpha()
-        self.tail_left = pygame.image.load('res/snake/tail_left.png').convert_alpha()
-
-        # Load body images.
-        self.body_vertical = pygame.image.load('res/snake/body_vertical.png').convert_alpha()
-        self.body_horizontal = pygame.image.load('res/snake/body_horizontal.png').convert_alpha()
-        self.body_tr = pygame.image.load('res/snake/body_tr.png').convert_alpha()
-        self.body_tl = pygame.image.load('res/snake/body_tl.png').convert_alpha()
-        self.body_br = pygame.image.load('res/snake/body_br.png').convert_alpha()
-        self.body_bl = pygame.image.load('res/snake/body_bl.png').convert_alpha()
-
         self.board = board
-        self.game = game
-        # Set defaults.
-        self.body = []
-        self.new_block = False
-        self.direction = Vector2(0, 0)
-        self.head = self.head_right
-        self.tail = self.tail_right
-        self.body_graphic = self.body_horizontal
+        self.engine = engine
+        # Load the images from the asset cache, scaled to the tiles so that each segment can be repainted within its
+        # own tile.
+        tile_size = self.board.get_tile(0, 0).rect.size
+        for name, path in Snake.IMAGES.items():
+            setattr(self, name, assets.scaled(path, tile_size))
+
+        # Pixel offset of the head from its tile, used for render interpolation.
+        self.head_offset = (0, 0)
+        # In CHEESE mode, the segments after the head by the parity of their serial, each drawn onto a copy of the
+        # Board's grass; see draw_layer(). Only for a Snake alone on a Board without a camera, which is drawn over the
+        # whole grass. Built when first drawn, and None while they need building.
+        self.use_layers = layers
+        self.layers = None
+        self.layer_surfaces = None
+        self.crossings = {}
+        # Indices of the segments draw_layer() left for draw_snake() to draw.
+        self.on_top = set()
+        # The tail cell when the layers were last updated.
+        self.tail = None
+        self.build_graphics()
+        # The graphic of each segment, head first, kept in step with the engine's body.
+        self.rebuild()
+
+    @property
+    def cheese(self):
+        """Returns True if every other body segment is drawn as a hole."""
+        return self.engine.game_mode.play_mode == PlayMode.CHEESE
+
+    @property
+    def layered(self):
+        """Returns True if the Snake is drawn with the grass from its CHEESE layers; see draw_layer()."""
+        return self.use_layers and self.cheese and len(self.engine.body) >= Snake.LAYER_LENGTH
+
+    @property
+    def sliding(self):
+        """Returns True if the head is drawn offset from its tile, in which case it is drawn last."""
+        return self.head_offset != (0, 0)
+
+    def build_graphics(self):
+        """Precomputes the graphic of a segment for each (step to the segment behind, step to the segment ahead).
+
+        Steps are differences between integer cells; the head has nothing ahead and the tail nothing behind (None).
+        """
+        columns = self.engine.columns
+        steps = {
+            (1, 0): columns,
+            (-1, 0): -columns,
+            (0, 1): 1,
+            (0, -1): -1
+        }
+        heads = {
+            (1, 0): self.head_up,
+            (-1, 0): self.head_down,
+            (0, 1): self.head_left,
+            (0, -1): self.head_right
+        }
+        tails = {
+            (1, 0): self.tail_up,
+            (-1, 0): self.tail_down,
+            (0, 1): self.tail_left,
+            (0, -1): self.tail_right
+        }
+        self.graphics = {}
+        for previous_block, behind in steps.items():
+            # The head is looked up by the vector to the body behind it, the tail by the vector to the body ahead.
+            self.graphics[(behind, None)] = heads[previous_block]
+            self.graphics[(None, behind)] = tails[previous_block]
+            for next_block, ahead in steps.items():
+                self.graphics[(behind, ahead)] = self.body_graphic_for(previous_block, next_block)
+
+    def body_graphic_for(self, previous_block, next_block):
+        """Returns the body graphic joining the (row, column) vectors to the segments behind and ahead."""
+        # Travelling straight
+        if previous_block[0] == next_block[0]:  # Vertical
+            return self.body_horizontal
+        elif previous_block[1] == next_block[1]:  # Horizontal
+            return self.body_vertical
+        # Turning a corner
+        # Down to left/right to up
+        if previous_block[0] == -1 and next_block[1] == -1 or previous_block[1] == -1 and next_block[0] == -1:
+            return self.body_tl
+        # Down to right/left to up
+        elif previous_block[0] == -1 and next_block[1] == 1 or previous_block[1] == 1 and next_block[0] == -1:
+            return self.body_tr
+        # Up to left/right to down
+        elif previous_block[0] == 1 and next_block[1] == -1 or previous_block[1] == -1 and next_block[0] == 1:
+            return self.body_bl
+        # Up to right/left to down
+        return self.body_br
+
+    def graphic(self, index):
+        """Looks up the graphic of the segment at the given index from its neighbours."""
+        body = self.engine.body
+        cell = body[index]
+        behind = body[index + 1] - cell if index < len(body) - 1 else None
+        ahead = body[index - 1] - cell if index > 0 else None
+        return self.graphics[(behind, ahead)]
+
+    def rebuild(self):
+        """Picks the graphic of every segment, e.g. after the Snake was restarted."""
+        self.segment_graphics = deque(self.graphic(index) for index in range(len(self.engine.body)))
+        self.layers = None
+
+    def advance(self):
+        """Updates the segment graphics after a move: only the head, neck and tail can change."""
+        graphics = self.segment_graphics
+        body = self.engine.body
+        graphics.appendleft(self.graphic(0))
+        if len(graphics) > len(body):
+            graphics.pop()
+        graphics[1] = self.graphic(1)
+        graphics[-1] = self.graphic(len(body) - 1)
+        if self.layers is not None:
+            # The head may have moved onto a segment, the old head became the neck, the new tail's graphic changed and
+            # the old tail may have left its cell.
+            for cell in {body[0], body[1], body[-1], self.tail}:
+                self.draw_layer_cell(cell)
+            self.tail = body[-1]
 
     def draw_snake(self, screen):
-        cheese = self.game.game_mode.play_mode == SnakeGame.PlayMode.CHEESE
-        for index, block in enumerate(self.body):
-            tile_rect = self.board.get_tile(*block).rect.copy()
-
-            # Select the appropriate head image.
-            heads = {
-                (1, 0): self.head_up,
-                (-1, 0): self.head_down,
-                (0, 1): self.head_left,
-                (0, -1): self.head_right
-            }
-            # Look up head vector - adjacent body vector in the dictionary.
-            self.head = heads.get(tuple(self.body[1] - self.body[0]), self.head_right)
-
-            # Select the appropriate tail image.
-            tails = {
-                (1, 0): self.tail_up,
-                (-1, 0): self.tail_down,
-                (0, 1): self.tail_left,
-                (0, -1): self.tail_right
-            }
-            # Look up tail vector - adjacent body vector in the dictionary.
-            self.tail = tails.get(tuple(self.body[-2] - self.body[-1]), self.head_right)
-
-            if index == 0:
-                # Draw head.
-                screen.blit(self.head, tile_rect)
-            elif index == len(self.body) - 1:
-                # Draw tail.
-                screen.blit(self.tail, tile_rect)
-            else:
-                if cheese and index % 2 != 0:
-                    continue
-                # Select appropriate body image.
-                previous_block = self.body[index + 1] - block
-                next_block = self.body[index - 1] - block
-                # Travelling straight
-                if previous_block.x == next_block.x:  # Vertical
-                    self.body_graphic = self.body_horizontal
-                elif previous_block.y == next_block.y:  # Horizontal
-                    self.body_graphic = self.body_vertical
-                else:
-                    # Turning a corner
-                    # Down to left/right to up
-                    if previous_block.x == -1 and next_block.y == -1 or previous_block.y == -1 and next_block.x == -1:
-                        self.body_graphic = self.body_tl
-                    # Down to right/left to up
-                    elif previous_block.x == -1 and next_block.y == 1 or previous_block.y == 1 and next_block.x == -1:
-                        self.body_graphic = self.body_tr
-                    # Up to left/right to down
-                    elif previous_block.x == 1 and next_block.y == -1 or previous_block.y == -1 and next_block.x == 1:
-                        self.body_graphic = self.body_bl
-                    # Up to right/left to down
-                    elif previous_block.x == 1 and next_block.y == 1 or previous_block.y == 1 and next_block.x == 1:
-                        self.body_graphic = self.body_br
-                # Draw body.
-                screen.blit(self.body_graphic, tile_rect)
-
-    def move_snake(self):
-        """Moves the Snake. Returns True if the move was successful; False if the Snake hit itself or the wall."""
-        zen = self.game.game_mode.play_mode == SnakeGame.PlayMode.ZEN
-        cheese = self.game.game_mode.play_mode == SnakeGame.PlayMode.CHEESE
-        option = self.game.game_mode.option_mode is not None
-
-        if self.direction == (0, 0):
-            return True
-
-        if self.new_block:
-            body_copy = self.body[:]
-            self.new_block = False
+        """Draws the Snake; a layered one was mostly drawn with the grass by draw_layer(), so only the rest is drawn."""
+        if len(self.segment_graphics) != len(self.engine.body):
+            self.rebuild()
+        indices = sorted(self.on_top) if self.layered else range(len(self.engine.body))
+        for index in indices:
+            if index != 0 or not self.sliding:
+                self.draw_segment(screen, index)
+        if self.sliding:
+            self.draw_segment(screen, 0)
+
+    def draw_layer(self, screen, sprites=()):
+        """Draws the Board's grass with a long CHEESE Snake on it, in time independent of its length.
+
+        The holes are the segments an odd distance from the head, so they shift by one segment on every move. Whether a
+        segment is a hole therefore only depends on the parity of its serial, which never changes: the layer of the
+        head's parity is the grass with every segment shown drawn on it. The head, the tail (always shown), cells the
+        Snake crosses itself on and segments under the given sprites, which are drawn between the grass and the Snake
+        and may reach past their tiles, are left on plain grass for draw_snake() to draw on top.
+        """
+        if self.layers is None:
+            self.build_layers()
+        engine = self.engine
+        board = self.board
+        screen.blit(self.layers[engine.serial & 1], board.rect)
+        self.on_top = {(engine.serial - serial) & 0xFFFFFFFF for serials in self.crossings.values() for serial in serials}
+        self.on_top.add(0)
+        tail = len(engine.body) - 1
+        if tail % 2 != 0:
+            self.on_top.add(tail)
+        for sprite in sprites:
+            for position in board.tiles_in(sprite.rect):
+                cell = engine.cell(*position)
+                rect = board.get_tile(*position).rect
+                if engine.occupancy[cell] == 1 and rect.colliderect(sprite.rect):
+                    index = engine.segment_index(cell)
+                    if index not in self.on_top:
+                        self.on_top.add(index)
+                        screen.blit(board.image, rect.move(board.rect.topleft), rect)
+
+    def build_layers(self):
+        """Draws every segment after the head onto the layer of its serial's parity."""
+        if self.layer_surfaces is None:
+            self.layer_surfaces = [self.board.image.copy() for _ in range(2)]
         else:
-            body_copy = self.body[:-1]
-
-        new_head = body_copy[0] + self.direction
-
-        # Check if the Snake hits itself.
-        if new_head in body_copy and not zen and not option:
-            if cheese and body_copy.index(new_head) % 2 != 0:
-                pass
-            else:
-                return False
-
-        # Check if the Snake moves outside of the grid.
-        if new_head.x not in range(self.board.size.rows) or new_head.y not in range(self.board.size.columns):
-            return False
-
-        # Check if the Snake hits a wall.
-        if not zen and not option and isinstance(self.board.get_tile(new_head.x, new_head.y).wall, Wall):
-            return False
-
-        body_copy.insert(0, new_head)
-        self.body = body_copy[:]
-
-        return True
-
-    def eat(self):
-        """Attempts to eat any Fruit at the Tile of the Snake head. Returns True if the Snake eats; False if it does not."""
-        head_tile = self.board.get_tile(*self.body[0])
-        fruit = head_tile.fruit
-        if isinstance(fruit, Fruit):
-            fruit.randomize_tile()
-            self.new_block = True
-            return True
-        return False
-
-    def phantom_eat(self):
-        head_tile = self.board.get_tile(*self.body[0])
-        phantom_fruit = head_tile.phantom_fruit
-        if type(phantom_fruit) == PhantomFruit:
-            return True
-        return False
-
-    def get_head_tile(self):
-        return self.board.get_tile(*self.body[0])
-
-    def up(self):
-        """Changes the Snake's direction to up (if it was not already traveling in the vertical axis). Returns True if successful."""
-        if self.direction not in Snake.AXIS_VERTICAL or self.game.game_mode.play_mode == SnakeGame.PlayMode.ZEN or self.game.game_mode.option_mode is not None:
-            self.direction = Snake.DIRECTION_UP
-            return True
-        return False
-
-    def down(self):
-        """Changes the Snake's direction to down (if it was not already traveling in the vertical axis). Returns True if successful."""
-        if self.direction not in Snake.AXIS_VERTICAL or self.game.game_mode.play_mode == SnakeGame.PlayMode.ZEN or self.game.game_mode.option_mode is not None:
-            self.direction = Snake.DIRECTION_DOWN
-            return True
-        return False
-
-    def left(self):
-        """Changes the Snake's direction to left (if it was not already traveling in the horizontal axis). Returns True if successful."""
-        if self.direction not in Snake.AXIS_HORIZONTAL or self.game.game_mode.play_mode == SnakeGame.PlayMode.ZEN or self.game.game_mode.option_mode is not None:
-            self.direction = Snake.DIRECTION_LEFT
-            return True
-        return False
-
-    def right(self):
-        """Changes the Snake's direction to right (if it was not already traveling in the horizontal axis). Returns True if successful."""
-        if self.direction not in Snake.AXIS_HORIZONTAL or self.game.game_mode.play_mode == SnakeGame.PlayMode.ZEN or self.game.game_mode.option_mode is not None:
-            self.direction = Snake.DIRECTION_RIGHT
-            return True
-        return False
-
-    def add_block(self):
-        """Add a new body block to the Snake on the next move_snake() call."""
-        self.new_block = True
-
+            for layer in self.layer_surfaces:
+                layer.blit(self.board.image, (0, 0))
+        self.layers = self.layer_surfaces
+        # The serials of the segments on each cell the Snake crosses itself on, which are left off the layers.
+        self.crossings = {}
+        body = self.engine.body
+        for cell in set(body):
+            self.draw_layer_cell(cell)
+        self.tail = body[-1]
+
+    def draw_layer_cell(self, cell):
+        """Redraws the segment after the head on a cell onto its layer, or notes the segments if there are several."""
+        engine = self.engine
+        rect = self.board.get_tile(*engine.position(cell)).rect
+        for layer in self.layers:
+            layer.blit(self.board.image, rect, rect)
+        self.crossings.pop(cell, None)
+        if engine.occupancy[cell] == 1:
+            index = engine.segment_index(cell)
+            if index > 0:
+                self.layers[(engine.serial - index) & 1].blit(self.segment_graphics[index], rect)
+        elif engine.occupancy[cell] > 1:
+            # Rare, so the body is searched. Serials stay the same as the Snake moves on; indices do not.
+            self.crossings[cell] = [(engine.serial - index) & 0xFFFFFFFF
+                                    for index, block in enumerate(engine.body) if block == cell]
+
+    def draw_segment(self, screen, index, offset=(0, 0)):
+        """Draws the body segment at the given index with the graphic picked when it last changed.
+
+        offset is where the Board's origin is on the screen.
+        """
+        if self.cheese and index % 2 != 0 and 0 < index < len(self.engine.body) - 1:
+            return
+        tile_rect = self.board.get_tile(*self.engine.position(self.engine.body[index])).rect.move(offset)
+        if index == 0:
+            tile_rect = tile_rect.move(self.head_offset)
+        screen.blit(self.segment_graphics[index], tile_rect)
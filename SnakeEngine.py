@@ -0,0 +1,557 @@
+import random
+import struct
+from array import array
+from collections import deque
+from enum import Enum, IntFlag, auto
+from itertools import compress
+from FreeCells import FreeCells
+from FruitType import FruitType, PhantomFruitType
+from GameMode import GameMode, PlayMode, OptionMode
+from WallConnectivity import WallConnectivity
+
+
+class Event(IntFlag):
+    """Flags describing what happened during a single SnakeEngine tick."""
+    NONE = 0
+    MOVED = 1
+    ATE = 2
+    DIED = 4
+    OPTION_SELECTED = 8
+    WALL_CREATED = 16
+    # Only in an Arena: a dead Snake was placed on the board again.
+    SPAWNED = 32
+
+
+class DeathCause(Enum):
+    """What the Snake ran into when it last died."""
+    EDGE = auto()
+    SELF = auto()
+    WALL = auto()
+    # Only in an Arena: another Snake's body, or a head moving into the same cell as another head.
+    SNAKE = auto()
+    HEAD_ON = auto()
+
+
+class SnakeEngine:
+    """Simulates the Snake game rules without a display, mixer or clock.
+
+    Cells are integer indices (row * columns + column); see cell() and position().
+    Drive the engine with turn()/tick(), or step(action) which does both.
+    """
+    DIRECTION_NONE = (0, 0)
+    DIRECTION_UP = (-1, 0)
+    DIRECTION_DOWN = (1, 0)
+    DIRECTION_LEFT = (0, -1)
+    DIRECTION_RIGHT = (0, 1)
+    AXIS_VERTICAL = (DIRECTION_UP, DIRECTION_DOWN)
+    AXIS_HORIZONTAL = (DIRECTION_LEFT, DIRECTION_RIGHT)
+
+    # Flags stored in the grid for each cell.
+    WALL = 1
+    FRUIT = 2
+
+    # The classic board size. Larger boards center the start positions and option layouts below on the board.
+    ROWS = 15
+    COLUMNS = 17
+    START_BODY = ((7, 3), (7, 2), (7, 1))
+    OPTION_START_BODY = ((7, 9), (7, 8), (7, 7))
+    FRUIT_START = (7, 12)
+
+    # Phantom fruit layouts shown in each OptionMode: cell -> (skin, selected value).
+    FRUIT_OPTIONS = {
+        (7, 1): (FruitType.APPLE, FruitType.APPLE),
+        (3, 2): (FruitType.BANANA, FruitType.BANANA),
+        (3, 4): (FruitType.PINEAPPLE, FruitType.PINEAPPLE),
+        (3, 6): (FruitType.GRAPE, FruitType.GRAPE),
+        (3, 8): (FruitType.PUMPKIN, FruitType.PUMPKIN),
+        (3, 10): (FruitType.TURNIP, FruitType.TURNIP),
+        (3, 12): (FruitType.AUBERGINE, FruitType.AUBERGINE),
+        (3, 14): (FruitType.STRAWBERRY, FruitType.STRAWBERRY),
+        (11, 3): (FruitType.CHERRY, FruitType.CHERRY),
+        (11, 5): (FruitType.CARROT, FruitType.CARROT),
+        (11, 7): (FruitType.MUSHROOM, FruitType.MUSHROOM),
+        (11, 9): (FruitType.BROCCOLI, FruitType.BROCCOLI),
+        (11, 11): (FruitType.WATERMELON, FruitType.WATERMELON),
+        (11, 13): (PhantomFruitType.SALAD, None)
+    }
+    GAME_MODE_OPTIONS = {
+        (7, 1): (FruitType.APPLE, PlayMode.CLASSIC),
+        (3, 5): (PhantomFruitType.WALL, PlayMode.WALL),
+        (3, 11): (PhantomFruitType.ZEN, PlayMode.ZEN),
+        (11, 5): (PhantomFruitType.CHEESE, PlayMode.CHEESE)
+    }
+    # Ticks per second; the classic game moves the Snake one tile every 100 ms.
+    TICK_RATE = 10
+    SPEED_OPTIONS = {
+        (3, 2): (FruitType.MUSHROOM, 5),
+        (3, 6): (FruitType.APPLE, 10),
+        (3, 10): (FruitType.CHERRY, 15),
+        (3, 14): (FruitType.GRAPE, 20),
+        (11, 3): (FruitType.BANANA, 30),
+        (11, 8): (FruitType.PINEAPPLE, 60),
+        (11, 13): (FruitType.WATERMELON, 120)
+    }
+    # Random free cells tried for a wall that keeps the board connected and free of dead ends, before looking through
+    # all of them for one.
+    WALL_ATTEMPTS = 32
+
+    OPTIONS = {
+        OptionMode.CHANGE_FRUIT: FRUIT_OPTIONS,
+        OptionMode.CHANGE_GAME_MODE: GAME_MODE_OPTIONS,
+        OptionMode.CHANGE_SPEED: SPEED_OPTIONS
+    }
+
+    # Snapshot layout: the header below, then bitmaps of the static and dynamic walls, the body cells (head first), the
+    # free cells in sampling order as FreeCells.runs() (4 bytes each) and the Mersenne Twister state of the random
+    # generator.
+    SNAPSHOT_MAGIC = b'SNKS'
+    SNAPSHOT_VERSION = 3
+    # magic, version, rows, columns, play mode, option mode, fruit type, fruit kind, tick rate, seed, ticks, score,
+    # high score, direction, new block, serial, fruit cell, body length, free cell run count, gauss_next (set, value).
+    SNAPSHOT_HEADER = struct.Struct('<4sBHHBBBBHQQIIbb?QiII?d')
+    NONE = 255
+
+    def __init__(self, rows=ROWS, columns=COLUMNS, play_mode=PlayMode.CLASSIC, fruit_type=FruitType.APPLE, seed=None, tick_rate=TICK_RATE):
+        if rows < SnakeEngine.ROWS or columns < SnakeEngine.COLUMNS:
+            raise ValueError(f"Board must be at least {SnakeEngine.COLUMNS}x{SnakeEngine.ROWS}, got {columns}x{rows}")
+        self.rows = rows
+        self.columns = columns
+        self.origin = ((rows - SnakeEngine.ROWS) // 2, (columns - SnakeEngine.COLUMNS) // 2)
+        self.game_mode = GameMode(play_mode)
+        # The fruit type chosen by the player; None picks a random type for every fruit (salad).
+        self.fruit_type = fruit_type
+        # The game speed chosen by the player. The engine itself only counts ticks; see Scheduler.
+        self.tick_rate = tick_rate
+        # Struct-of-arrays grid: WALL/FRUIT flags per cell. The wall sets index the flagged cells.
+        self.grid = bytearray(rows * columns)
+        self.static_walls = set()
+        self.dynamic_walls = set()
+        # Which walls touch, to keep random walls from cutting the board apart. Built on first use; see connectivity().
+        self.wall_connectivity = None
+        self.option_cells = {
+            option_mode: {self.layout_cell(*position): option for position, option in layout.items()}
+            for option_mode, layout in SnakeEngine.OPTIONS.items()
+        }
+        # Occupancy grid: the number of Snake segments on each cell, and the serial (mod 2**32) of the newest one.
+        self.occupancy = array('I', bytes(4 * rows * columns))
+        self.serials = array('I', bytes(4 * rows * columns))
+        # Cells without a Snake segment, wall or fruit, kept current by every change to the grid.
+        self.free_cells = FreeCells(rows * columns)
+        self.body = deque()
+        self.fruit_cell = None
+        # Cells whose contents changed during the last tick, for incremental renderers.
+        self.changed_cells = []
+        self.score = 0
+        self.high_score = 0
+        self.death_cause = None
+        self.reset(seed)
+
+    def cell(self, row, column):
+        """Returns the integer cell index of a row and column."""
+        return row * self.columns + column
+
+    def position(self, cell):
+        """Returns the (row, column) of an integer cell index."""
+        return divmod(cell, self.columns)
+
+    def layout_cell(self, row, column):
+        """Returns the cell of a row and column of the classic board layout, centered on this board."""
+        return self.cell(row + self.origin[0], column + self.origin[1])
+
+    def reset(self, seed=None):
+        """Start a new game seeded with the given value. Keeps the play mode, fruit type and high score.
+
+        Without a seed a random one is chosen; either way it is kept in self.seed so that the game can be replayed. Seeds
+        are taken modulo 2**64, the range replays and snapshots store, so a stored seed starts the same game.
+        """
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed & 0xFFFFFFFFFFFFFFFF
+        self.random = random.Random(self.seed)
+        self.ticks = 0
+        self.game_mode.option_mode = None
+        self.restart(SnakeEngine.START_BODY)
+
+    def restart(self, body):
+        """Reset the Snake to the given (row, column) layout body, the fruit to its start and the score to zero."""
+        self.set_body(self.layout_cell(*position) for position in body)
+        self.direction = SnakeEngine.DIRECTION_NONE
+        self.new_block = False
+        self.move_fruit(self.layout_cell(*SnakeEngine.FRUIT_START))
+        self.fruit_kind = self.pick_fruit_kind()
+        # Set high score and reset score.
+        self.high_score = max(self.score, self.high_score)
+        self.score = 0
+        # Clear dynamic walls.
+        walls, self.dynamic_walls = self.dynamic_walls, set()
+        # In order, as a set's order depends on its history, e.g. whether it was restored from a snapshot.
+        for cell in sorted(walls):
+            self.grid[cell] &= ~SnakeEngine.WALL
+            self.release(cell)
+        if walls:
+            # Walls can only be added to the connectivity, so it is rebuilt from the static walls when next needed.
+            self.wall_connectivity = None
+
+    def set_body(self, cells):
+        """Replace the Snake's body with the given cells, head first, and rebuild its occupancy."""
+        old_body = self.body
+        for cell in old_body:
+            self.occupancy[cell] = 0
+        self.body = deque(cells)
+        # Segments are numbered from the tail so that the head has the highest serial.
+        self.serial = len(self.body) - 1
+        for serial, cell in enumerate(reversed(self.body)):
+            self.occupancy[cell] += 1
+            self.serials[cell] = serial
+            self.free_cells.discard(cell)
+        for cell in old_body:
+            self.release(cell)
+
+    def open_options(self, option_mode):
+        """Restart the Snake in front of the phantom fruit for the given OptionMode."""
+        self.restart(SnakeEngine.OPTION_START_BODY)
+        self.game_mode.option_mode = option_mode
+
+    @property
+    def head(self):
+        return self.body[0]
+
+    def segment_index(self, cell):
+        """Returns the body index of the newest Snake segment on a cell, or None if the cell is empty."""
+        if not self.occupancy[cell]:
+            return None
+        return (self.serial - self.serials[cell]) & 0xFFFFFFFF
+
+    @property
+    def options(self):
+        """Returns the phantom fruit layout (cell -> (skin, value)) of the current OptionMode, or None when playing."""
+        return self.option_cells.get(self.game_mode.option_mode)
+
+    @property
+    def free_movement(self):
+        """Returns True if the Snake may pass through itself and walls, and reverse its direction."""
+        return self.game_mode.play_mode == PlayMode.ZEN or self.game_mode.option_mode is not None
+
+    def is_wall(self, cell):
+        return self.grid[cell] & SnakeEngine.WALL
+
+    def release(self, cell):
+        """Returns a cell to the free cells if nothing occupies it anymore."""
+        if not self.occupancy[cell] and not self.grid[cell]:
+            self.free_cells.add(cell)
+
+    @property
+    def heading(self):
+        """Returns the direction the Snake last moved in, from its neck to its head: at the start, the way it faces."""
+        if len(self.body) < 2:
+            return SnakeEngine.DIRECTION_NONE
+        row, column = divmod(self.body[0], self.columns)
+        neck_row, neck_column = divmod(self.body[1], self.columns)
+        return row - neck_row, column - neck_column
+
+    def turn(self, direction):
+        """Changes the Snake's direction (if it did not last move in that axis). Returns True if successful.
+
+        Turns are checked against the heading rather than the direction last turned to, so that several turns before a
+        tick cannot reverse the Snake into its neck. A Snake that has not started moving can start in any direction but
+        back into its neck.
+        """
+        heading = self.heading
+        axis = SnakeEngine.AXIS_VERTICAL if direction in SnakeEngine.AXIS_VERTICAL else SnakeEngine.AXIS_HORIZONTAL
+        if (heading not in axis or self.free_movement or
+                self.direction == SnakeEngine.DIRECTION_NONE and direction == heading):
+            self.direction = direction
+            return True
+        return False
+
+    def step(self, action=None):
+        """Turns the Snake toward action (a direction, or None to keep going) and advances one tick."""
+        if action is not None:
+            self.turn(action)
+        return self.tick()
+
+    def tick(self):
+        """Advances the game by one move of the Snake. Returns the Event flags for the tick."""
+        self.ticks += 1
+        self.changed_cells = []
+        events = Event.NONE
+        if self.direction != SnakeEngine.DIRECTION_NONE:
+            if not self.move():
+                # Snake died.
+                self.restart(SnakeEngine.START_BODY)
+                return Event.DIED
+            events |= Event.MOVED
+
+        # Snake is alive, check if it ate.
+        options = self.options
+        head = self.body[0]
+        if options is not None:
+            if head in options:
+                self.select_option(options[head][1])
+                events |= Event.OPTION_SELECTED
+        elif head == self.fruit_cell:
+            self.eat()
+            events |= Event.ATE
+            # Create a wall if the new score is odd (and play mode is WALL).
+            if self.score % 2 != 0 and self.game_mode.play_mode == PlayMode.WALL:
+                if self.create_random_wall() is not None:
+                    events |= Event.WALL_CREATED
+        return events
+
+    def move(self):
+        """Moves the Snake in O(1). Returns True if the move was successful; False if the Snake hit itself or the wall.
+
+        A failed move leaves the body without its tail; the caller restarts the Snake.
+        """
+        body = self.body
+        occupancy = self.occupancy
+
+        # The tail leaves its cell before the head moves, unless the Snake is growing.
+        if self.new_block:
+            self.new_block = False
+        else:
+            tail = body.pop()
+            self.changed_cells.append(tail)
+            occupancy[tail] -= 1
+            if not occupancy[tail]:
+                self.release(tail)
+
+        row, column = divmod(body[0], self.columns)
+        row += self.direction[0]
+        column += self.direction[1]
+
+        # Check if the Snake moves outside of the grid.
+        if not (0 <= row < self.rows and 0 <= column < self.columns):
+            self.death_cause = DeathCause.EDGE
+            return False
+        new_head = row * self.columns + column
+
+        if not self.free_movement:
+            # Check if the Snake hits itself. In CHEESE mode, segments an odd distance from the head are holes.
+            if occupancy[new_head]:
+                if self.game_mode.play_mode != PlayMode.CHEESE or not (self.serials[new_head] ^ self.serial) & 1:
+                    self.death_cause = DeathCause.SELF
+                    return False
+            # Check if the Snake hits a wall.
+            if self.grid[new_head] & SnakeEngine.WALL:
+                self.death_cause = DeathCause.WALL
+                return False
+
+        self.serial += 1
+        body.appendleft(new_head)
+        if not occupancy[new_head]:
+            self.free_cells.discard(new_head)
+        occupancy[new_head] += 1
+        self.serials[new_head] = self.serial & 0xFFFFFFFF
+        self.changed_cells.append(new_head)
+        return True
+
+    def eat(self):
+        """Eats the fruit at the Snake's head, moving it to a random free tile and growing the Snake."""
+        self.move_fruit(self.free_cells.sample(self.random))
+        self.fruit_kind = self.pick_fruit_kind()
+        self.new_block = True
+        self.score += 1
+
+    def select_option(self, value):
+        """Applies the phantom fruit value eaten in the current OptionMode and returns to play."""
+        if self.game_mode.option_mode == OptionMode.CHANGE_FRUIT:
+            self.fruit_type = value
+            self.fruit_kind = self.pick_fruit_kind()
+        elif self.game_mode.option_mode == OptionMode.CHANGE_GAME_MODE:
+            self.game_mode.play_mode = value
+        elif self.game_mode.option_mode == OptionMode.CHANGE_SPEED:
+            self.tick_rate = value
+        self.game_mode.option_mode = None
+
+    def pick_fruit_kind(self):
+        """Returns the FruitType for the next fruit, choosing a random one if no type has been chosen."""
+        if self.fruit_type is None:
+            return self.random.choice(list(FruitType))
+        return self.fruit_type
+
+    def move_fruit(self, cell):
+        """Moves the fruit to the given cell, or removes it from the board if cell is None."""
+        old_cell, self.fruit_cell = self.fruit_cell, cell
+        if cell is not None:
+            self.grid[cell] |= SnakeEngine.FRUIT
+            self.free_cells.discard(cell)
+            self.changed_cells.append(cell)
+        if old_cell is not None and old_cell != cell:
+            self.changed_cells.append(old_cell)
+            self.grid[old_cell] &= ~SnakeEngine.FRUIT
+            self.release(old_cell)
+
+    def create_wall(self, cell, static=False):
+        """Create a Wall at the specified cell."""
+        walls = self.static_walls if static else self.dynamic_walls
+        walls.add(cell)
+        self.grid[cell] |= SnakeEngine.WALL
+        self.free_cells.discard(cell)
+        self.changed_cells.append(cell)
+        if self.wall_connectivity is not None:
+            self.wall_connectivity.add(cell)
+
+    def create_random_wall(self, static=False, connected=True):
+        """Create a Wall at a random free tile; return its cell, or None if the board is full.
+
+        If connected, only a tile that leaves every tile without a wall reachable from the others, and none of them a
+        dead end, is used (see WallConnectivity.allows). Up to WALL_ATTEMPTS random free tiles are tried for one before
+        one is picked from all the free tiles that are allowed; None is returned if none of them is.
+        """
+        if not connected:
+            cell = self.free_cells.sample(self.random)
+            if cell is not None:
+                self.create_wall(cell, static=static)
+            return cell
+        connectivity = self.connectivity()
+        for _ in range(SnakeEngine.WALL_ATTEMPTS):
+            cell = self.free_cells.sample(self.random)
+            if cell is None:
+                return None
+            if connectivity.allows(cell):
+                self.create_wall(cell, static=static)
+                return cell
+        allowed = [cell for cell in self.free_cells if connectivity.allows(cell)]
+        if not allowed:
+            return None
+        cell = self.random.choice(allowed)
+        self.create_wall(cell, static=static)
+        return cell
+
+    def connectivity(self):
+        """Returns the WallConnectivity of the current walls, building it if the walls were cleared since last time."""
+        if self.wall_connectivity is None:
+            self.wall_connectivity = WallConnectivity(self.rows, self.columns, self.static_walls | self.dynamic_walls)
+        return self.wall_connectivity
+
+    def set_static_walls(self, cells):
+        """Replaces the static walls with the given cells, e.g. a WallLayout's. Cells taken by the Snake or the fruit
+        are left without a wall."""
+        for cell in sorted(self.static_walls):
+            self.grid[cell] &= ~SnakeEngine.WALL
+            self.changed_cells.append(cell)
+            self.release(cell)
+        self.static_walls = set()
+        self.wall_connectivity = None
+        # In order, so that the free cells (and so the random placements after) do not depend on how cells is ordered.
+        for cell in sorted(cells):
+            if not self.occupancy[cell] and cell != self.fruit_cell and cell not in self.dynamic_walls:
+                self.create_wall(cell, static=True)
+
+    def clone(self):
+        """Returns an independent copy of the engine, e.g. to branch a search from it. Cheaper than a snapshot."""
+        clone = SnakeEngine.__new__(SnakeEngine)
+        clone.__dict__.update(self.__dict__)
+        clone.game_mode = GameMode(self.game_mode.play_mode, self.game_mode.option_mode)
+        clone.grid = self.grid[:]
+        clone.static_walls = set(self.static_walls)
+        clone.dynamic_walls = set(self.dynamic_walls)
+        if self.wall_connectivity is not None:
+            clone.wall_connectivity = self.wall_connectivity.copy()
+        clone.occupancy = self.occupancy[:]
+        clone.serials = self.serials[:]
+        clone.free_cells = self.free_cells.copy()
+        clone.body = self.body.copy()
+        clone.changed_cells = list(self.changed_cells)
+        # Skip seeding the new generator (from the OS) since its state is replaced anyway.
+        clone.random = random.Random.__new__(random.Random)
+        clone.random.setstate(self.random.getstate())
+        return clone
+
+    def snapshot(self):
+        """Returns the state of the game as bytes, to be restored with restore() or from_snapshot().
+
+        The free cells are stored in their sampling order, as runs of consecutive cells, so that a restored copy places
+        fruit and walls where the engine would.
+        """
+        size = self.rows * self.columns
+        typecode = 'H' if size <= 0x10000 else 'I'
+        runs = self.free_cells.runs()
+        option_modes = list(OptionMode)
+        version, state, gauss_next = self.random.getstate()
+        header = SnakeEngine.SNAPSHOT_HEADER.pack(
+            SnakeEngine.SNAPSHOT_MAGIC, SnakeEngine.SNAPSHOT_VERSION, self.rows, self.columns,
+            list(PlayMode).index(self.game_mode.play_mode),
+            SnakeEngine.NONE if self.game_mode.option_mode is None else option_modes.index(self.game_mode.option_mode),
+            SnakeEngine.NONE if self.fruit_type is None else list(FruitType).index(self.fruit_type),
+            list(FruitType).index(self.fruit_kind), self.tick_rate, self.seed, self.ticks, self.score,
+            self.high_score, self.direction[0], self.direction[1], self.new_block, self.serial,
+            -1 if self.fruit_cell is None else self.fruit_cell, len(self.body), len(runs) // 2, gauss_next is not None,
+            gauss_next or 0.0)
+        return b''.join((header, pack_cells(self.static_walls, size), pack_cells(self.dynamic_walls, size),
+                         array(typecode, self.body).tobytes(), runs.tobytes(), array('I', state).tobytes()))
+
+    def restore(self, data):
+        """Restores the state of a game from a snapshot() of an engine with the same board size."""
+        if data[:4] != SnakeEngine.SNAPSHOT_MAGIC or data[4] != SnakeEngine.SNAPSHOT_VERSION:
+            raise ValueError(f"Not a version {SnakeEngine.SNAPSHOT_VERSION} Snake snapshot")
+        rows, columns = struct.unpack_from('<HH', data, 5)
+        if (rows, columns) != (self.rows, self.columns):
+            raise ValueError(f"Snapshot of a {columns}x{rows} board does not fit a {self.columns}x{self.rows} board")
+        (_, _, rows, columns, play_mode, option_mode, fruit_type, fruit_kind, self.tick_rate, self.seed,
+         self.ticks, self.score, self.high_score, direction_row, direction_column, self.new_block, self.serial,
+         fruit_cell, body_length, run_count, has_gauss, gauss_next) = SnakeEngine.SNAPSHOT_HEADER.unpack_from(data)
+        self.game_mode = GameMode(list(PlayMode)[play_mode], None if option_mode == SnakeEngine.NONE else list(OptionMode)[option_mode])
+        self.fruit_type = None if fruit_type == SnakeEngine.NONE else list(FruitType)[fruit_type]
+        self.fruit_kind = list(FruitType)[fruit_kind]
+        self.direction = (direction_row, direction_column)
+        self.fruit_cell = None if fruit_cell < 0 else fruit_cell
+        self.changed_cells = []
+        self.wall_connectivity = None
+
+        size = rows * columns
+        typecode = 'H' if size <= 0x10000 else 'I'
+        offset = SnakeEngine.SNAPSHOT_HEADER.size
+        bitmap_length = (size + 7) // 8
+        self.static_walls = unpack_cells(data[offset:offset + bitmap_length])
+        offset += bitmap_length
+        self.dynamic_walls = unpack_cells(data[offset:offset + bitmap_length])
+        offset += bitmap_length
+        cells = array(typecode)
+        cells.frombytes(data[offset:offset + body_length * cells.itemsize])
+        offset += body_length * cells.itemsize
+        runs = array('I')
+        runs.frombytes(data[offset:offset + 8 * run_count])
+        offset += 8 * run_count
+        state = array('I')
+        state.frombytes(data[offset:])
+        self.random.setstate((3, tuple(state), gauss_next if has_gauss else None))
+
+        self.grid = bytearray(size)
+        for cell in self.static_walls | self.dynamic_walls:
+            self.grid[cell] |= SnakeEngine.WALL
+        if self.fruit_cell is not None:
+            self.grid[self.fruit_cell] |= SnakeEngine.FRUIT
+        # Rebuild the occupancy grid, numbering segments back from the head's serial and ending with the newest.
+        self.occupancy = array('I', bytes(4 * size))
+        self.serials = array('I', bytes(4 * size))
+        self.body = deque(cells)
+        for index in range(len(cells) - 1, -1, -1):
+            cell = cells[index]
+            self.occupancy[cell] += 1
+            self.serials[cell] = (self.serial - index) & 0xFFFFFFFF
+        self.free_cells = FreeCells.from_runs(size, runs)
+
+    @classmethod
+    def from_snapshot(cls, data):
+        """Returns a new engine with the state of a snapshot()."""
+        rows, columns = struct.unpack_from('<HH', data, 5)
+        engine = cls(rows, columns, seed=0)
+        engine.restore(data)
+        return engine
+
+
+def pack_cells(cells, size):
+    """Returns a bitmap of the given cells on a grid of size cells."""
+    bitmap = bytearray((size + 7) // 8)
+    for cell in cells:
+        bitmap[cell >> 3] |= 1 << (cell & 7)
+    return bitmap
+
+
+def unpack_cells(bitmap):
+    """Returns the set of cells set in a bitmap from pack_cells()."""
+    # compress() skips the bytes without a cell in C, so only the others are looked at bit by bit.
+    return {index << 3 | bit for index in compress(range(len(bitmap)), bitmap) for bit in range(8)
+            if bitmap[index] >> bit & 1}
@@ -1,218 +1,233 @@
+import threading
 import pygame
 from pygame.locals import *
 from pygame.math import *
-from enum import Enum, auto
-from Board import Board, BoardSize
-from Fruit import Fruit, FruitType, PhantomFruit, PhantomFruitType
-from Snake import Snake
-
-
-class PlayMode(Enum):
-    CLASSIC = auto()
-    WALL = auto()
-    ZEN = auto()
-    CHEESE = auto()
-
-
-class OptionMode(Enum):
-    CHANGE_FRUIT = auto()
-    CHANGE_GAME_MODE = auto()
-    CHANGE_SPEED = auto()
-    CHANGE_SNAKE = auto()
-
-
-class GameMode:
-    def __init__(self, play_mode, option_mode=None):
-        self.play_mode = play_mode
-        self.option_mode = option_mode
+from Assets import assets
+from Audio import Audio
+from Autopilot import Autopilot
+from FruitType import FruitType, PhantomFruitType
+from GameMode import PlayMode, OptionMode, GameMode
+from InputQueue import InputQueue
+from Profiler import Profiler
+from Renderer import Renderer
+from Replay import Replay
+from Scheduler import Scheduler
+from SnakeEngine import SnakeEngine, Event
 
 
 class SnakeGame:
+    """Renders a SnakeEngine in a Pygame window and feeds it keyboard input."""
     SIZE = Vector2(544, 480)
     ORIGIN = SIZE / 2
     FPS = 100
+    # Milliseconds between updates of the performance overlay's text.
+    OVERLAY_INTERVAL = 250
     WHITE = (255, 255, 255)
     BLACK = (0, 0, 0)
 
-    def __init__(self):
-        pygame.init()
+    def __init__(self, engine=None, interpolate=False, atlas=False, player=None, playback_rate=None, autopilot=False,
+                 overlay=False, profile_path=None, tile_size=None, muted=False):
+        # Only what the first frame needs is initialized here; the mixer starts on the loading thread below.
+        pygame.display.init()
+        pygame.font.init()
         self.clock = pygame.time.Clock()
 
         # Initialize display.
         pygame.display.set_caption("Snake")
-        pygame.display.set_icon(pygame.image.load("res/icon.png"))
+        pygame.display.set_icon(assets.image("res/icon.png"))
         self.screen = pygame.display.set_mode(Vector2I(SnakeGame.SIZE))
 
         # Initialize font.
         self.font = pygame.font.Font("res/font/bit5x5.ttf", 24)
 
-        # Initialize sounds.
-        self.eat_sound = pygame.mixer.Sound('res/sound/eat.wav')
-        self.up_sound = pygame.mixer.Sound('res/sound/up.ogg')
-        self.down_sound = pygame.mixer.Sound('res/sound/down.ogg')
-        self.left_sound = pygame.mixer.Sound('res/sound/left.ogg')
-        self.right_sound = pygame.mixer.Sound('res/sound/right.ogg')
-        self.death_sound = pygame.mixer.Sound('res/sound/death.ogg')
-
-        # Initialize sprites.
-        self.game_mode = GameMode(PlayMode.CLASSIC)
-        self.fruit_type = FruitType.APPLE
-        self.sprites = pygame.sprite.Group()
-        self.fruits = pygame.sprite.Group()
-        self.board = Board(BoardSize.MEDIUM, pygame.Rect(0, 0, *SnakeGame.SIZE))
-        self.fruit = Fruit(FruitType.APPLE, self.board, 7, 12)
-        self.fruits.add(self.fruit)
-        self.sprites.add(self.board)
-        self.snake = Snake(self.board, self)
-        self.snake.body = [Vector2(7, 3), Vector2(7, 2), Vector2(7, 1)]
-
-        self.fruit_options = {
-            PhantomFruit(FruitType.APPLE, self.board, 7, 1): FruitType.APPLE,
-            PhantomFruit(FruitType.BANANA, self.board, 3, 2): FruitType.BANANA,
-            PhantomFruit(FruitType.PINEAPPLE, self.board, 3, 4): FruitType.PINEAPPLE,
-            PhantomFruit(FruitType.GRAPE, self.board, 3, 6): FruitType.GRAPE,
-            PhantomFruit(FruitType.PUMPKIN, self.board, 3, 8): FruitType.PUMPKIN,
-            PhantomFruit(FruitType.TURNIP, self.board, 3, 10): FruitType.TURNIP,
-            PhantomFruit(FruitType.AUBERGINE, self.board, 3, 12): FruitType.AUBERGINE,
-            PhantomFruit(FruitType.STRAWBERRY, self.board, 3, 14): FruitType.STRAWBERRY,
-            PhantomFruit(FruitType.CHERRY, self.board, 11, 3): FruitType.CHERRY,
-            PhantomFruit(FruitType.CARROT, self.board, 11, 5): FruitType.CARROT,
-            PhantomFruit(FruitType.MUSHROOM, self.board, 11, 7): FruitType.MUSHROOM,
-            PhantomFruit(FruitType.BROCCOLI, self.board, 11, 9): FruitType.BROCCOLI,
-            PhantomFruit(FruitType.WATERMELON, self.board, 11, 11): FruitType.WATERMELON,
-            PhantomFruit(PhantomFruitType.SALAD, self.board, 11, 13): None
-        }
-        self.fruit_options_sprites = pygame.sprite.Group(*self.fruit_options)
-        self.game_mode_options = {
-            PhantomFruit(FruitType.APPLE, self.board, 7, 1): PlayMode.CLASSIC,
-            PhantomFruit(PhantomFruitType.WALL, self.board, 3, 5): PlayMode.WALL,
-            PhantomFruit(PhantomFruitType.ZEN, self.board, 3, 11): PlayMode.ZEN,
-            PhantomFruit(PhantomFruitType.CHEESE, self.board, 11, 5): PlayMode.CHEESE
-        }
-        self.game_mode_options_sprites = pygame.sprite.Group(*self.game_mode_options)
+        # Sounds are loaded by the loading thread; sounds played before they are loaded are skipped.
+        self.audio = Audio(muted)
+
+        # Initialize the simulation. A ReplayPlayer drives its own engine instead of the keyboard.
+        self.player = player
+        if player is not None:
+            engine = player.engine
+        self.engine = engine if engine is not None else SnakeEngine()
+        # Record the inputs of a game played from its start, so that it can be saved and replayed.
+        self.replay = Replay.record(self.engine) if player is None and self.engine.ticks == 0 else None
+
+        # Initialize the renderer.
+        # Boards too big to fit the window, or any board given a tile_size, scroll with the Snake's head.
+        self.renderer = Renderer(self.engine, self.screen, self.font, atlas=atlas, tile_size=tile_size)
+        self.renderer.interpolate = interpolate
 
-        # Create a custom Pygame event for snake movement: 1 grid square = 100 ms
-        SnakeGame.SCREEN_UPDATE = pygame.USEREVENT
-        pygame.time.set_timer(SnakeGame.SCREEN_UPDATE, 100)
+        # Run the simulation at the engine's tick rate (or the given replay playback rate), independent of the frame rate.
+        self.playback_rate = playback_rate
+        self.scheduler = Scheduler(self.engine.tick_rate)
 
-        # Define controls by key, snake movement and sound. Arrow keys will move the snake.
+        # Define controls by key, snake direction and sound. Arrow keys will move the snake.
         self.controls = {
-            K_UP: (Snake.up, self.up_sound),
-            K_DOWN: (Snake.down, self.down_sound),
-            K_LEFT: (Snake.left, self.left_sound),
-            K_RIGHT: (Snake.right, self.right_sound)
+            K_UP: (SnakeEngine.DIRECTION_UP, 'up'),
+            K_DOWN: (SnakeEngine.DIRECTION_DOWN, 'down'),
+            K_LEFT: (SnakeEngine.DIRECTION_LEFT, 'left'),
+            K_RIGHT: (SnakeEngine.DIRECTION_RIGHT, 'right')
         }
-
-        self.playing = True
-        self.score = 0
-        self.high_score = 0
-        hud_text_score = {
-            OptionMode.CHANGE_FRUIT: 'Change Fruit',
-            OptionMode.CHANGE_GAME_MODE: 'Change Game Mode'
+        self.turn_sounds = {direction: sound for direction, sound in self.controls.values()}
+        # Arrow keys pressed since the last tick, applied one per tick.
+        self.inputs = InputQueue()
+        self.option_keys = {
+            K_f: OptionMode.CHANGE_FRUIT,
+            K_g: OptionMode.CHANGE_GAME_MODE,
+            K_s: OptionMode.CHANGE_SPEED
         }
+        # Steers the Snake while switched on with the A key. Its turns are recorded like the player's.
+        self.autopilot = Autopilot(self.engine) if autopilot and player is None else None
+        # Per-phase frame timing, only kept while the performance overlay (P key) is shown or timings are exported.
+        self.profile_path = profile_path
+        self.overlay = False
+        self.overlay_font = None
+        self.overlay_surface = None
+        self.overlay_updated = 0
+        self.profiler = Profiler(export_path=profile_path) if profile_path is not None else None
+        if overlay:
+            self.toggle_overlay()
+        self.playing = True
+
+        # Load the sounds and option menu images while the first frames are shown.
+        self.loader = threading.Thread(target=self.load_assets, name='asset loader', daemon=True)
+        self.loader.start()
+
+    def load_assets(self):
+        """Starts the mixer and loads the sounds and option menu images. Runs on the loading thread."""
+        self.renderer.preload_options()
+        self.audio.load()
+
+    @property
+    def game_mode(self):
+        return self.engine.game_mode
+
+    def run(self):
+        """Runs the game loop until the window is closed."""
+        idle = False
         while self.playing:
-            # Handle events.
-            for event in pygame.event.get():
+            profiler = self.profiler
+            if profiler is not None:
+                profiler.begin_frame()
+            # Handle events. When the last frame drew nothing, sleep until input arrives or the next tick is due.
+            events = pygame.event.get()
+            if idle and not events:
+                if profiler is not None:
+                    profiler.mark('events')
+                event = pygame.event.wait(max(int(self.scheduler.time_until_tick() * 1000), 1))
+                events = [event] if event.type != NOEVENT else []
+                if profiler is not None:
+                    profiler.mark('wait')
+            for event in events:
                 if event.type == QUIT:
                     self.playing = False
-                elif event.type == SnakeGame.SCREEN_UPDATE:
-                    if self.snake.move_snake():
-                        # Snake is alive, check if it ate.
-                        if self.game_mode.option_mode is not None and self.snake.phantom_eat():
-                            phantom_fruit = self.snake.get_head_tile().phantom_fruit
-                            if self.game_mode.option_mode == OptionMode.CHANGE_FRUIT and phantom_fruit in self.fruit_options:
-                                self.eat_sound.play()
-                                self.fruit_type = self.fruit_options[phantom_fruit]
-                                self.fruit.set_type(self.fruit_type)
-                                self.game_mode.option_mode = None
-                            elif self.game_mode.option_mode == OptionMode.CHANGE_GAME_MODE and phantom_fruit in self.game_mode_options:
-                                self.eat_sound.play()
-                                self.game_mode.play_mode = self.game_mode_options[phantom_fruit]
-                                self.game_mode.option_mode = None
-                        elif self.game_mode.option_mode is None and self.snake.eat():
-                            self.eat_sound.play()
-                            self.score += 1
-                            self.fruit.set_type(self.fruit_type)
-                            # Create a wall if the new score if odd (and play mode is WALL)
-                            if self.score % 2 != 0 and self.game_mode.play_mode == PlayMode.WALL:
-                                self.board.create_random_wall()
-                    else:
-                        # Snake died.
-                        self.death_sound.play()
-                        # Reset snake.
-                        self.snake = Snake(self.board, self)
-                        self.snake.body = [Vector2(7, 3), Vector2(7, 2), Vector2(7, 1)]
-                        # Reset fruit.
-                        self.fruit.set_tile(7, 12)
-                        self.fruit.set_type(self.fruit_type)
-                        # Set high score and reset score.
-                        self.high_score = self.score if self.score > self.high_score else self.high_score
-                        self.score = 0
-                        # Clear dynamic walls.
-                        for wall in self.board.dynamic_walls:
-                            wall.tile.wall = None
-                            wall.kill()
                 elif event.type == KEYDOWN:
                     # Handle key presses.
                     if event.key in self.controls:
-                        snake_moved = self.controls.get(event.key)[0](self.snake)
-                        # Only play move sound if the snake successfully moved.
-                        if snake_moved:
-                            self.controls.get(event.key)[1].play()
-                    elif event.key in (K_f, K_g):
-                        # Reset snake.
-                        self.snake = Snake(self.board, self)
-                        self.snake.body = [Vector2(7, 9), Vector2(7, 8), Vector2(7, 7)]
-                        # Reset fruit.
-                        self.fruit.set_tile(7, 12)
-                        self.fruit.set_type(self.fruit_type)
-                        # Set high score and reset score.
-                        # Set high score and reset score.
-                        self.high_score = self.score if self.score > self.high_score else self.high_score
-                        self.score = 0
-                        # Clear dynamic walls.
-                        for wall in self.board.dynamic_walls:
-                            wall.tile.wall = None
-                            wall.kill()
-                        if event.key == K_f:
-                            self.game_mode.option_mode = OptionMode.CHANGE_FRUIT
-                            for phantom_fruit in self.fruit_options:
-                                phantom_fruit.tile.phantom_fruit = phantom_fruit
-                        elif event.key == K_g:
-                            self.game_mode.option_mode = OptionMode.CHANGE_GAME_MODE
-                            for phantom_fruit in self.game_mode_options:
-                                phantom_fruit.tile.phantom_fruit = phantom_fruit
-
-            # Draw sprites and snake.
-            self.screen.fill(Board.LIGHT_GREEN)
-            self.sprites.draw(self.screen)
-            self.board.static_walls.draw(self.screen)
-            self.board.dynamic_walls.draw(self.screen)
-
-            if self.game_mode.option_mode is not None:
-                if self.game_mode.option_mode == OptionMode.CHANGE_FRUIT:
-                    self.fruit_options_sprites.draw(self.screen)
-                elif self.game_mode.option_mode == OptionMode.CHANGE_GAME_MODE:
-                    self.game_mode_options_sprites.draw(self.screen)
-            else:
-                if self.game_mode.play_mode in (PlayMode.CLASSIC, PlayMode.WALL, PlayMode.ZEN, PlayMode.CHEESE):
-                    self.fruits.draw(self.screen)
-
-            self.snake.draw_snake(self.screen)
-
-            # Draw score.
-            score_text = self.font.render(hud_text_score.get(self.game_mode.option_mode, str(self.score)), True, SnakeGame.BLACK)
-            score_text_center = self.board.get_tile(1, 8).rect.center
-            self.screen.blit(score_text, center_on_point(score_text_center, score_text.get_size()))
-
-            # Draw high score.
-            if self.high_score > 0:
-                high_score_text = self.font.render(str(self.high_score) if self.game_mode.option_mode is None else '', True, SnakeGame.WHITE)
-                high_score_text_center = self.board.get_tile(2, 8).rect.center
-                self.screen.blit(high_score_text, center_on_point(high_score_text_center, high_score_text.get_size()))
-
-            pygame.display.flip()
+                        # The arrow keys do nothing while the autopilot steers.
+                        if self.player is None and self.autopilot is None:
+                            self.inputs.push(self.controls[event.key][0])
+                    elif event.key in self.option_keys:
+                        if self.input(self.option_keys[event.key]):
+                            self.renderer.invalidate()
+                    elif event.key == K_a and self.player is None:
+                        self.autopilot = Autopilot(self.engine) if self.autopilot is None else None
+                        self.inputs.clear()
+                    elif event.key == K_p:
+                        self.toggle_overlay()
+            if profiler is not None:
+                profiler.mark('events')
+
+            # Advance the simulation by whole ticks for the time that has passed.
+            self.scheduler.tick_rate = self.playback_rate or self.engine.tick_rate
+            ticks = self.scheduler.advance()
+            for _ in range(ticks):
+                if self.player is None:
+                    if self.autopilot is not None:
+                        direction = self.autopilot.decide()
+                        # Only actual turns are applied, so that the replay does not record an input every tick.
+                        if direction is not None and direction != self.engine.direction:
+                            self.input(direction)
+                    else:
+                        # Only play move sound if the snake successfully turned.
+                        direction = self.inputs.apply(self.input, self.engine.tick_rate)
+                        if direction is not None:
+                            self.audio.play(self.turn_sounds[direction])
+                    self.update(self.engine.tick())
+                    if self.replay is not None:
+                        self.replay.record_tick(self.engine)
+                elif not self.player.done:
+                    if self.player.apply_inputs():
+                        self.renderer.invalidate()
+                    self.update(self.player.step())
+            if profiler is not None:
+                profiler.mark('simulate')
+
+            # Only repaint and present the parts of the screen that changed.
+            rects = self.renderer.draw(self.scheduler.alpha)
+            if self.overlay:
+                rects.append(self.draw_overlay())
+            if profiler is not None:
+                profiler.mark('draw')
+            if rects:
+                pygame.display.update(rects)
+            idle = not rects
+            if profiler is not None:
+                profiler.mark('present')
             self.clock.tick(SnakeGame.FPS)
+            if profiler is not None:
+                profiler.mark('wait')
+                profiler.end_frame(ticks)
+        if self.profiler is not None:
+            self.profiler.close()
+
+    def toggle_overlay(self):
+        """Shows or hides the performance overlay, timing frames only while it is shown or timings are exported."""
+        self.overlay = not self.overlay
+        if self.overlay and self.profiler is None:
+            self.profiler = Profiler()
+        elif not self.overlay and self.profile_path is None:
+            self.profiler = None
+        self.overlay_surface = None
+        self.renderer.invalidate()
+
+    def draw_overlay(self):
+        """Draws the frame timings in the top left corner, re-rendering them a few times a second. Returns its rect."""
+        now = pygame.time.get_ticks()
+        if self.overlay_surface is None or now - self.overlay_updated >= SnakeGame.OVERLAY_INTERVAL:
+            if self.overlay_font is None:
+                self.overlay_font = pygame.font.Font(None, 18)
+            text = (self.profiler.lines() or ['...']) + self.inputs.lines(self.engine.tick_rate)
+            lines = [self.overlay_font.render(line, True, SnakeGame.WHITE) for line in text]
+            line_height = self.overlay_font.get_linesize()
+            self.overlay_surface = pygame.surface.Surface((max(line.get_width() for line in lines) + 8, len(lines) * line_height + 8))
+            self.overlay_surface.fill(SnakeGame.BLACK)
+            self.overlay_surface.set_alpha(200)
+            for index, line in enumerate(lines):
+                self.overlay_surface.blit(line, (4, 4 + index * line_height))
+            self.overlay_updated = now
+        rect = self.overlay_surface.get_rect(topleft=(4, 4))
+        self.screen.blit(self.overlay_surface, rect)
+        # Repaint what is under the overlay next frame, in case it shrinks.
+        self.renderer.dirty_rects.append(rect)
+        return rect
+
+    def input(self, value):
+        """Applies a direction or OptionMode from the keyboard, recording it. Returns True if it changed the engine."""
+        if self.player is not None:
+            return False
+        if self.replay is not None:
+            self.replay.add(self.engine.ticks, value)
+        return Replay.apply(self.engine, value)
+
+    def update(self, events):
+        """Plays sounds for the Event flags of an engine tick and passes them on to the renderer."""
+        if events & Event.DIED:
+            # Turns pressed for the last life should not steer the next.
+            self.inputs.clear()
+            self.audio.play('death')
+        elif events & (Event.ATE | Event.OPTION_SELECTED):
+            self.audio.play('eat')
+        self.renderer.update(events)
 
 
 # Utility functions
@@ -0,0 +1,222 @@
+"""Plays many headless games per PlayMode, bot and board size over a process pool, and reports score statistics.
+
+Run from the repository root, e.g.: python Tournament.py --games 1000 --modes classic wall --bots autopilot greedy
+"""
+import argparse
+import csv
+import json
+import math
+import multiprocessing
+import random
+import sys
+import time
+from Autopilot import Autopilot
+from BoardSize import BoardSize
+from GameMode import PlayMode
+from SnakeEngine import SnakeEngine, Event
+
+
+class RandomBot:
+    """Turns the Snake in a random direction on about one tick in five."""
+
+    def __init__(self, engine):
+        self.random = random.Random(engine.seed)
+
+    def decide(self):
+        if self.random.random() < 0.2:
+            return self.random.choice(Autopilot.DIRECTIONS)
+        return None
+
+
+class GreedyBot:
+    """Turns the Snake toward the fruit, avoiding cells it would die on next tick but looking no further ahead."""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def decide(self):
+        engine = self.engine
+        head_row, head_column = engine.position(engine.head)
+        fruit_row, fruit_column = engine.position(engine.fruit_cell if engine.fruit_cell is not None else engine.head)
+        best = None
+        for direction in Autopilot.DIRECTIONS:
+            row, column = head_row + direction[0], head_column + direction[1]
+            if not (0 <= row < engine.rows and 0 <= column < engine.columns):
+                continue
+            cell = engine.cell(row, column)
+            if not engine.free_movement:
+                index = engine.segment_index(cell)
+                if engine.is_wall(cell) or index is not None and index < len(engine.body) - 1 + engine.new_block:
+                    continue
+            distance = abs(fruit_row - row) + abs(fruit_column - column)
+            if best is None or distance < best[0]:
+                best = (distance, direction)
+        return best[1] if best is not None else None
+
+
+BOTS = {
+    'autopilot': Autopilot,
+    'greedy': GreedyBot,
+    'random': RandomBot
+}
+
+
+def play_game(game):
+    """Plays one game until the Snake first dies, fills the board or runs out of ticks. Returns its result as a dict.
+
+    game is a (play mode name, bot name, board size name, seed, maximum ticks) tuple.
+    """
+    play_mode, bot, size, seed, max_ticks = game
+    board_size = BoardSize[size]
+    engine = SnakeEngine(board_size.rows, board_size.columns, PlayMode[play_mode], seed=seed)
+    player = BOTS[bot](engine)
+    result = 'timeout'
+    length = len(engine.body)
+    start = time.perf_counter()
+    while engine.ticks < max_ticks:
+        if engine.step(player.decide()) & Event.DIED:
+            result = engine.death_cause.name.lower()
+            break
+        length = len(engine.body)
+        if engine.fruit_cell is None:
+            result = 'full'
+            break
+    elapsed = time.perf_counter() - start
+    return {
+        'play_mode': play_mode, 'bot': bot, 'size': size, 'seed': seed,
+        # A death moves the score into the high score.
+        'score': max(engine.score, engine.high_score), 'length': length, 'result': result,
+        'ticks': engine.ticks, 'seconds': elapsed
+    }
+
+
+class Statistics:
+    """Running statistics of the game results of one PlayMode, bot and board size, kept without storing the results."""
+
+    def __init__(self):
+        self.games = 0
+        # Mean and sum of squared deviations of the scores (Welford's algorithm).
+        self.mean = 0.0
+        self.squares = 0.0
+        # Number of games by score, for percentiles; scores are bounded by the board size.
+        self.scores = {}
+        self.length_total = 0
+        self.max_length = 0
+        self.results = {}
+        self.ticks = 0
+        self.seconds = 0.0
+
+    def add(self, result):
+        self.games += 1
+        score = result['score']
+        delta = score - self.mean
+        self.mean += delta / self.games
+        self.squares += delta * (score - self.mean)
+        self.scores[score] = self.scores.get(score, 0) + 1
+        self.length_total += result['length']
+        self.max_length = max(self.max_length, result['length'])
+        self.results[result['result']] = self.results.get(result['result'], 0) + 1
+        self.ticks += result['ticks']
+        self.seconds += result['seconds']
+
+    def percentile(self, fraction):
+        rank = fraction * (self.games - 1)
+        seen = 0
+        for score in sorted(self.scores):
+            seen += self.scores[score]
+            if seen > rank:
+                return score
+        return None
+
+    def report(self):
+        return {
+            'games': self.games,
+            'score_mean': round(self.mean, 3),
+            'score_stdev': round(math.sqrt(self.squares / (self.games - 1)), 3) if self.games > 1 else 0.0,
+            'score_min': min(self.scores),
+            'score_p10': self.percentile(0.1),
+            'score_median': self.percentile(0.5),
+            'score_p90': self.percentile(0.9),
+            'score_max': max(self.scores),
+            'length_mean': round(self.length_total / self.games, 3),
+            'length_max': self.max_length,
+            'results': dict(sorted(self.results.items())),
+            'ticks': self.ticks,
+            # Simulation speed of a single process.
+            'ticks_per_second': round(self.ticks / self.seconds) if self.seconds else None
+        }
+
+
+def games(args):
+    """Yields a game tuple for each game to play, seeded from the base seed and the game's number."""
+    number = 0
+    for play_mode in args.modes:
+        for bot in args.bots:
+            for size in args.sizes:
+                for _ in range(args.games):
+                    yield play_mode.upper(), bot, size.upper(), args.seed + number, args.max_ticks
+                    number += 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play headless Snake games in parallel and report score statistics.")
+    parser.add_argument('--games', type=int, default=100, help="games per play mode, bot and board size (default: 100)")
+    parser.add_argument('--modes', nargs='+', choices=[mode.name.lower() for mode in PlayMode], default=['classic'])
+    parser.add_argument('--bots', nargs='+', choices=list(BOTS), default=['autopilot'])
+    parser.add_argument('--sizes', nargs='+', choices=[size.name.lower() for size in BoardSize], default=['small'])
+    parser.add_argument('--max-ticks', type=int, default=10000, help="ticks before a game is stopped (default: 10000)")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first game; each game adds its number")
+    parser.add_argument('--processes', type=int, help="worker processes (default: one per core)")
+    parser.add_argument('--output', metavar='PATH', help="write the report to PATH, as CSV if it ends in .csv (default: JSON to stdout)")
+    parser.add_argument('--results', metavar='PATH', help="also write every game's result to PATH as CSV, as it arrives")
+    args = parser.parse_args(argv)
+
+    processes = args.processes or multiprocessing.cpu_count()
+    total = args.games * len(args.modes) * len(args.bots) * len(args.sizes)
+    # Several chunks per process keep every process busy to the end without a round trip per game.
+    chunk_size = max(1, min(64, total // (processes * 8)))
+    statistics = {}
+    results_file = open(args.results, 'w', newline='') if args.results else None
+    writer = None
+    start = time.perf_counter()
+    try:
+        with multiprocessing.Pool(processes) as pool:
+            for result in pool.imap_unordered(play_game, games(args), chunk_size):
+                key = (result['play_mode'], result['bot'], result['size'])
+                statistics.setdefault(key, Statistics()).add(result)
+                if results_file is not None:
+                    if writer is None:
+                        writer = csv.DictWriter(results_file, fieldnames=list(result))
+                        writer.writeheader()
+                    writer.writerow(result)
+    finally:
+        if results_file is not None:
+            results_file.close()
+    elapsed = time.perf_counter() - start
+
+    rows = [dict(play_mode=play_mode.lower(), bot=bot, size=size.lower(), **statistics[play_mode, bot, size].report())
+            for play_mode, bot, size in sorted(statistics)]
+    report = {
+        'games': total,
+        'processes': processes,
+        'seconds': round(elapsed, 3),
+        'ticks_per_second': round(sum(row['ticks'] for row in rows) / elapsed),
+        'groups': rows
+    }
+    if args.output and args.output.endswith('.csv'):
+        with open(args.output, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(dict(row, results=json.dumps(row['results'])))
+    elif args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    print(f"{total} games in {elapsed:.2f} s on {processes} processes ({report['ticks_per_second']:,} ticks/s)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,6 @@
 import pygame
 from pygame.math import *
-import random
+from Assets import assets
 
 
 class Wall(pygame.sprite.Sprite):
@@ -10,9 +10,6 @@ class Wall(pygame.sprite.Sprite):
         super().__init__()
         self.board = board
         self.tile = self.board.get_tile(row, column)
-        self.tile.wall = self
         self.rect = self.tile.rect
-        surface = pygame.surface.Surface(self.rect.size)
-        surface.fill(board.wall_color)
-        self.image = surface
+        self.image = assets.solid(board.wall_color, self.rect.size)
 
@@ -0,0 +1,106 @@
+from array import array
+
+
+class WallConnectivity:
+    """Tells in near-constant time whether a new wall would cut the cells without walls into separate regions.
+
+    Walls that touch, including diagonally, are grouped in a union-find, with everything outside the board as one more
+    wall. The cells without walls (moving up, down, left and right) stay connected as long as no group of walls closes
+    a loop: a wall splits the board only if it joins two runs of walls around it that already belong to the same group.
+    allows() also rules out walls that would leave a dead end, which only has to be checked next to the new wall.
+    Walls can only be added; clear() starts over, e.g. when dynamic walls are removed.
+    """
+    # The eight cells around a cell, clockwise from the one above it. Even indices are the orthogonal neighbours.
+    RING = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+
+    def __init__(self, rows, columns, walls=()):
+        self.rows = rows
+        self.columns = columns
+        # Index of the node standing for everything outside the board.
+        self.outside = rows * columns
+        self.clear(walls)
+
+    def clear(self, walls=()):
+        """Removes every wall, then adds the given ones."""
+        # Parent of each wall's node in the union-find, or -1 for cells without a wall.
+        self.parent = array('i', [-1]) * (self.outside + 1)
+        self.parent[self.outside] = self.outside
+        for cell in walls:
+            self.add(cell)
+
+    def copy(self):
+        copy = WallConnectivity.__new__(WallConnectivity)
+        copy.__dict__.update(self.__dict__)
+        copy.parent = self.parent[:]
+        return copy
+
+    def find(self, node):
+        """Returns the root of a wall's group, halving the path to it."""
+        parent = self.parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def ring(self, cell):
+        """Returns the eight neighbours of a cell in RING order, with self.outside for those off the board."""
+        rows, columns = self.rows, self.columns
+        row, column = divmod(cell, columns)
+        return [(row + row_offset) * columns + column + column_offset
+                if 0 <= row + row_offset < rows and 0 <= column + column_offset < columns else self.outside
+                for row_offset, column_offset in WallConnectivity.RING]
+
+    def add(self, cell):
+        """Adds a wall at a cell without one, joining the groups of the walls around it."""
+        parent = self.parent
+        parent[cell] = cell
+        for neighbour in self.ring(cell):
+            if parent[neighbour] >= 0:
+                root, other = self.find(cell), self.find(neighbour)
+                if root != other:
+                    parent[root] = other
+
+    def open_neighbours(self, cell):
+        """Returns the number of cells above, below, left and right of a cell that are on the board without a wall."""
+        parent, columns = self.parent, self.columns
+        row, column = divmod(cell, columns)
+        return ((row > 0 and parent[cell - columns] < 0) + (row < self.rows - 1 and parent[cell + columns] < 0) +
+                (column > 0 and parent[cell - 1] < 0) + (column < columns - 1 and parent[cell + 1] < 0))
+
+    def allows(self, cell):
+        """Returns True if a wall at the cell would neither split the board nor leave a dead end next to it: a cell
+        without a wall with only one way in or out, where a Snake could only turn back into itself."""
+        parent = self.parent
+        ring = self.ring(cell)
+        for index in (0, 2, 4, 6):
+            neighbour = ring[index]
+            # The cell itself is still counted among its neighbour's open neighbours.
+            if parent[neighbour] < 0 and self.open_neighbours(neighbour) <= 2:
+                return False
+        return not self.splits(cell)
+
+    def splits(self, cell):
+        """Returns True if a wall at the cell would leave some cells without walls unable to reach the others."""
+        parent = self.parent
+        ring = self.ring(cell)
+        walled = [parent[neighbour] >= 0 for neighbour in ring]
+        start = next((index for index in (0, 2, 4, 6) if not walled[index]), None)
+        if start is None:
+            # Surrounded by walls on all four sides: nothing can reach the cell anyway.
+            return False
+        # Walk once around the cell from an open orthogonal neighbour. Walls between two open orthogonal neighbours
+        # (or the only one and itself) separate them around the cell, and they all touch, so any one stands for the run.
+        runs = []
+        run = None
+        for step in range(1, 9):
+            index = (start + step) % 8
+            if walled[index]:
+                run = ring[index]
+            elif index % 2 == 0 and run is not None:
+                runs.append(run)
+                run = None
+        if len(runs) < 2:
+            return False
+        # The open neighbours stay connected around the rest of the board unless two runs are already joined.
+        roots = {self.find(run) for run in runs}
+        return len(roots) < len(runs)
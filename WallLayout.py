@@ -0,0 +1,91 @@
+import random
+import struct
+from SnakeEngine import SnakeEngine, pack_cells, unpack_cells
+from WallConnectivity import WallConnectivity
+
+
+class WallLayout:
+    """A seeded layout of static walls for one board size that leaves the board connected and free of dead ends.
+
+    Walls never cover the start of the Snake, the fruit or the option menus (nor the tiles right in front of the
+    Snake's head), so a layout fits every game on its board size. Generated layouts are cached by their parameters,
+    and can be saved to a file to be loaded without generating them again. Load one into an engine with apply().
+    """
+    # File layout: the header below, then a bitmap of the walls (see pack_cells).
+    MAGIC = b'SNKW'
+    VERSION = 1
+    # magic, version, rows, columns, number of walls asked for, seed.
+    HEADER = struct.Struct('<4sBHHIQ')
+    # Layouts by (rows, columns, count, seed).
+    CACHE = {}
+    # Random free cells tried per wall before the layout is left with fewer walls than asked for.
+    ATTEMPTS = 64
+
+    def __init__(self, rows, columns, cells, count=None, seed=0):
+        self.rows = rows
+        self.columns = columns
+        self.cells = frozenset(cells)
+        self.count = len(self.cells) if count is None else count
+        self.seed = seed
+
+    @classmethod
+    def generate(cls, rows, columns, count, seed=0):
+        """Returns a layout of up to count walls, generating it only the first time it is asked for."""
+        key = (rows, columns, count, seed)
+        layout = cls.CACHE.get(key)
+        if layout is None:
+            layout = cls.CACHE[key] = cls(rows, columns, cls.place(rows, columns, count, seed), count, seed)
+        return layout
+
+    @staticmethod
+    def place(rows, columns, count, seed):
+        """Returns the cells of up to count walls placed at random, each allowed by a WallConnectivity."""
+        engine = SnakeEngine(rows, columns, seed=seed)
+        connectivity = WallConnectivity(rows, columns)
+        reserved = set(engine.body) | {engine.fruit_cell}
+        for cells in engine.option_cells.values():
+            reserved.update(cells)
+        for body in (SnakeEngine.START_BODY, SnakeEngine.OPTION_START_BODY):
+            cells = [engine.layout_cell(*position) for position in body]
+            reserved.update(cells)
+            # Leave the Snake room to start moving in any direction.
+            reserved.update(cell for cell in connectivity.ring(cells[0]) if cell != connectivity.outside)
+        free = [cell for cell in range(rows * columns) if cell not in reserved]
+        generator = random.Random(seed)
+        walls = set()
+        failures = 0
+        while len(walls) < count and free and failures < WallLayout.ATTEMPTS:
+            index = generator.randrange(len(free))
+            cell = free[index]
+            if not connectivity.allows(cell):
+                failures += 1
+                continue
+            failures = 0
+            free[index] = free[-1]
+            free.pop()
+            connectivity.add(cell)
+            walls.add(cell)
+        return walls
+
+    def apply(self, engine):
+        """Makes the layout the engine's static walls."""
+        if (engine.rows, engine.columns) != (self.rows, self.columns):
+            raise ValueError(f"Wall layout of a {self.columns}x{self.rows} board does not fit a {engine.columns}x{engine.rows} board")
+        engine.set_static_walls(self.cells)
+
+    def save(self, path):
+        with open(path, 'wb') as file:
+            file.write(WallLayout.HEADER.pack(WallLayout.MAGIC, WallLayout.VERSION, self.rows, self.columns, self.count,
+                                              self.seed & 0xFFFFFFFFFFFFFFFF))
+            file.write(pack_cells(self.cells, self.rows * self.columns))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as file:
+            data = file.read()
+        magic, version, rows, columns, count, seed = WallLayout.HEADER.unpack_from(data)
+        if magic != WallLayout.MAGIC or version != WallLayout.VERSION:
+            raise ValueError(f"{path} is not a version {WallLayout.VERSION} Snake wall layout")
+        layout = cls(rows, columns, unpack_cells(data[WallLayout.HEADER.size:]), count, seed)
+        cls.CACHE.setdefault((rows, columns, count, seed), layout)
+        return layout
@@ -0,0 +1,63 @@
+"""Measures Arena.tick() by the number of Snakes and by their length, against checking every head against every body.
+
+Each arena is a BOARD x BOARD board with bots steering every Snake. Snakes start START_LENGTHS long and grow as they
+eat. The bots' decisions are not timed. "all pairs" is the time a tick would spend only on looking for each head in
+every Snake's body, measured on the same boards.
+Run from the repository root: python benchmarks/arena.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Arena import Arena, ArenaBot
+
+BOARD = 300
+SNAKES = (10, 50, 100, 200, 400)
+START_LENGTHS = (3, 30, 100)
+TICKS = 200
+
+
+def all_pairs(arena):
+    """Returns the Snakes whose head is on a body, found by searching the bodies."""
+    hits = []
+    for snake in arena.snakes:
+        if not snake.alive:
+            continue
+        head = snake.body[0]
+        for other in arena.snakes:
+            if other.alive and head in (other.body if other is not snake else list(other.body)[1:]):
+                hits.append(snake)
+                break
+    return hits
+
+
+def benchmark(snakes, start_length):
+    arena = Arena(BOARD, BOARD, snakes, start_length=start_length, seed=0)
+    bots = [ArenaBot(arena, snake) for snake in arena.snakes]
+    tick_time = pairs_time = 0.0
+    deaths = 0
+    for tick in range(TICKS):
+        for bot in bots:
+            direction = bot.decide()
+            if direction is not None:
+                bot.snake.turn(direction)
+        start = time.perf_counter()
+        arena.tick()
+        tick_time += time.perf_counter() - start
+        deaths += len(arena.died)
+        if tick % 10 == 0:
+            start = time.perf_counter()
+            all_pairs(arena)
+            pairs_time += (time.perf_counter() - start) * 10
+    length = sum(len(snake.body) for snake in arena.snakes)
+    return tick_time / TICKS, pairs_time / TICKS, deaths / TICKS, length
+
+
+if __name__ == '__main__':
+    print(f"{'snakes':>7} {'start length':>13} {'total length':>13} {'tick us':>9} {'all pairs us':>13} {'deaths/tick':>12}")
+    for start_length in START_LENGTHS:
+        for snakes in SNAKES:
+            tick, pairs, deaths, length = benchmark(snakes, start_length)
+            print(f"{snakes:>7} {start_length:>13} {length:>13} {tick * 1e6:>9.1f} {pairs * 1e6:>13.1f} {deaths:>12.2f}")
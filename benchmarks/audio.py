@@ -0,0 +1,57 @@
+"""Measures the sound effects' path through Audio: loading, the cost of play() muted and unmuted, and a burst of turns.
+
+The burst plays a turn sound every BURST_GAP seconds (as a bot at a high tick rate would) with a death sound in the
+middle, and reports how many turns were coalesced and whether the death sound got a channel. Time is simulated for the
+burst, so the counts do not depend on the machine. Needs the game's res/ directory; runs with SDL's dummy audio driver.
+Run from the repository root: python benchmarks/audio.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from Audio import Audio
+
+PLAYS = 20000
+BURST = 200
+BURST_GAP = 0.005
+
+
+def time_plays(audio):
+    """Returns the mean seconds per play() call, playing turn sounds as fast as possible."""
+    names = ('up', 'left', 'down', 'right')
+    start = time.perf_counter()
+    for index in range(PLAYS):
+        audio.play(names[index % 4])
+    return (time.perf_counter() - start) / PLAYS
+
+
+if __name__ == '__main__':
+    start = time.perf_counter()
+    audio = Audio()
+    audio.load()
+    print(f"mixer opened and {len(audio.sounds)} sounds decoded in {(time.perf_counter() - start) * 1e3:.1f} ms, "
+          f"buffer {Audio.BUFFER / Audio.FREQUENCY * 1e3:.1f} ms (SDL default 512 samples: {512 / Audio.FREQUENCY * 1e3:.1f} ms)")
+    for name, trimmed in audio.trimmed.items():
+        print(f"  {name:>6}: {trimmed:.1f} ms of leading silence cut")
+
+    print(f"play() muted:   {time_plays(Audio(muted=True)) * 1e6:.2f} us")
+    print(f"play() unmuted: {time_plays(audio) * 1e6:.2f} us")
+
+    clock = [0.0]
+    audio.clock = lambda: clock[0]
+    audio.last_played.clear()
+    audio.played = audio.coalesced = 0
+    death_channel = None
+    for index in range(BURST):
+        clock[0] = 1000 + index * BURST_GAP
+        audio.play(('up', 'left', 'down', 'right')[index % 4])
+        if index == BURST // 2:
+            audio.play('death')
+            death_channel = audio.channels['death'][0].get_sound() is audio.sounds['death']
+    print(f"burst of {BURST} turns {BURST_GAP * 1e3:.0f} ms apart: {audio.played} played, {audio.coalesced} coalesced, "
+          f"death sound {'played' if death_channel else 'DROPPED'}")
+    pygame.mixer.quit()
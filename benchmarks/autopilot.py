@@ -0,0 +1,48 @@
+"""Measures how long Autopilot.decide() takes per tick on each board size, by the length of the Snake.
+
+Each board plays one CLASSIC game with the autopilot for up to TICKS ticks.
+Run from the repository root: python benchmarks/autopilot.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Autopilot import Autopilot
+from BoardSize import BoardSize
+from SnakeEngine import SnakeEngine
+
+TICKS = 20000
+# Snake lengths, as fractions of the board, to report latencies for.
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def benchmark(size):
+    engine = SnakeEngine(size.rows, size.columns, seed=0)
+    autopilot = Autopilot(engine)
+    cells = size.rows * size.columns
+    latencies = {bucket: [] for bucket in BUCKETS}
+    for _ in range(TICKS):
+        bucket = next(bucket for bucket in BUCKETS if len(engine.body) <= bucket * cells)
+        start = time.perf_counter()
+        direction = autopilot.decide()
+        latencies[bucket].append(time.perf_counter() - start)
+        engine.step(direction)
+        if engine.fruit_cell is None:
+            break
+    return latencies, engine
+
+
+if __name__ == '__main__':
+    print(f"{'size':>8} {'length up to':>13} {'ticks':>7} {'mean us':>9} {'p99 us':>9} {'max ms':>8}")
+    for size in BoardSize:
+        latencies, engine = benchmark(size)
+        for bucket, samples in latencies.items():
+            if not samples:
+                continue
+            samples.sort()
+            length = int(bucket * size.rows * size.columns)
+            print(f"{size.name:>8} {length:>13} {len(samples):>7} {sum(samples) / len(samples) * 1e6:>9.1f} "
+                  f"{samples[int(len(samples) * 0.99)] * 1e6:>9.1f} {samples[-1] * 1e3:>8.2f}")
+        print(f"{size.name:>8} reached length {len(engine.body)}, score {engine.score}")
@@ -0,0 +1,94 @@
+"""Checks BatchEngine against SnakeEngine and measures how many board ticks per second each simulates.
+
+The check steps a batch and one SnakeEngine per board with the same random actions, copying every fruit and wall the
+batch places into the matching SnakeEngine (the two place them with different random generators), and compares the
+Snakes, scores, fruit, walls and Event flags of every board after every tick.
+
+Needs NumPy. Run from the repository root: python benchmarks/batch_engine.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from BatchEngine import BatchEngine
+from GameMode import PlayMode
+from SnakeEngine import SnakeEngine
+
+CHECK_BOARDS = 64
+CHECK_TICKS = 5000
+SIZES = (1, 64, 1024, 4096)
+TICKS = 500
+
+
+def place(engine, batch, board):
+    """Moves the fruit and dynamic walls of a SnakeEngine to where the batch placed them."""
+    fruit = int(batch.fruit[board])
+    engine.move_fruit(fruit if fruit >= 0 else None)
+    walls = {int(cell) for cell in np.flatnonzero(batch.walls[board])}
+    removed = engine.dynamic_walls - walls
+    for cell in removed:
+        engine.dynamic_walls.discard(cell)
+        engine.grid[cell] &= ~SnakeEngine.WALL
+        engine.release(cell)
+    if removed:
+        # Walls can only be added to a WallConnectivity, so the engine builds a new one when it next needs it.
+        engine.wall_connectivity = None
+    for cell in walls - engine.dynamic_walls:
+        engine.create_wall(cell)
+
+
+def check():
+    play_modes = [list(PlayMode)[board % len(PlayMode)] for board in range(CHECK_BOARDS)]
+    batch = BatchEngine(CHECK_BOARDS, play_mode=play_modes, seed=1)
+    engines = [SnakeEngine(play_mode=play_mode, seed=board) for board, play_mode in enumerate(play_modes)]
+    random = np.random.default_rng(2)
+    for tick in range(CHECK_TICKS):
+        # Mostly head for the fruit, so that Snakes grow, with some random turns.
+        head_rows, head_columns = np.divmod(batch.heads, batch.columns)
+        fruit_rows, fruit_columns = np.divmod(batch.fruit, batch.columns)
+        toward = np.where(fruit_rows != head_rows, np.where(fruit_rows < head_rows, 0, 1), np.where(fruit_columns < head_columns, 2, 3))
+        roll = random.random(CHECK_BOARDS)
+        actions = np.where(roll < 0.6, toward, np.where(roll < 0.7, random.integers(0, 4, CHECK_BOARDS), BatchEngine.NO_ACTION))
+        events = batch.step(actions)
+        for board, engine in enumerate(engines):
+            action = BatchEngine.DIRECTIONS[actions[board]] if actions[board] >= 0 else None
+            engine_events = engine.step(action)
+            place(engine, batch, board)
+            expected = (list(engine.body), engine.score, engine.high_score, engine.fruit_cell if engine.fruit_cell is not None else -1,
+                        int(engine_events))
+            actual = (batch.body(board), int(batch.score[board]), int(batch.high_score[board]), int(batch.fruit[board]), int(events[board]))
+            if expected != actual:
+                raise AssertionError(f"Board {board} ({play_modes[board].name}) differs after tick {tick + 1}:\n"
+                                     f"  SnakeEngine: {expected}\n  BatchEngine: {actual}")
+    print(f"{CHECK_BOARDS} boards matched SnakeEngine for {CHECK_TICKS} ticks "
+          f"(high scores up to {int(batch.high_score.max())}, longest Snake {int(batch.length.max())})")
+
+
+def benchmark_scalar(size):
+    engines = [SnakeEngine(seed=board) for board in range(size)]
+    random = np.random.default_rng(0)
+    actions = [[BatchEngine.DIRECTIONS[code] for code in random.integers(0, 4, size)] for _ in range(TICKS)]
+    start = time.perf_counter()
+    for tick_actions in actions:
+        for engine, action in zip(engines, tick_actions):
+            engine.step(action)
+    return size * TICKS / (time.perf_counter() - start)
+
+
+def benchmark_batch(size):
+    batch = BatchEngine(size, seed=0)
+    actions = np.random.default_rng(0).integers(0, 4, (TICKS, size))
+    start = time.perf_counter()
+    for tick_actions in actions:
+        batch.step(tick_actions)
+    return size * TICKS / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    check()
+    print(f"{'boards':>8} {'SnakeEngine ticks/s':>20} {'BatchEngine ticks/s':>20}")
+    for size in SIZES:
+        print(f"{size:>8} {benchmark_scalar(size):>20,.0f} {benchmark_batch(size):>20,.0f}")
@@ -0,0 +1,60 @@
+"""Reports construction time and resident memory of the engine and Board for each board size.
+
+The Board is built on the game's 544x480 screen, built again from the background cache, and built on a surface with
+2x2 pixel tiles. Each size is measured in a fresh interpreter so that its peak RSS is not shared with the others.
+Run from the repository root: python benchmarks/board_size.py
+"""
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SIZES = ((17, 15), (100, 100), (500, 500), (2000, 2000))
+
+
+def max_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+def measure(columns, rows):
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    from Board import Board
+    from SnakeEngine import SnakeEngine
+    pygame.display.init()
+    baseline = max_rss_mb()
+
+    start = time.perf_counter()
+    SnakeEngine(rows, columns)
+    engine_time = time.perf_counter() - start
+    engine_rss = max_rss_mb()
+
+    start = time.perf_counter()
+    Board(columns, rows, pygame.Rect(0, 0, 544, 480))
+    board_time = time.perf_counter() - start
+    board_rss = max_rss_mb()
+
+    start = time.perf_counter()
+    Board(columns, rows, pygame.Rect(0, 0, 544, 480))
+    cached_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    Board(columns, rows, pygame.Rect(0, 0, columns * 2, rows * 2))
+    pixel_time = time.perf_counter() - start
+    print(f"{f'{columns}x{rows}':<14} {engine_time * 1e3:>12.1f} {engine_rss - baseline:>12.1f} {board_time * 1e3:>12.1f} "
+          f"{board_rss - engine_rss:>12.1f} {cached_time * 1e3:>12.3f} {pixel_time * 1e3:>12.1f}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        measure(int(sys.argv[1]), int(sys.argv[2]))
+    else:
+        print(f"{'size':<14} {'engine ms':>12} {'engine MB':>12} {'board ms':>12} {'board MB':>12} {'cached ms':>12} {'2px tiles ms':>12}")
+        for columns, rows in SIZES:
+            subprocess.run([sys.executable, os.path.abspath(__file__), str(columns), str(rows)], check=True)
@@ -0,0 +1,71 @@
+"""Measures frame cost through the Camera as the board grows, to show that it does not depend on the board's size.
+
+On each board a Snake of LENGTH segments circles a square around the board's center, with walls spread over the whole
+board. Reports the mean incremental frame and the mean full redraw of the screen (as after the camera recenters).
+Needs the game's res/ directory; runs with SDL's dummy video driver.
+Run from the repository root: python benchmarks/camera.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from GameMode import PlayMode
+from Renderer import Renderer
+from SnakeEngine import SnakeEngine
+
+SIZES = (100, 500, 1000, 2000)
+LENGTH = 200
+WALLS = 2000
+FRAMES = 500
+
+
+def square(engine, side):
+    """Returns the cells of a square loop of the given side around the board's center, clockwise, and the direction
+    taken from each."""
+    top, left = engine.rows // 2 - side // 2, engine.columns // 2 - side // 2
+    legs = ((0, 1), (1, 0), (0, -1), (-1, 0))
+    cells, directions = [], []
+    row, column = top, left
+    for direction in legs:
+        for _ in range(side - 1):
+            cells.append(engine.cell(row, column))
+            directions.append(direction)
+            row, column = row + direction[0], column + direction[1]
+    return cells, directions
+
+
+def benchmark(size):
+    engine = SnakeEngine(size, size, PlayMode.ZEN, seed=0)
+    cells, directions = square(engine, LENGTH // 4 + 2)
+    engine.set_body(cells[LENGTH - 1::-1])
+    engine.move_fruit(None)
+    for _ in range(WALLS):
+        engine.create_random_wall()
+    renderer = Renderer(engine, pygame.display.get_surface(), pygame.font.Font(None, 24))
+    pygame.display.update(renderer.draw())
+
+    start = time.perf_counter()
+    for tick in range(FRAMES):
+        renderer.update(engine.step(directions[(LENGTH - 1 + tick) % len(directions)]))
+        pygame.display.update(renderer.draw())
+    incremental = (time.perf_counter() - start) / FRAMES
+
+    start = time.perf_counter()
+    for _ in range(FRAMES // 10):
+        renderer.full_redraw = True
+        pygame.display.update(renderer.draw())
+    full = (time.perf_counter() - start) / (FRAMES // 10)
+    return incremental, full
+
+
+if __name__ == '__main__':
+    pygame.init()
+    pygame.display.set_mode((544, 480))
+    print(f"{'board':>10} {'frame us':>10} {'full redraw us':>15}")
+    for size in SIZES:
+        incremental, full = benchmark(size)
+        print(f"{f'{size}x{size}':>10} {incremental * 1e6:>10.1f} {full * 1e6:>15.1f}")
@@ -0,0 +1,54 @@
+"""Measures Export's frames per second by output format and number of worker processes.
+
+Records a game of TICKS ticks steered by the autopilot, then exports it to a temporary directory once per format and
+process count (1, 2 and one per core). Needs the game's res/ directory; runs with SDL's dummy video driver.
+Run from the repository root: python benchmarks/export.py
+"""
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from Autopilot import Autopilot
+from Export import export
+from Replay import Replay
+from SnakeEngine import SnakeEngine
+
+TICKS = 1000
+FORMATS = ('rgb', 'bmp', 'png')
+
+
+def record():
+    """Returns a Replay of an autopilot game of TICKS ticks."""
+    engine = SnakeEngine(seed=0)
+    replay = Replay.record(engine)
+    autopilot = Autopilot(engine)
+    while engine.ticks < TICKS:
+        direction = autopilot.decide()
+        if direction is not None:
+            replay.add(engine.ticks, direction)
+            Replay.apply(engine, direction)
+        engine.tick()
+        replay.record_tick(engine)
+    replay.ticks = engine.ticks
+    return replay
+
+
+if __name__ == '__main__':
+    replay = record()
+    # Always include a pool of two, so the multi-process path runs even on a single core.
+    process_counts = sorted({1, 2, multiprocessing.cpu_count()})
+    print(f"{'format':>7} {'processes':>10} {'frames/s':>9} {'seconds':>8}")
+    for file_format in FORMATS:
+        for processes in process_counts:
+            directory = tempfile.mkdtemp()
+            try:
+                path = os.path.join(directory, 'game.rgb') if file_format == 'rgb' else directory
+                frames, elapsed = export(replay, path, file_format, processes=processes)
+            finally:
+                shutil.rmtree(directory)
+            print(f"{file_format:>7} {processes:>10} {frames / elapsed:>9.0f} {elapsed:>8.2f}")
@@ -0,0 +1,48 @@
+"""Measures the cost of the score HUD per frame: rendering and centering the text every frame as the game loop used to,
+against the cached Hud, both while the score stays the same and while it changes every frame.
+
+Runs with SDL's dummy video driver and pygame's default font.
+Run from the repository root: python benchmarks/hud.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from Board import Board
+from Hud import Hud
+
+FRAMES = 20000
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+
+
+def uncached(font, board, scores):
+    start = time.perf_counter()
+    for score in scores:
+        for text, color, row in ((str(score), BLACK, 1), ('120', WHITE, 2)):
+            surface = font.render(text, True, color)
+            surface.get_rect(center=board.get_tile(row, board.columns // 2).rect.center)
+    return (time.perf_counter() - start) / len(scores)
+
+
+def cached(font, board, scores):
+    hud = Hud(font)
+    centers = [board.get_tile(row, board.columns // 2).rect.center for row in (1, 2)]
+    start = time.perf_counter()
+    for score in scores:
+        hud.set_lines([(str(score), BLACK, centers[0]), ('120', WHITE, centers[1])])
+    return (time.perf_counter() - start) / len(scores)
+
+
+if __name__ == '__main__':
+    pygame.init()
+    screen = pygame.display.set_mode((544, 480))
+    font = pygame.font.Font(None, 24)
+    board = Board(17, 15, screen.get_rect())
+    print(f"{'score':>10} {'uncached us':>12} {'cached us':>10}")
+    for name, scores in (('unchanged', [42] * FRAMES), ('changing', list(range(FRAMES)))):
+        print(f"{name:>10} {uncached(font, board, scores) * 1e6:>12.2f} {cached(font, board, scores) * 1e6:>10.2f}")
@@ -0,0 +1,102 @@
+"""Simulates key presses against the InputQueue at several tick rates, reporting key-to-turn latency and lost turns.
+
+Presses come at random times, a quarter of them as a quick pair of perpendicular turns BURST_GAP apart (as when
+cornering around a block). Each press is applied both through the queue and as the game used to, turning the Snake the
+moment the key is pressed. "lost" counts the presses that were overwritten or refused before a tick moved the Snake in
+them, and "reversals" the ticks that would have moved the Snake back into its own neck. Time is simulated, so the
+results do not depend on the machine.
+Run from the repository root: python benchmarks/input_latency.py
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from GameMode import PlayMode
+from InputQueue import InputQueue
+from SnakeEngine import SnakeEngine
+
+TICK_RATES = (5, 10, 20, 60)
+PRESSES = 5000
+MEAN_GAP = 0.3
+BURST_GAP = 0.02
+
+
+def presses(seed):
+    """Returns (time, press index in a pair) of random key presses, sorted by time."""
+    rng = random.Random(seed)
+    times = []
+    now = 0.0
+    while len(times) < PRESSES:
+        now += rng.expovariate(1 / MEAN_GAP)
+        times.append((now, 0))
+        if rng.random() < 0.25:
+            times.append((now + BURST_GAP, 1))
+    return times
+
+
+def perpendicular(direction, rng):
+    """Returns a turn a player would press: one across the direction the Snake is moving in."""
+    if direction in SnakeEngine.AXIS_VERTICAL:
+        return rng.choice(SnakeEngine.AXIS_HORIZONTAL)
+    return rng.choice(SnakeEngine.AXIS_VERTICAL)
+
+
+def center(engine, direction):
+    """Puts the Snake in the middle of the board, its body behind it, so that it never reaches an edge."""
+    row, column = engine.rows // 2, engine.columns // 2
+    engine.set_body([engine.cell(row - index * direction[0], column - index * direction[1]) for index in range(3)])
+
+
+def simulate(tick_rate, queued):
+    """Returns the InputQueue used, the number of presses that never moved the Snake and the number of reversals."""
+    rng = random.Random(tick_rate)
+    clock = [0.0]
+    inputs = InputQueue(clock=lambda: clock[0])
+    engine = SnakeEngine(15, 17, PlayMode.CLASSIC, seed=0)
+    engine.move_fruit(None)
+    engine.direction = SnakeEngine.DIRECTION_RIGHT
+    moved = engine.direction
+    pending = []
+    pressed = None
+    lost = reversals = 0
+    tick = 1
+    for time, second in presses(tick_rate):
+        while tick / tick_rate <= time:
+            clock[0] = tick / tick_rate
+            if queued:
+                inputs.apply(engine.turn, tick_rate)
+            else:
+                # Only the last turn pressed since the last tick takes effect.
+                lost += max(0, len(pending) - 1)
+                pending.clear()
+            if engine.direction == (-moved[0], -moved[1]):
+                reversals += 1
+            # Only the Snake's direction matters here: keep its body behind it and away from the edges.
+            moved = engine.direction
+            center(engine, moved)
+            engine.tick()
+            tick += 1
+        clock[0] = time
+        # The second press of a pair turns across the first one, the way the player expects to be heading.
+        direction = pressed = perpendicular(pressed if second else engine.direction, rng)
+        if queued:
+            inputs.push(direction)
+        elif engine.turn(direction):
+            pending.append(direction)
+    if queued:
+        lost = inputs.dropped
+    return inputs, lost, reversals
+
+
+if __name__ == '__main__':
+    print(f"{'':>8} {'queued':^45} {'immediate':^21}")
+    print(f"{'ticks/s':>8} {'p50 ms':>7} {'p95 ms':>7} {'max ms':>7} {'lost':>10} {'reversals':>10} "
+          f"{'lost':>10} {'reversals':>10}")
+    for tick_rate in TICK_RATES:
+        inputs, lost, reversals = simulate(tick_rate, True)
+        _, lost_immediate, reversals_immediate = simulate(tick_rate, False)
+        histogram = inputs.latencies[tick_rate]
+        print(f"{tick_rate:>8} {histogram.percentile(0.5) * 1e3:>7.0f} {histogram.percentile(0.95) * 1e3:>7.0f} "
+              f"{histogram.max * 1e3:>7.0f} {lost:>10} {reversals:>10} {lost_immediate:>10} {reversals_immediate:>10}")
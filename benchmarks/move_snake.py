@@ -0,0 +1,44 @@
+"""Measures the cost of SnakeEngine.tick() as the Snake grows.
+
+The Snake follows a Hamiltonian cycle so that it never dies, however long it is.
+Run from the repository root: python benchmarks/move_snake.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Autopilot import hamiltonian_cycle
+from SnakeEngine import SnakeEngine
+
+ROWS = 128
+COLUMNS = 128
+LENGTHS = (10, 100, 1000, 10000, 16000)
+TICKS = 20000
+
+
+def benchmark(length):
+    # The extra column is left off the cycle so the fruit is never eaten.
+    engine = SnakeEngine(ROWS, COLUMNS + 1)
+    engine.move_fruit(engine.cell(0, COLUMNS))
+    cycle = [engine.cell(*position) for position in hamiltonian_cycle(ROWS, COLUMNS)]
+    directions = []
+    for index, (row, column) in enumerate(hamiltonian_cycle(ROWS, COLUMNS)):
+        next_row, next_column = engine.position(cycle[(index + 1) % len(cycle)])
+        directions.append((next_row - row, next_column - column))
+
+    head = length - 1
+    engine.set_body(cycle[head - index] for index in range(length))
+    start = time.perf_counter()
+    for tick in range(TICKS):
+        events = engine.step(directions[(head + tick) % len(cycle)])
+    elapsed = time.perf_counter() - start
+    assert len(engine.body) == length and events, "the Snake died or grew during the benchmark"
+    return elapsed / TICKS
+
+
+if __name__ == '__main__':
+    print(f"{'length':>8} {'us/tick':>10}")
+    for length in LENGTHS:
+        print(f"{length:>8} {benchmark(length) * 1e6:>10.3f}")
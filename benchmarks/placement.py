@@ -0,0 +1,42 @@
+"""Measures fruit and wall placement cost as the board fills up.
+
+Walls are placed (anywhere, without keeping the board connected) until the board is the given fraction full, then
+fruit is respawned repeatedly. See walls.py for connected walls.
+Run from the repository root: python benchmarks/placement.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from SnakeEngine import SnakeEngine
+
+ROWS = 300
+COLUMNS = 300
+FILLS = (0.1, 0.5, 0.9, 0.99, 0.999)
+SPAWNS = 20000
+
+
+def benchmark(fill):
+    engine = SnakeEngine(ROWS, COLUMNS, seed=0)
+    cells = ROWS * COLUMNS
+    start = time.perf_counter()
+    walls = 0
+    while len(engine.free_cells) > cells * (1 - fill):
+        engine.create_random_wall(static=True, connected=False)
+        walls += 1
+    wall_time = (time.perf_counter() - start) / walls
+
+    start = time.perf_counter()
+    for _ in range(SPAWNS):
+        engine.move_fruit(engine.free_cells.sample(engine.random))
+    fruit_time = (time.perf_counter() - start) / SPAWNS
+    return wall_time, fruit_time
+
+
+if __name__ == '__main__':
+    print(f"{'fill':>8} {'us/wall':>10} {'us/fruit':>10}")
+    for fill in FILLS:
+        wall_time, fruit_time = benchmark(fill)
+        print(f"{fill:>8.3f} {wall_time * 1e6:>10.3f} {fruit_time * 1e6:>10.3f}")
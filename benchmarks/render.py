@@ -0,0 +1,51 @@
+"""Measures the cost of a frame with the incremental renderer and with a full redraw as the Snake grows.
+
+Needs the game's res/ directory; runs with SDL's dummy video driver.
+Run from the repository root: python benchmarks/render.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from Autopilot import hamiltonian_cycle
+from Renderer import Renderer
+from SnakeEngine import SnakeEngine
+
+ROWS = 60
+COLUMNS = 68
+LENGTHS = (10, 100, 1000, 3000)
+FRAMES = 300
+
+
+def benchmark(length, incremental):
+    engine = SnakeEngine(ROWS, COLUMNS + 1)
+    engine.move_fruit(engine.cell(0, COLUMNS))
+    positions = hamiltonian_cycle(ROWS, COLUMNS)
+    cycle = [engine.cell(*position) for position in positions]
+    directions = [(next_row - row, next_column - column)
+                  for (row, column), (next_row, next_column) in zip(positions, positions[1:] + positions[:1])]
+    head = length - 1
+    engine.set_body(cycle[head - index] for index in range(length))
+
+    screen = pygame.display.get_surface()
+    renderer = Renderer(engine, screen, pygame.font.Font(None, 24))
+    renderer.draw()
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        renderer.update(engine.step(directions[(head + frame) % len(cycle)]))
+        if not incremental:
+            renderer.invalidate()
+        pygame.display.update(renderer.draw())
+    return (time.perf_counter() - start) / FRAMES
+
+
+if __name__ == '__main__':
+    pygame.init()
+    pygame.display.set_mode((544, 480))
+    print(f"{'length':>8} {'incremental ms':>16} {'full ms':>10}")
+    for length in LENGTHS:
+        print(f"{length:>8} {benchmark(length, True) * 1e3:>16.3f} {benchmark(length, False) * 1e3:>10.3f}")
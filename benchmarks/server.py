@@ -0,0 +1,79 @@
+"""Runs an ArenaServer with hundreds of loopback clients in one process and reports what ticking and broadcasting cost.
+
+Every client steers a Snake with random turns and reads every delta. MIRRORS of them also apply the deltas to their
+mirror of the Arena, which is compared with the server's once the server stops. Clients share the process (and CPU)
+with the server, so the busy time per tick is an upper bound on the server's own work.
+Run from the repository root: python benchmarks/server.py
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Arena import Arena
+from ArenaClient import ArenaClient
+from ArenaServer import ArenaServer
+
+BOARD = 200
+CLIENTS = (50, 200, 500)
+MIRRORS = 5
+TICK_RATE = 20
+SECONDS = 5
+
+
+async def play(client, host, port, mirror, seed):
+    """Connects and reads deltas until the server closes, turning now and then. Returns the bytes received."""
+    await client.connect(host, port)
+    rng = random.Random(seed)
+    received = 0
+    while True:
+        delta = await client.read_delta()
+        if delta is None:
+            return received
+        received += len(delta)
+        if mirror:
+            client.arena.apply_delta(delta)
+        if client.snake is not None and rng.random() < 0.2:
+            client.turn(rng.choice(Arena.DIRECTIONS))
+
+
+def matches(arena, mirror):
+    return (arena.owners == mirror.owners and arena.grid == mirror.grid and arena.fruits == mirror.fruits
+            and all(list(snake.body) == list(copy.body) and snake.score == copy.score
+                    for snake, copy in zip(arena.snakes, mirror.snakes)))
+
+
+async def benchmark(clients):
+    arena = Arena(BOARD, BOARD, clients, seed=0)
+    server = ArenaServer(arena, TICK_RATE)
+    port = await server.start()
+    players = [ArenaClient() for _ in range(clients)]
+    tasks = [asyncio.create_task(play(player, '127.0.0.1', port, index < MIRRORS, index))
+             for index, player in enumerate(players)]
+    # Let every client join and build its mirror before timing the ticks.
+    while not all(player.connected for player in players):
+        await asyncio.sleep(0.01)
+    state = len(arena.encode_state())
+    start = time.perf_counter()
+    await server.run(ticks=SECONDS * TICK_RATE)
+    elapsed = time.perf_counter() - start
+    for client in list(server.clients):
+        server.disconnect(client)
+    server.stop()
+    received = await asyncio.gather(*tasks)
+    ticks = SECONDS * TICK_RATE
+    synced = sum(matches(arena, player.arena) for player in players[:MIRRORS])
+    return (server.busy_time / ticks, ticks / elapsed, sum(received) / clients / ticks, state, server.late_ticks,
+            synced)
+
+
+if __name__ == '__main__':
+    print(f"{'clients':>8} {'busy us/tick':>13} {'ticks/s':>8} {'delta bytes':>12} {'state bytes':>12} "
+          f"{'late':>5} {'mirrors synced':>15}")
+    for clients in CLIENTS:
+        busy, rate, delta, state, late, synced = asyncio.run(benchmark(clients))
+        print(f"{clients:>8} {busy * 1e6:>13.1f} {rate:>8.1f} {delta:>12.1f} {state:>12} {late:>5} "
+              f"{f'{synced}/{MIRRORS}':>15}")
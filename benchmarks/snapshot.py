@@ -0,0 +1,41 @@
+"""Measures SnakeEngine.clone(), snapshot() and restore() on each board size, against copy.deepcopy().
+
+The Snake fills half of the board, laid along a Hamiltonian cycle. A last row measures an empty 2000x2000 board, where
+the cost is in the free cells that restore() rebuilds.
+Run from the repository root: python benchmarks/snapshot.py
+"""
+import copy
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Autopilot import hamiltonian_cycle
+from BoardSize import BoardSize
+from SnakeEngine import SnakeEngine
+
+REPEATS = 200
+HUGE = 2000
+
+
+def measure(function, repeats=REPEATS):
+    return min(timeit.repeat(function, number=repeats, repeat=3)) / repeats
+
+
+def report(name, engine, repeats=REPEATS):
+    data = engine.snapshot()
+    print(f"{name:>10} {len(data):>8} {measure(engine.clone, repeats) * 1e6:>10.1f} "
+          f"{measure(engine.snapshot, repeats) * 1e6:>12.1f} {measure(lambda: engine.restore(data), repeats) * 1e6:>11.1f} "
+          f"{measure(lambda: copy.deepcopy(engine), repeats) * 1e6:>12.1f}")
+
+
+if __name__ == '__main__':
+    print(f"{'size':>10} {'bytes':>8} {'clone us':>10} {'snapshot us':>12} {'restore us':>11} {'deepcopy us':>12}")
+    for size in BoardSize:
+        engine = SnakeEngine(size.rows, size.columns, seed=0)
+        cycle = [engine.cell(*position) for position in hamiltonian_cycle(size.rows - size.rows % 2, size.columns)]
+        engine.set_body(cycle[len(cycle) // 2::-1])
+        engine.move_fruit(engine.free_cells.sample(engine.random))
+        report(size.name, engine)
+    report(f'{HUGE}x{HUGE}', SnakeEngine(HUGE, HUGE, seed=0), repeats=2)
@@ -0,0 +1,55 @@
+"""Measures time to first frame: from starting Python to the first frame of a new game on the screen.
+
+Each run is a fresh process, so that importing pygame and the game's modules is counted. Reports the median of the
+runs for importing, constructing SnakeGame, drawing and presenting the first frame, and for the loading thread to
+finish loading the sounds and option menu images.
+
+Needs the game's res/ directory; runs with SDL's dummy video driver.
+Run from the repository root: python benchmarks/startup.py [runs]
+"""
+import time
+
+START = time.perf_counter()
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PHASES = ('import', 'init', 'first_frame', 'assets_loaded')
+
+
+def child():
+    """Starts a game, draws its first frame and prints the time each phase ended at, in seconds, as JSON."""
+    sys.path.insert(0, ROOT)
+    times = {}
+    import pygame
+    from SnakeGame import SnakeGame
+    times['import'] = time.perf_counter() - START
+    game = SnakeGame()
+    times['init'] = time.perf_counter() - START
+    pygame.display.update(game.renderer.draw())
+    times['first_frame'] = time.perf_counter() - START
+    game.loader.join()
+    times['assets_loaded'] = time.perf_counter() - START
+    print(json.dumps(times))
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] == ['--child']:
+        child()
+        raise SystemExit
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    environment = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT='1')
+    environment.setdefault('SDL_VIDEODRIVER', 'dummy')
+    environment.setdefault('SDL_AUDIODRIVER', 'dummy')
+    samples = {phase: [] for phase in PHASES}
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, __file__, '--child'], env=environment, capture_output=True, text=True, check=True).stdout
+        for phase, seconds in json.loads(output.splitlines()[-1]).items():
+            samples[phase].append(seconds)
+    print(f"{'phase':>14} {'median ms':>10} {'min ms':>8}")
+    for phase in PHASES:
+        print(f"{phase:>14} {statistics.median(samples[phase]) * 1e3:>10.1f} {min(samples[phase]) * 1e3:>8.1f}")
@@ -0,0 +1,287 @@
+"""Benchmarks the game's hot paths over board sizes, Snake lengths and play modes, with stored baselines.
+
+Cases:
+    board_tile      building a Board and its checkerboard surface
+    board_cached    building a Board whose checkerboard surface is already in Board.BACKGROUNDS
+    engine_tick     one SnakeEngine tick, the Snake moving along a Hamiltonian cycle
+    draw_snake      drawing the whole Snake
+    fruit_set_type  changing the Fruit sprite's type
+    fruit_place     moving the fruit to a random free cell
+    random_wall     creating a wall on a random free cell (each on a fresh copy of the engine, copied untimed)
+    frame           a frame of the game loop: tick, incremental draw and display update
+    frame_full      the same frame, redrawing the whole screen
+
+Each case reports the best time per call over several repeats; the Snake and fruit are laid out from fixed seeds.
+Needs the game's res/ directory; runs with SDL's dummy video driver.
+
+Run from the repository root:
+    python benchmarks/suite.py                              print results as JSON
+    python benchmarks/suite.py --save-baseline              also store them as the baseline
+    python benchmarks/suite.py --check --threshold 0.25     fail if a case is more than 25% slower than the baseline
+
+--check also fails if an incremental frame grows with the Snake's length (see check_scaling()).
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from Autopilot import board_cycle
+from Board import Board
+from BoardSize import BoardSize
+from Fruit import Fruit
+from FruitType import FruitType
+from GameMode import PlayMode
+from Renderer import Renderer
+from Snake import Snake
+from SnakeEngine import SnakeEngine
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+SCREEN_SIZE = (544, 480)
+LENGTHS = (10, 100, 1000)
+REPEATS = 3
+# Cases whose function times the part of each call that counts itself and returns it (see measure_inside()).
+SELF_TIMED = {'random_wall'}
+# An incremental frame should cost the same however long the Snake is. Each is compared with the same frame with the
+# next shorter Snake (a tenth as long): this leaves room for noise, but not for a cost that grows with the length, like
+# repainting every segment of a CHEESE Snake.
+SCALING_LIMIT = 4
+
+
+def snake_on_cycle(size, length, play_mode):
+    """Returns an engine with a Snake of the given length on a Hamiltonian cycle and no fruit, and the directions
+    that keep it on the cycle, indexed by tick."""
+    engine = SnakeEngine(size.rows, size.columns, play_mode, seed=0)
+    positions = board_cycle(size.rows, size.columns)
+    cycle = [engine.cell(*position) for position in positions]
+    directions = [(next_row - row, next_column - column)
+                  for (row, column), (next_row, next_column) in zip(positions, positions[1:] + positions[:1])]
+    engine.set_body(cycle[length - 1 - index] for index in range(length))
+    engine.move_fruit(None)
+    head = length - 1
+    return engine, [directions[(head + tick) % len(cycle)] for tick in range(len(cycle))]
+
+
+def stepper(engine, directions):
+    """Returns a function advancing the engine one tick along the cycle, returning the Event flags."""
+    ticks = iter(range(1 << 62))
+
+    def step():
+        return engine.step(directions[next(ticks) % len(directions)])
+    return step
+
+
+def board_tile(size):
+    rect = pygame.display.get_surface().get_rect()
+
+    def build():
+        # Start from an empty cache, so that every call draws the checkerboard.
+        Board.BACKGROUNDS.clear()
+        return Board(size.columns, size.rows, rect)
+    return build
+
+
+def board_cached(size):
+    rect = pygame.display.get_surface().get_rect()
+    Board(size.columns, size.rows, rect)
+    return lambda: Board(size.columns, size.rows, rect)
+
+
+def engine_tick(size, length, play_mode):
+    return stepper(*snake_on_cycle(size, length, play_mode))
+
+
+def draw_snake(size, length, play_mode):
+    engine, _ = snake_on_cycle(size, length, play_mode)
+    screen = pygame.display.get_surface()
+    snake = Snake(Board(size.columns, size.rows, screen.get_rect()), engine)
+    return lambda: snake.draw_snake(screen)
+
+
+def fruit_set_type(size):
+    board = Board(size.columns, size.rows, pygame.display.get_surface().get_rect())
+    fruit = Fruit(FruitType.APPLE, board, 0, 0)
+    types = iter(range(1 << 62))
+    kinds = list(FruitType)
+    return lambda: fruit.set_type(kinds[next(types) % len(kinds)])
+
+
+def fruit_place(size, length):
+    engine, _ = snake_on_cycle(size, length, PlayMode.CLASSIC)
+    return lambda: engine.move_fruit(engine.free_cells.sample(engine.random))
+
+
+def random_wall(size, length):
+    engine, _ = snake_on_cycle(size, length, PlayMode.WALL)
+    # Built once here, so that the copies only copy it.
+    engine.connectivity()
+
+    def create_on_clone():
+        # Every call creates the wall on a fresh copy, so that it sees the same board and random state. Only creating
+        # the wall is timed: the cost of copying grows with the board and the Snake.
+        clone = engine.clone()
+        start = time.perf_counter()
+        cell = clone.create_random_wall()
+        elapsed = time.perf_counter() - start
+        if cell is None:
+            raise RuntimeError("No room for a wall")
+        return elapsed
+    return create_on_clone
+
+
+def frame(size, length, play_mode, full=False):
+    engine, directions = snake_on_cycle(size, length, play_mode)
+    renderer = Renderer(engine, pygame.display.get_surface(), pygame.font.Font(None, 24))
+    step = stepper(engine, directions)
+    pygame.display.update(renderer.draw())
+
+    def run_frame():
+        renderer.update(step())
+        if full:
+            renderer.invalidate()
+        pygame.display.update(renderer.draw())
+    return run_frame
+
+
+def cases():
+    """Yields (name, parameters, setup) for every case, where setup() returns the function to time."""
+    for size in BoardSize:
+        yield 'board_tile', {'size': size.name}, lambda size=size: board_tile(size)
+        yield 'board_cached', {'size': size.name}, lambda size=size: board_cached(size)
+        yield 'fruit_set_type', {'size': size.name}, lambda size=size: fruit_set_type(size)
+        for length in LENGTHS:
+            if length >= size.rows * size.columns // 2:
+                continue
+            yield 'fruit_place', {'size': size.name, 'length': length}, lambda size=size, length=length: fruit_place(size, length)
+            yield 'random_wall', {'size': size.name, 'length': length}, lambda size=size, length=length: random_wall(size, length)
+            for play_mode in PlayMode:
+                parameters = {'size': size.name, 'length': length, 'mode': play_mode.name}
+                arguments = (size, length, play_mode)
+                yield 'engine_tick', parameters, lambda arguments=arguments: engine_tick(*arguments)
+                yield 'draw_snake', parameters, lambda arguments=arguments: draw_snake(*arguments)
+                yield 'frame', parameters, lambda arguments=arguments: frame(*arguments)
+                yield 'frame_full', parameters, lambda arguments=arguments: frame(*arguments, full=True)
+
+
+def case_key(name, parameters):
+    return name + '[' + ','.join(f'{key}={value}' for key, value in parameters.items()) + ']'
+
+
+def measure(function):
+    """Returns the best time per call of function, in seconds, over repeats of at least 0.2 seconds each."""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=REPEATS, number=number)) / number
+
+
+def measure_inside(function):
+    """Returns the best time per call that function reports, in seconds, over repeats of at least 0.2 seconds of it."""
+    times = []
+    for _ in range(REPEATS):
+        elapsed = calls = 0
+        while elapsed < 0.2:
+            elapsed += function()
+            calls += 1
+        times.append(elapsed / calls)
+    return min(times)
+
+
+def run(filter_text=None):
+    results = {}
+    for name, parameters, setup in cases():
+        key = case_key(name, parameters)
+        if filter_text and filter_text not in key:
+            continue
+        results[key] = (measure_inside if name in SELF_TIMED else measure)(setup())
+        print(f"{key:<60} {results[key] * 1e6:>12.2f} us", file=sys.stderr)
+    return results
+
+
+def check(results, baseline, threshold):
+    """Prints how each case compares with the baseline. Returns the keys of the cases slower than the threshold."""
+    regressions = []
+    for key, seconds in results.items():
+        if key not in baseline:
+            continue
+        change = seconds / baseline[key] - 1
+        flag = ''
+        if change > threshold:
+            regressions.append(key)
+            flag = '  REGRESSION'
+        print(f"{key:<60} {baseline[key] * 1e6:>12.2f} -> {seconds * 1e6:>12.2f} us ({change:+.1%}){flag}", file=sys.stderr)
+    return regressions
+
+
+def check_scaling(results):
+    """Prints frame cases that take more than SCALING_LIMIT times as long as with the next shorter Snake, and returns
+    their keys."""
+    regressions = []
+    for size in BoardSize:
+        for play_mode in PlayMode:
+            shorter = None
+            for length in LENGTHS:
+                key = case_key('frame', {'size': size.name, 'length': length, 'mode': play_mode.name})
+                if key not in results:
+                    continue
+                if shorter is not None and results[key] > results[shorter] * SCALING_LIMIT:
+                    regressions.append(key)
+                    print(f"{key:<60} {results[key] / results[shorter]:.1f}x {shorter}  GROWS WITH LENGTH", file=sys.stderr)
+                shorter = key
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the game's hot paths.")
+    parser.add_argument('--filter', help="only run cases whose name contains this text, e.g. engine_tick or size=LARGE")
+    parser.add_argument('--output', metavar='PATH', help="write the results to PATH as JSON (default: stdout)")
+    parser.add_argument('--baseline', metavar='PATH', default=BASELINE, help="baseline file (default: benchmarks/baseline.json)")
+    parser.add_argument('--save-baseline', action='store_true', help="store the results as the baseline, merging with stored cases")
+    parser.add_argument('--check', action='store_true', help="compare with the baseline and exit with status 1 on a regression")
+    parser.add_argument('--threshold', type=float, default=0.25, help="slowdown counted as a regression (default: 0.25, i.e. 25%%)")
+    args = parser.parse_args()
+    if args.check and not os.path.exists(args.baseline):
+        parser.error(f"no baseline at {args.baseline}; run --save-baseline first")
+
+    pygame.init()
+    pygame.display.set_mode(SCREEN_SIZE)
+    results = run(args.filter)
+    report = {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'platform': platform.platform(),
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    regressions = []
+    if args.check:
+        with open(args.baseline) as file:
+            regressions = check(results, json.load(file)['results'], args.threshold)
+        regressions += check_scaling(results)
+        print(f"{len(regressions)} regressions", file=sys.stderr)
+    if args.save_baseline:
+        stored = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                stored = json.load(file)['results']
+        stored.update(results)
+        with open(args.baseline, 'w') as file:
+            json.dump(dict(report, results=stored), file, indent=2)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
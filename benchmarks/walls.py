@@ -0,0 +1,74 @@
+"""Measures connected wall placement: random walls that never cut the board apart, as WALL mode places them.
+
+On each board, WALLS walls are placed with create_random_wall() and timed, then one flood fill checks that every cell
+without a wall is still reachable. For comparison, a few placements are checked the naive way, with a flood fill of
+the whole board per candidate cell. Last, a WallLayout is generated, then fetched again from the cache.
+Run from the repository root: python benchmarks/walls.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from SnakeEngine import SnakeEngine
+from WallLayout import WallLayout
+
+BOARDS = ((100, 100, 2000), (300, 300, 10000), (1000, 1000, 50000))
+FLOOD_FILLS = 20
+
+
+def reachable(engine, walls):
+    """Returns the number of cells without a wall that are reachable from the Snake's head, by flood fill."""
+    columns, rows = engine.columns, engine.rows
+    seen = {engine.head}
+    stack = [engine.head]
+    while stack:
+        cell = stack.pop()
+        row, column = divmod(cell, columns)
+        for neighbour, inside in ((cell - columns, row > 0), (cell + columns, row < rows - 1),
+                                  (cell - 1, column > 0), (cell + 1, column < columns - 1)):
+            if inside and neighbour not in walls and neighbour not in seen:
+                seen.add(neighbour)
+                stack.append(neighbour)
+    return len(seen)
+
+
+def benchmark(rows, columns, count):
+    engine = SnakeEngine(rows, columns, seed=0)
+    start = time.perf_counter()
+    engine.connectivity()
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    placed = sum(engine.create_random_wall() is not None for _ in range(count))
+    wall_time = (time.perf_counter() - start) / count
+
+    walls = engine.static_walls | engine.dynamic_walls
+    connected = reachable(engine, walls) == rows * columns - len(walls)
+
+    # The naive check: wall a candidate cell and flood fill the board from the head.
+    start = time.perf_counter()
+    for _ in range(FLOOD_FILLS):
+        cell = engine.free_cells.sample(engine.random)
+        reachable(engine, walls | {cell})
+    flood_time = (time.perf_counter() - start) / FLOOD_FILLS
+    return placed, build_time, wall_time, flood_time, connected
+
+
+if __name__ == '__main__':
+    print(f"{'board':>10} {'walls':>7} {'placed':>7} {'build ms':>9} {'us/wall':>8} {'us/flood fill':>14} {'connected':>10}")
+    for rows, columns, count in BOARDS:
+        placed, build_time, wall_time, flood_time, connected = benchmark(rows, columns, count)
+        print(f"{f'{columns}x{rows}':>10} {count:>7} {placed:>7} {build_time * 1e3:>9.1f} {wall_time * 1e6:>8.2f} "
+              f"{flood_time * 1e6:>14.0f} {'yes' if connected else 'NO':>10}")
+
+    rows, columns, count = BOARDS[1]
+    start = time.perf_counter()
+    layout = WallLayout.generate(rows, columns, count)
+    generate_time = time.perf_counter() - start
+    start = time.perf_counter()
+    WallLayout.generate(rows, columns, count)
+    cached_time = time.perf_counter() - start
+    print(f"WallLayout of {len(layout.cells)} walls on {columns}x{rows}: generated in {generate_time * 1e3:.1f} ms, "
+          f"cached in {cached_time * 1e6:.1f} us")
@@ -1,3 +1,8 @@
+import argparse
+import os
+import time
+from Scheduler import Scheduler
+
 controls = """
 \033[32;1m
 CONTROLS
@@ -5,11 +10,133 @@ CONTROLS
 Arrow keys -> move snake
 F          -> change fruit
 G          -> change game mode
+S          -> change speed
+A          -> toggle autopilot
+P          -> toggle performance overlay
 \033[0m
 """
 
+parser = argparse.ArgumentParser(description="Play Snake.")
+parser.add_argument('--size', choices=('small', 'medium', 'large'), default='small', help="board size preset (default: small, 17x15)")
+parser.add_argument('--columns', type=int, help="number of board columns (overrides --size)")
+parser.add_argument('--rows', type=int, help="number of board rows (overrides --size)")
+parser.add_argument('--tile-size', type=int, help="draw tiles this many pixels wide and scroll the board with the snake "
+                                                 "(default: fit the board to the window, scrolling boards too big for it)")
+parser.add_argument('--speed', type=int, default=10, help="snake moves per second, from 1 to 1000 (default: 10)")
+parser.add_argument('--interpolate', action='store_true', help="slide the snake's head smoothly between tiles")
+parser.add_argument('--atlas', action='store_true', help="pack the game's images into a single atlas surface")
+parser.add_argument('--autopilot', action='store_true', help="start with the autopilot steering the snake")
+parser.add_argument('--overlay', action='store_true', help="start with the performance overlay shown")
+parser.add_argument('--profile', metavar='PATH', help="write the phase timings of every frame to PATH as CSV")
+parser.add_argument('--mute', action='store_true', help="play no sound, without opening the audio device")
+parser.add_argument('--input-latency', action='store_true', help="print histograms of the time from each arrow key "
+                                                                 "press to the move it turned when the window is closed")
+parser.add_argument('--arena', type=int, metavar='SNAKES', help="play against bots in an arena of SNAKES snakes; "
+                                                                "with --autopilot every snake is a bot")
+parser.add_argument('--serve', metavar='HOST:PORT', help="run an arena (of --arena snakes, default 16) without a window "
+                                                         "and let players join it over the network")
+parser.add_argument('--connect', metavar='HOST:PORT', help="join the arena served at HOST:PORT")
+parser.add_argument('--seed', type=int, help="seed for fruit and wall placement (default: random)")
+parser.add_argument('--walls', type=int, metavar='COUNT', help="add a layout of COUNT static walls that keeps the "
+                    "board connected and free of dead ends, generated from --seed (or seed 0)")
+parser.add_argument('--wall-layout', metavar='PATH', help="load the static walls from the layout saved at PATH; with "
+                    "--walls, generate and save it there first if there is none")
+parser.add_argument('--record', metavar='PATH', help="save a replay of the game to PATH when the window is closed")
+parser.add_argument('--save', metavar='PATH', help="save the game to PATH when the window is closed")
+parser.add_argument('--resume', metavar='PATH', help="resume the game saved at PATH")
+parser.add_argument('--replay', metavar='PATH', help="play back the replay saved at PATH instead of playing")
+parser.add_argument('--replay-speed', type=int, help="ticks per second to play the replay at; 0 simulates it headlessly "
+                                                    "as fast as possible (default: the recorded speed)")
+parser.add_argument('--seek', type=int, default=0, help="tick to start playing the replay from")
+args = parser.parse_args()
+if not Scheduler.MIN_TICK_RATE <= args.speed <= Scheduler.MAX_TICK_RATE:
+    parser.error(f"--speed must be from {Scheduler.MIN_TICK_RATE} to {Scheduler.MAX_TICK_RATE}, got {args.speed}")
+
+if args.serve:
+    import asyncio
+    from Arena import Arena
+    from ArenaServer import ArenaServer
+    from BoardSize import BoardSize
+    host, port = args.serve.rsplit(':', 1)
+    size = BoardSize[args.size.upper()]
+    server = ArenaServer(Arena(args.rows or size.rows, args.columns or size.columns, args.arena or 16, seed=args.seed),
+                         tick_rate=args.speed)
+    print(f"Serving an arena of {len(server.arena.snakes)} snakes on {host}:{port}")
+    try:
+        asyncio.run(server.serve(host, int(port)))
+    except KeyboardInterrupt:
+        pass
+    raise SystemExit
+
+from Replay import Replay, ReplayPlayer
+
+if args.replay:
+    player = ReplayPlayer(Replay.load(args.replay))
+    if args.replay_speed == 0:
+        start = time.perf_counter()
+        player.run()
+        elapsed = time.perf_counter() - start
+        print(f"{player.engine.ticks} ticks in {elapsed:.3f} s, score {player.engine.score}, high score {player.engine.high_score}")
+        raise SystemExit
+    player.seek(args.seek)
+
+    from SnakeGame import SnakeGame
+    game = SnakeGame(interpolate=args.interpolate, atlas=args.atlas, player=player, playback_rate=args.replay_speed,
+                     overlay=args.overlay, profile_path=args.profile, tile_size=args.tile_size, muted=args.mute)
+    game.run()
+    raise SystemExit
+
 print(controls)
 
+if args.connect:
+    from ArenaClient import ArenaClient
+    from ArenaGame import ArenaGame
+    host, port = args.connect.rsplit(':', 1)
+    client = ArenaClient()
+    client.start(host, int(port))
+    ArenaGame(client=client).run()
+    client.close()
+    raise SystemExit
+
+if args.arena:
+    from Arena import Arena
+    from ArenaGame import ArenaGame
+    from BoardSize import BoardSize
+    size = BoardSize[args.size.upper()]
+    arena = Arena(args.rows or size.rows, args.columns or size.columns, args.arena, seed=args.seed)
+    game = ArenaGame(arena, tick_rate=args.speed, player=not args.autopilot)
+    game.run()
+    if args.input_latency:
+        print(game.inputs.report())
+    raise SystemExit
+
+from BoardSize import BoardSize
+from SnakeEngine import SnakeEngine
 from SnakeGame import SnakeGame
 
-game = SnakeGame()
+if args.resume:
+    with open(args.resume, 'rb') as file:
+        engine = SnakeEngine.from_snapshot(file.read())
+else:
+    size = BoardSize[args.size.upper()]
+    engine = SnakeEngine(rows=args.rows or size.rows, columns=args.columns or size.columns, seed=args.seed, tick_rate=args.speed)
+    if args.walls or args.wall_layout:
+        from WallLayout import WallLayout
+        if args.wall_layout and os.path.exists(args.wall_layout):
+            layout = WallLayout.load(args.wall_layout)
+        else:
+            layout = WallLayout.generate(engine.rows, engine.columns, args.walls or 0, args.seed or 0)
+            if args.wall_layout:
+                layout.save(args.wall_layout)
+        layout.apply(engine)
+game = SnakeGame(engine, interpolate=args.interpolate, atlas=args.atlas, autopilot=args.autopilot,
+                 overlay=args.overlay, profile_path=args.profile, tile_size=args.tile_size, muted=args.mute)
+game.run()
+if args.input_latency:
+    print(game.inputs.report())
+if args.record and game.replay is not None:
+    game.replay.ticks = engine.ticks
+    game.replay.save(args.record)
+if args.save:
+    with open(args.save, 'wb') as file:
+        file.write(engine.snapshot())